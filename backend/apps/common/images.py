@@ -0,0 +1,65 @@
+"""
+Pillow helpers shared by the image upload pipelines.
+
+An upload is decoded once with ``load_image`` and re-encoded for each output
+with ``encode_image``. Orientation from EXIF is applied to the pixels, and the
+metadata itself (GPS position, camera, ...) is not carried over because
+Pillow only writes EXIF when asked to.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import IO
+
+from django.core.files.base import ContentFile
+
+from PIL import Image, ImageOps
+
+# Formats whose encoder keeps an alpha channel.
+_ALPHA_FORMATS = {"PNG", "WEBP"}
+
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+
+class InvalidImageError(ValueError):
+    """The upload could not be decoded as an image."""
+
+
+def load_image(file: IO[bytes]) -> Image.Image:
+    """Decode ``file`` fully and return it upright."""
+    try:
+        with Image.open(file) as image:
+            image.load()
+            return ImageOps.exif_transpose(image)
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise InvalidImageError(str(exc)) from exc
+
+
+def extension(image_format: str) -> str:
+    return _EXTENSIONS[image_format]
+
+
+def encode_image(
+    image: Image.Image,
+    *,
+    max_edge: int,
+    image_format: str = "JPEG",
+    quality: int = 82,
+) -> ContentFile:
+    """Re-encode ``image`` no larger than ``max_edge`` on its longest side,
+    without metadata. Smaller images are never upscaled."""
+    image = image.copy()
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    if image_format in _ALPHA_FORMATS:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+    elif image.mode != "RGB":
+        # Flatten transparency onto white rather than black.
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, "white")
+        image.paste(rgba, mask=rgba.getchannel("A"))
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=quality, optimize=True)
+    return ContentFile(buffer.getvalue())
@@ -0,0 +1,194 @@
+"""Compare rows/sec of the read serializers against their projections."""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.models import User
+from apps.common.projections import Projection
+from apps.purchases.models import Payment, PaymentWithReceipt, Purchase, PurchaseDetail
+from apps.purchases.projections import (
+    PurchaseManifestProjection,
+    VerificationProjection,
+)
+from apps.purchases.serializers import (
+    PurchaseManifestSerializer,
+    VerificationReadSerializer,
+)
+from apps.raffles.models import Raffle
+from apps.raffles.projections import RaffleCardProjection
+from apps.raffles.serializers import PublicRaffleSerializer
+
+NUMBERS_PER_PURCHASE = 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway data and report rows/sec for the manifest, verification "
+        "queue and raffle list, serialized with DRF and with projections. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=5000,
+            help="Manifest rows to seed; receipts and raffles scale from it.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement; the fastest is reported.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        rows = int(str(options["rows"]))
+        repeat = int(str(options["repeat"]))
+        context = {"request": APIRequestFactory().get("/")}
+
+        # The seeded data is rolled back however the run ends.
+        with transaction.atomic():
+            try:
+                self._benchmark(rows, repeat, context)
+            finally:
+                transaction.set_rollback(True)
+
+    def _benchmark(self, rows: int, repeat: int, context: dict) -> None:
+        raffle = self._seed(rows)
+        cases: list[tuple[str, QuerySet, type[Serializer], type[Projection]]] = [
+            (
+                "manifest",
+                PurchaseDetail.objects.filter(purchase__raffle=raffle)
+                .select_related("purchase", "purchase__customer")
+                .order_by("number"),
+                PurchaseManifestSerializer,
+                PurchaseManifestProjection,
+            ),
+            (
+                "verifications",
+                PaymentWithReceipt.objects.filter(payment__purchase__raffle=raffle)
+                .select_related(
+                    "payment",
+                    "payment__purchase",
+                    "payment__purchase__raffle",
+                    "payment__purchase__customer",
+                )
+                .prefetch_related("payment__purchase__details")
+                .order_by("payment__payment_date"),
+                VerificationReadSerializer,
+                VerificationProjection,
+            ),
+            (
+                "raffle cards",
+                Raffle.objects.active().select_related("organizer").order_by("id"),
+                PublicRaffleSerializer,
+                RaffleCardProjection,
+            ),
+        ]
+        for name, queryset, serializer_class, projection_class in cases:
+
+            def serialize(
+                queryset: QuerySet = queryset,
+                serializer_class: type[Serializer] = serializer_class,
+            ) -> int:
+                return len(
+                    serializer_class(queryset.all(), many=True, context=context).data
+                )
+
+            def project(
+                queryset: QuerySet = queryset,
+                projection_class: type[Projection] = projection_class,
+            ) -> int:
+                return len(list(projection_class(context).rows(queryset.all())))
+
+            serializer_rate = self._rate(serialize, repeat)
+            projection_rate = self._rate(project, repeat)
+            self.stdout.write(
+                f"{name:<14} serializer={serializer_rate:>10.0f} rows/s "
+                f"projection={projection_rate:>10.0f} rows/s "
+                f"speedup={projection_rate / serializer_rate:.1f}x"
+            )
+
+    def _rate(self, run: Callable[[], int], repeat: int) -> float:
+        best = float("inf")
+        count = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = run()
+            best = min(best, time.perf_counter() - started)
+        return count / best
+
+    def _seed(self, rows: int) -> Raffle:
+        now = timezone.now()
+        # Unique emails, so the command also runs against a database with users.
+        suffix = uuid.uuid4().hex[:12]
+        organizer = User.objects.create_user(
+            email=f"benchmark-organizer-{suffix}@example.com",
+            password=None,
+            name="Benchmark",
+            user_type=User.UserType.ORGANIZER,
+        )
+        customer = User.objects.create_user(
+            email=f"benchmark-customer-{suffix}@example.com",
+            password=None,
+            name="Customer",
+        )
+        raffles = Raffle.objects.bulk_create(
+            Raffle(
+                name=f"Benchmark {index}",
+                number_start=0,
+                number_end=max(rows, 1),
+                price_per_number=Decimal("1.00"),
+                sale_start_at=now,
+                sale_end_at=now + timedelta(days=1),
+                draw_scheduled_at=now + timedelta(days=2),
+                organizer=organizer,
+            )
+            for index in range(max(rows // 100, 1))
+        )
+        raffle = raffles[0]
+
+        purchases = Purchase.objects.bulk_create(
+            Purchase(
+                raffle=raffle,
+                customer=customer if index % 2 else None,
+                guest_name="" if index % 2 else "Guest",
+                guest_phone="" if index % 2 else "1234567890",
+                total_amount=Decimal(NUMBERS_PER_PURCHASE),
+            )
+            for index in range(rows // NUMBERS_PER_PURCHASE)
+        )
+        PurchaseDetail.objects.bulk_create(
+            PurchaseDetail(
+                purchase=purchase,
+                number=index * NUMBERS_PER_PURCHASE + offset,
+                unit_price=Decimal("1.00"),
+            )
+            for index, purchase in enumerate(purchases)
+            for offset in range(NUMBERS_PER_PURCHASE)
+        )
+        payments = Payment.objects.bulk_create(
+            Payment(purchase=purchase, amount=Decimal("1.00")) for purchase in purchases
+        )
+        PaymentWithReceipt.objects.bulk_create(
+            PaymentWithReceipt(
+                payment=payment,
+                selected_numbers=[index * NUMBERS_PER_PURCHASE] if index % 2 else [],
+            )
+            for index, payment in enumerate(payments)
+        )
+        return raffle
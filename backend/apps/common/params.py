@@ -0,0 +1,13 @@
+"""Query parameter parsing shared by the API views."""
+
+
+def parse_bool_param(value: str | None) -> bool | None:
+    """``True``/``False`` for the usual spellings, ``None`` when absent or unknown."""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in {"1", "true", "yes", "on"}:
+        return True
+    if value in {"0", "false", "no", "off"}:
+        return False
+    return None
@@ -0,0 +1,135 @@
+"""
+Read-only row builders over ``QuerySet.values_list()``.
+
+A ``Projection`` produces the same dictionaries as a read serializer without
+instantiating models or walking relations per row: it fetches the declared
+lookups as tuples and maps each tuple through a column plan computed once per
+class. Use it on list endpoints where serializer overhead dominates; keep the
+serializer for writes, single objects and the OpenAPI schema.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from django.core.files.storage import Storage
+from django.db.models import QuerySet
+
+from rest_framework import serializers
+
+_datetime_field = serializers.DateTimeField()
+
+
+def iso_datetime(value: object) -> str | None:
+    """Render a datetime exactly like DRF's ``DateTimeField``."""
+    return _datetime_field.to_representation(value) if value is not None else None
+
+
+def decimal_string(value: object) -> str | None:
+    """Render a ``Decimal`` like DRF's ``DecimalField`` (string coercion)."""
+    return str(value) if value is not None else None
+
+
+@dataclass(frozen=True)
+class Column:
+    """One output field.
+
+    ``sources`` are ``values()`` lookups. ``convert`` receives their values
+    positionally; a string names a method on the projection, like
+    ``SerializerMethodField``. Without ``convert`` the single source value is
+    emitted as is.
+    """
+
+    sources: tuple[str, ...]
+    convert: Callable[..., object] | str | None = None
+
+
+def column(*sources: str, convert: Callable[..., object] | str | None = None) -> Column:
+    return Column(sources, convert)
+
+
+class Projection:
+    columns: ClassVar[Mapping[str, Column]] = {}
+
+    # Derived once per subclass from ``columns``.
+    lookups: ClassVar[tuple[str, ...]] = ()
+    _plan: ClassVar[tuple[tuple[str, tuple[int, ...], Column], ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        lookups = list(
+            dict.fromkeys(
+                source for col in cls.columns.values() for source in col.sources
+            )
+        )
+        index = {lookup: position for position, lookup in enumerate(lookups)}
+        cls.lookups = tuple(lookups)
+        cls._plan = tuple(
+            (name, tuple(index[source] for source in col.sources), col)
+            for name, col in cls.columns.items()
+        )
+
+    def __init__(self, context: dict[str, Any] | None = None) -> None:
+        self.context = context if context is not None else {}
+
+    def omitted(self) -> frozenset[str]:
+        """Columns left out of the output; resolved when rows are built."""
+        return frozenset()
+
+    def prepare(self, queryset: QuerySet) -> QuerySet:
+        """Hook for annotations the columns read."""
+        return queryset
+
+    def values(self, queryset: QuerySet, *, named: bool = False) -> QuerySet:
+        """The tuples ``build`` expects, ready for slicing or pagination.
+        ``named`` rows also expose lookups as attributes, which
+        ``CursorPagination`` needs to read positions."""
+        return self.prepare(queryset).values_list(*self.lookups, named=named)
+
+    def pluck(self, records: Iterable[tuple], lookup: str) -> list[Any]:
+        position = self.lookups.index(lookup)
+        return [record[position] for record in records]
+
+    def build(self, records: Iterable[tuple]) -> Iterator[dict[str, Any]]:
+        omitted = self.omitted()
+        getters: list[tuple[str, Callable[[tuple], object]]] = []
+        for name, positions, col in self._plan:
+            if name in omitted:
+                continue
+            convert = col.convert
+            if isinstance(convert, str):
+                convert = getattr(self, convert)
+            getters.append((name, _getter(positions, convert)))
+
+        for record in records:
+            yield {name: get(record) for name, get in getters}
+
+    def rows(
+        self, queryset: QuerySet, *, chunk_size: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        values = self.values(queryset)
+        if chunk_size is not None:
+            return self.build(values.iterator(chunk_size=chunk_size))
+        return self.build(values)
+
+    def file_url(self, storage: Storage, name: str | None) -> str | None:
+        """Mirror DRF's ``FileField`` output: absolute when a request is known."""
+        if not name:
+            return None
+        url = storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+def _getter(
+    positions: tuple[int, ...], convert: Callable[..., object] | None
+) -> Callable[[tuple], object]:
+    if convert is None:
+        (position,) = positions
+        return lambda record: record[position]
+    if len(positions) == 1:
+        (position,) = positions
+        return lambda record: convert(record[position])
+    return lambda record: convert(*(record[position] for position in positions))
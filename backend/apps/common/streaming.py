@@ -0,0 +1,49 @@
+"""Incremental encoders for ``StreamingHttpResponse`` bodies."""
+
+import csv
+import json
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _dumps(item: object) -> str:
+    return json.dumps(item, cls=JSONEncoder, ensure_ascii=False)
+
+
+def stream_json_array(items: Iterable[object]) -> Iterator[str]:
+    """Encode ``items`` as one JSON array, one element per chunk."""
+    yield "["
+    for index, item in enumerate(items):
+        yield ("," if index else "") + _dumps(item)
+    yield "]"
+
+
+def stream_ndjson(items: Iterable[object]) -> Iterator[str]:
+    """Encode ``items`` as newline-delimited JSON, one line per item."""
+    for item in items:
+        yield _dumps(item) + "\n"
+
+
+class _Echo:
+    """Pseudo-file whose ``write`` hands the formatted line straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_cell(value: object) -> object:
+    # A spreadsheet cell holds one value: lists are joined with spaces.
+    if isinstance(value, list | tuple):
+        return " ".join(map(str, value))
+    return value
+
+
+def stream_csv(
+    rows: Iterable[Mapping[str, object]], fieldnames: Sequence[str]
+) -> Iterator[str]:
+    """Encode ``rows`` as CSV with a header line, one row per chunk."""
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({key: _csv_cell(value) for key, value in row.items()})
@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.authentication.models import User
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+
+def test_runs_repeatedly_and_leaves_no_data(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    User.objects.create_user(email="benchmark-organizer@example.com", password=None)
+    users = User.objects.count()
+
+    for _ in range(2):
+        out = StringIO()
+        call_command("benchmark_projections", rows=20, repeat=1, stdout=out)
+        assert "raffle cards" in out.getvalue()
+
+    assert User.objects.count() == users
+    assert not Raffle.objects.exists()
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from apps.common.images import InvalidImageError, encode_image, load_image
+
+
+def decode(content):
+    return Image.open(BytesIO(content.read()))
+
+
+def test_small_images_are_not_upscaled():
+    image = Image.new("RGB", (40, 20))
+
+    assert decode(encode_image(image, max_edge=100)).size == (40, 20)
+
+
+def test_transparency_is_flattened_onto_white_for_jpeg():
+    image = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+
+    encoded = decode(encode_image(image, max_edge=10))
+
+    assert encoded.mode == "RGB"
+    assert encoded.getpixel((5, 5)) == (255, 255, 255)
+
+
+def test_webp_keeps_transparency():
+    image = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+
+    encoded = decode(encode_image(image, max_edge=10, image_format="WEBP"))
+
+    assert encoded.format == "WEBP"
+    assert encoded.mode == "RGBA"
+
+
+def test_undecodable_bytes_are_rejected():
+    with pytest.raises(InvalidImageError):
+        load_image(BytesIO(b"not an image"))
@@ -0,0 +1,387 @@
+"""
+Query budgets for every API route.
+
+Each scenario seeds ``volume`` rows of the data its endpoint iterates over and
+returns the request to measure. ``query_budget`` runs it at a small and a large
+volume: a count that grows with the data is an N+1, and a count above the
+budget is a regression. New routes must be given a scenario here.
+"""
+
+from collections.abc import Callable
+from datetime import timedelta
+from decimal import Decimal
+from itertools import count
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.authentication.models import User
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+)
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+# Route names that are not API endpoints of ours.
+UNBUDGETED_ROUTES = {
+    "api-root",  # Shadowed by purchase-list, which the router also mounts at "".
+}
+
+GIF = (
+    b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x05\x04\x04\x00\x00"
+    b"\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x44\x01\x00\x3b"
+)
+
+_sequence = count(1)
+
+
+class World:
+    """Factories shared by the scenarios."""
+
+    def __init__(self, organizer: User, customer: User) -> None:
+        self.organizer = organizer
+        self.customer = customer
+
+    def client(self, user: User | None = None) -> APIClient:
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user=user)
+        return client
+
+    def raffle(self, number_end: int = 1000) -> Raffle:
+        now = timezone.now()
+        return Raffle.objects.create(
+            name=f"Raffle {next(_sequence)}",
+            number_start=1,
+            number_end=number_end,
+            price_per_number=Decimal("10.00"),
+            sale_start_at=now - timedelta(days=1),
+            sale_end_at=now + timedelta(days=7),
+            draw_scheduled_at=now + timedelta(days=8),
+            organizer=self.organizer,
+        )
+
+    def purchase(
+        self,
+        raffle: Raffle,
+        numbers: list[int],
+        customer: User | None = None,
+        status: str = Purchase.Status.PENDING,
+    ) -> Purchase:
+        purchase = Purchase.objects.create(
+            raffle=raffle,
+            customer=customer,
+            guest_name="" if customer else "Guest",
+            guest_phone="" if customer else "1234567890",
+            status=status,
+            total_amount=Decimal("10.00") * len(numbers),
+        )
+        PurchaseDetail.objects.bulk_create(
+            PurchaseDetail(
+                purchase=purchase, number=number, unit_price=10, status=status
+            )
+            for number in numbers
+        )
+        return purchase
+
+    def receipt(
+        self, purchase: Purchase, numbers: list[int] | None = None
+    ) -> PaymentWithReceipt:
+        payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+        return PaymentWithReceipt.objects.create(
+            payment=payment, selected_numbers=numbers or []
+        )
+
+    def numbers(self, volume: int) -> list[int]:
+        start = next(_sequence) * 100
+        return list(range(start, start + volume))
+
+
+Request = Callable[[], object]
+Scenario = Callable[[World, int], Request]
+
+SCENARIOS: dict[str, tuple[Scenario, int]] = {}
+KNOWN_N_PLUS_ONE: dict[str, str] = {}
+
+
+def budget(name: str, limit: int) -> Callable[[Scenario], Scenario]:
+    def register(scenario: Scenario) -> Scenario:
+        SCENARIOS[name] = (scenario, limit)
+        return scenario
+
+    return register
+
+
+# --- Schema -----------------------------------------------------------------
+
+
+@budget("schema", 0)
+def schema(world: World, volume: int) -> Request:
+    return lambda: world.client().get(reverse("schema"))
+
+
+@budget("swagger", 0)
+def swagger(world: World, volume: int) -> Request:
+    return lambda: world.client().get(reverse("swagger"))
+
+
+@budget("redoc", 0)
+def redoc(world: World, volume: int) -> Request:
+    return lambda: world.client().get(reverse("redoc"))
+
+
+# --- Auth -------------------------------------------------------------------
+
+
+def _users(volume: int) -> None:
+    User.objects.bulk_create(
+        User(email=f"user-{next(_sequence)}@example.com") for _ in range(volume)
+    )
+
+
+@budget("auth-register", 3)
+def auth_register(world: World, volume: int) -> Request:
+    _users(volume)
+    payload = {
+        "email": f"new-{next(_sequence)}@example.com",
+        "password": "StrongPass123",
+        "name": "New User",
+    }
+    return lambda: world.client().post(reverse("auth-register"), payload)
+
+
+@budget("auth-me", 0)
+def auth_me(world: World, volume: int) -> Request:
+    _users(volume)
+    return lambda: world.client(world.customer).get(reverse("auth-me"))
+
+
+@budget("token_obtain_pair", 1)
+def token_obtain_pair(world: World, volume: int) -> Request:
+    _users(volume)
+    credentials = {"email": world.customer.email, "password": "password123"}
+    return lambda: world.client().post(reverse("token_obtain_pair"), credentials)
+
+
+@budget("token_refresh", 1)
+def token_refresh(world: World, volume: int) -> Request:
+    _users(volume)
+    refresh = str(RefreshToken.for_user(world.customer))
+    return lambda: world.client().post(reverse("token_refresh"), {"refresh": refresh})
+
+
+# --- Raffles ----------------------------------------------------------------
+
+
+def _raffles_with_sales(world: World, volume: int) -> list[Raffle]:
+    raffles = [world.raffle() for _ in range(volume)]
+    for raffle in raffles:
+        world.purchase(raffle, [1, 2])
+    return raffles
+
+
+@budget("raffle-list", 3)
+def raffle_list(world: World, volume: int) -> Request:
+    _raffles_with_sales(world, volume)
+    return lambda: world.client().get(
+        reverse("raffle-list"), {"include_counts": "true"}
+    )
+
+
+@budget("organizer-raffle-list", 3)
+def organizer_raffle_list(world: World, volume: int) -> Request:
+    _raffles_with_sales(world, volume)
+    return lambda: world.client(world.organizer).get(
+        reverse("organizer-raffle-list"), {"include_counts": "true"}
+    )
+
+
+@budget("organizer-raffle-history", 2)
+def organizer_raffle_history(world: World, volume: int) -> Request:
+    _raffles_with_sales(world, volume)
+    return lambda: world.client(world.organizer).get(
+        reverse("organizer-raffle-history")
+    )
+
+
+@budget("raffle-availability-bulk", 3)
+def raffle_availability_bulk(world: World, volume: int) -> Request:
+    raffles = _raffles_with_sales(world, volume)
+    ids = ",".join(str(raffle.pk) for raffle in raffles)
+    return lambda: world.client().get(
+        reverse("raffle-availability-bulk"), {"ids": ids, "encoding": "list"}
+    )
+
+
+@budget("raffle-detail", 2)
+def raffle_detail(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    world.purchase(raffle, world.numbers(volume))
+    return lambda: world.client().get(reverse("raffle-detail", args=[raffle.pk]))
+
+
+@budget("raffle-availability", 2)
+def raffle_availability(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    world.purchase(raffle, world.numbers(volume))
+    return lambda: world.client().get(reverse("raffle-availability", args=[raffle.pk]))
+
+
+@budget("raffle-manifest", 3)
+def raffle_manifest(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    for _ in range(volume):
+        world.purchase(raffle, world.numbers(2), customer=world.customer)
+        world.purchase(raffle, world.numbers(1))
+    return lambda: world.client(world.organizer).get(
+        reverse("raffle-manifest", args=[raffle.pk])
+    )
+
+
+@budget("raffle-dashboard", 2)
+def raffle_dashboard(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    for _ in range(volume):
+        world.purchase(raffle, world.numbers(2), status=Purchase.Status.PAID)
+        world.purchase(raffle, world.numbers(1))
+    return lambda: world.client(world.organizer).get(
+        reverse("raffle-dashboard", args=[raffle.pk])
+    )
+
+
+@budget("raffle-debtors", 2)
+def raffle_debtors(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    for _ in range(volume):
+        world.purchase(raffle, world.numbers(2), customer=world.customer)
+        world.purchase(raffle, world.numbers(1))
+    return lambda: world.client(world.organizer).get(
+        reverse("raffle-debtors", args=[raffle.pk])
+    )
+
+
+# --- Purchases --------------------------------------------------------------
+
+
+@budget("purchase-list", 2)
+def purchase_list(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    for _ in range(volume):
+        numbers = world.numbers(2)
+        purchase = world.purchase(raffle, numbers, customer=world.customer)
+        world.receipt(purchase, numbers[:1])
+    return lambda: world.client(world.customer).get(reverse("purchase-list"))
+
+
+@budget("purchase-cancel", 11)
+def purchase_cancel(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    numbers = world.numbers(volume)
+    purchase = world.purchase(raffle, numbers)
+    for number in numbers:
+        world.receipt(purchase, [number])
+    return lambda: world.client().post(
+        reverse("purchase-cancel", args=[purchase.pk]), {"phone": "1234567890"}
+    )
+
+
+@budget("purchase-upload-receipt", 8)
+def purchase_upload_receipt(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    numbers = world.numbers(volume + 1)
+    purchase = world.purchase(raffle, numbers)
+    for number in numbers[1:]:
+        world.receipt(purchase, [number])
+    image = SimpleUploadedFile("receipt.gif", GIF, content_type="image/gif")
+    return lambda: world.client().post(
+        reverse("purchase-upload-receipt", args=[purchase.pk]),
+        {"receipt_image": image, "phone": "1234567890", "numbers": numbers[:1]},
+        format="multipart",
+    )
+
+
+@budget("verifications-list", 1)
+def verifications_list(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    for _ in range(volume):
+        world.receipt(world.purchase(raffle, world.numbers(2)))
+    return lambda: world.client(world.organizer).get(reverse("verifications-list"))
+
+
+@budget("verifications-verify", 17)
+def verifications_verify(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    numbers = world.numbers(volume)
+    receipt = world.receipt(world.purchase(raffle, numbers), numbers)
+    return lambda: world.client(world.organizer).post(
+        reverse("verifications-verify", args=[receipt.pk]), {"action": "approve"}
+    )
+
+
+@budget("verifications-bulk-verify", 13)
+def verifications_bulk_verify(world: World, volume: int) -> Request:
+    raffle = world.raffle()
+    ids = []
+    for _ in range(volume):
+        # One receipt pays a whole purchase, the other half of one.
+        numbers = world.numbers(2)
+        ids.append(world.receipt(world.purchase(raffle, numbers), numbers).pk)
+        numbers = world.numbers(2)
+        ids.append(world.receipt(world.purchase(raffle, numbers), numbers[:1]).pk)
+    return lambda: world.client(world.organizer).post(
+        reverse("verifications-bulk-verify"),
+        {"action": "approve", "ids": ids},
+        format="json",
+    )
+
+
+def _route_names(patterns: list) -> set[str]:
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if str(pattern.pattern).startswith("admin/"):
+                continue
+            names |= _route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+@pytest.fixture
+def world(user_factory, organizer_user, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    customer = user_factory(
+        email="customer@example.com", password="password123", user_type="customer"
+    )
+    return World(organizer_user, customer)
+
+
+def test_every_route_has_a_budget():
+    routes = _route_names(get_resolver().url_patterns) - UNBUDGETED_ROUTES
+    assert routes - SCENARIOS.keys() == set()
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        pytest.param(
+            name,
+            marks=pytest.mark.xfail(reason=KNOWN_N_PLUS_ONE[name], strict=True),
+        )
+        if name in KNOWN_N_PLUS_ONE
+        else name
+        for name in sorted(SCENARIOS)
+    ],
+)
+def test_query_budget(name, world, query_budget):
+    scenario, limit = SCENARIOS[name]
+    query_budget(lambda volume: scenario(world, volume), limit)
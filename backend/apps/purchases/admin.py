@@ -1,6 +1,15 @@
 from django.contrib import admin
 
-from .models import OnlinePayment, Payment, PaymentWithReceipt, Purchase, PurchaseDetail
+from .models import (
+    OnlinePayment,
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleNumber,
+    RaffleStats,
+    ReceiptNumber,
+)
 
 
 @admin.register(Purchase)
@@ -24,6 +33,26 @@ class PurchaseDetailAdmin(admin.ModelAdmin):
     search_fields = ("purchase__raffle__name",)
 
 
+@admin.register(RaffleNumber)
+class RaffleNumberAdmin(admin.ModelAdmin):
+    list_display = ("raffle", "number", "status", "detail")
+    list_filter = ("status",)
+    search_fields = ("raffle__name",)
+
+
+@admin.register(RaffleStats)
+class RaffleStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "raffle",
+        "slot",
+        "sold_count",
+        "reserved_count",
+        "collected_amount",
+        "outstanding_amount",
+    )
+    search_fields = ("raffle__name",)
+
+
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ("id", "purchase", "amount", "payment_date", "created_by")
@@ -45,3 +74,9 @@ class PaymentWithReceiptAdmin(admin.ModelAdmin):
         "verified_by",
     )
     list_filter = ("verification_status",)
+
+
+@admin.register(ReceiptNumber)
+class ReceiptNumberAdmin(admin.ModelAdmin):
+    list_display = ("receipt", "detail")
+    list_filter = ("receipt__verification_status",)
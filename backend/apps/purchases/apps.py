@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PurchasesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.purchases"
+
+    def ready(self) -> None:
+        # Import signal handlers
+        from . import signals
+
+        _ = signals
@@ -0,0 +1,27 @@
+"""Expire overdue reservations and release their numbers."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.purchases.services import expire_reservations
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark PENDING purchases past their expiration as EXPIRED and free "
+        "their numbers. Runs in batches; safe to run while serving traffic."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.RESERVATION_EXPIRY_BATCH_SIZE,
+            help="Purchases expired per transaction.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        expired = expire_reservations(batch_size=int(str(options["batch_size"])))
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} reservation(s)."))
@@ -0,0 +1,93 @@
+"""Measure reservation throughput as concurrent clients increase."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.utils import timezone
+
+from apps.authentication.models import User
+from apps.purchases.models import Purchase
+from apps.purchases.services import create_reservation
+from apps.raffles.models import Raffle
+
+GUEST = {"guest_name": "Load Test", "guest_phone": "0000000000"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Reserve disjoint numbers of a throwaway raffle from N concurrent "
+        "clients and report reservations per second for each N."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--clients",
+            default="1,2,4,8,16",
+            help="Comma-separated concurrency levels to measure.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Reservations issued by each client per level.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        levels = [int(level) for level in str(options["clients"]).split(",")]
+        per_client = int(str(options["requests"]))
+        organizer = User.objects.filter(user_type=User.UserType.ORGANIZER).first()
+        if organizer is None:
+            raise CommandError("An organizer account is required to own the raffle.")
+
+        now = timezone.now()
+        raffle = Raffle.objects.create(
+            name="Reservation load test",
+            number_start=0,
+            number_end=sum(levels) * per_client,
+            price_per_number=Decimal("1.00"),
+            sale_start_at=now,
+            sale_end_at=now + timedelta(hours=1),
+            draw_scheduled_at=now + timedelta(hours=2),
+            organizer=organizer,
+        )
+        try:
+            next_number = 0
+            for clients in levels:
+                blocks = [
+                    range(
+                        next_number + i * per_client,
+                        next_number + (i + 1) * per_client,
+                    )
+                    for i in range(clients)
+                ]
+                next_number += clients * per_client
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=clients) as pool:
+                    list(
+                        pool.map(lambda block: self._reserve(raffle.id, block), blocks)
+                    )
+                elapsed = time.perf_counter() - started
+
+                total = clients * per_client
+                self.stdout.write(
+                    f"clients={clients:<3} reservations={total:<6} "
+                    f"elapsed={elapsed:.2f}s throughput={total / elapsed:.1f}/s"
+                )
+        finally:
+            Purchase.objects.filter(raffle=raffle).delete()
+            raffle.delete()
+
+    def _reserve(self, raffle_id: int, numbers: range) -> None:
+        try:
+            for number in numbers:
+                create_reservation(AnonymousUser(), raffle_id, [number], GUEST)
+        finally:
+            connection.close()
@@ -0,0 +1,46 @@
+"""Recompute raffle counters from ticket details and report drift."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.purchases.models import TicketTotals
+from apps.purchases.services import reconcile_raffle_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each raffle's RaffleStats row with totals recomputed from "
+        "PurchaseDetail, report the differences and correct them. Each raffle "
+        "is checked under a lock on its counters; safe to run while serving "
+        "traffic."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without correcting it.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        dry_run = bool(options["dry_run"])
+        drifts = reconcile_raffle_stats(dry_run=dry_run)
+        for drift in drifts:
+            self.stdout.write(
+                f"Raffle {drift.raffle_id}: stored {_describe(drift.stored)}, "
+                f"expected {_describe(drift.expected)}"
+            )
+
+        if dry_run:
+            message = f"Found drift in {len(drifts)} raffle(s)."
+        else:
+            message = f"Corrected drift in {len(drifts)} raffle(s)."
+        self.stdout.write(self.style.SUCCESS(message))
+
+
+def _describe(totals: TicketTotals) -> str:
+    return (
+        f"sold={totals.sold_count} reserved={totals.reserved_count} "
+        f"collected={totals.collected_amount} outstanding={totals.outstanding_amount}"
+    )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 23:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+ACTIVE_STATUSES = ('pending', 'paid')
+
+
+def backfill_raffle_numbers(apps, schema_editor):
+    PurchaseDetail = apps.get_model('purchases', 'PurchaseDetail')
+    RaffleNumber = apps.get_model('purchases', 'RaffleNumber')
+    active = PurchaseDetail.objects.filter(
+        status__in=ACTIVE_STATUSES, purchase__status__in=ACTIVE_STATUSES
+    ).values_list('pk', 'purchase__raffle_id', 'number', 'status')
+    RaffleNumber.objects.bulk_create(
+        (
+            RaffleNumber(detail_id=pk, raffle_id=raffle_id, number=number, status=status)
+            for pk, raffle_id, number, status in active.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0008_purchasedetail_status'),
+        ('raffles', '0004_remove_raffle_image_url_raffle_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaffleNumber',
+            fields=[
+                ('detail', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='claim', serialize=False, to='purchases.purchasedetail')),
+                ('number', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('paid', 'Paid'), ('expired', 'Expired'), ('canceled', 'Canceled')], max_length=16)),
+                ('raffle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='numbers', to='raffles.raffle')),
+            ],
+            options={
+                'ordering': ('number',),
+                'indexes': [models.Index(fields=['raffle', 'number'], name='raffle_number_lookup_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_raffle_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-17 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0009_raffle_number'),
+        ('raffles', '0004_remove_raffle_image_url_raffle_image'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rafflenumber',
+            name='raffle_number_lookup_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='rafflenumber',
+            constraint=models.UniqueConstraint(fields=('raffle', 'number'), name='unique_active_number_per_raffle'),
+        ),
+    ]
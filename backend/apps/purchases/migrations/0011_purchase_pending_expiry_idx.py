@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0010_unique_active_number_per_raffle'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at'], name='purchase_pending_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0011_purchase_pending_expiry_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='purchase',
+            name='purchase_pending_expiry_idx',
+        ),
+        migrations.AddIndex(
+            model_name='paymentwithreceipt',
+            index=models.Index(condition=models.Q(('verification_status', 'pending')), fields=['payment'], name='receipt_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['status', 'expires_at'], name='purchase_status_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['guest_phone', '-created_at'], name='purchase_guest_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['customer', '-created_at'], name='purchase_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchasedetail',
+            index=models.Index(fields=['purchase', 'status'], name='purchase_detail_status_idx'),
+        ),
+    ]
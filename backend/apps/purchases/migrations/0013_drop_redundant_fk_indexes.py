@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0012_hot_path_indexes'),
+        ('raffles', '0004_remove_raffle_image_url_raffle_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='purchase',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='raffle_purchases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='purchasedetail',
+            name='purchase',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='details', to='purchases.purchase'),
+        ),
+        migrations.AlterField(
+            model_name='rafflenumber',
+            name='raffle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='numbers', to='raffles.raffle'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-18 00:39
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+ACTIVE_STATUSES = ('pending', 'paid')
+RAFFLE_STATS_SLOTS = 8
+
+
+def backfill_raffle_stats(apps, schema_editor):
+    Raffle = apps.get_model('raffles', 'Raffle')
+    PurchaseDetail = apps.get_model('purchases', 'PurchaseDetail')
+    RaffleStats = apps.get_model('purchases', 'RaffleStats')
+    paid = Q(status='paid')
+    pending = Q(status='pending')
+    totals = {
+        row.pop('purchase__raffle_id'): row
+        for row in PurchaseDetail.objects.filter(
+            status__in=ACTIVE_STATUSES, purchase__status__in=ACTIVE_STATUSES
+        )
+        .values('purchase__raffle_id')
+        .annotate(
+            sold_count=Count('pk', filter=paid),
+            reserved_count=Count('pk', filter=pending),
+            collected_amount=Sum('unit_price', filter=paid, default=Decimal('0.00')),
+            outstanding_amount=Sum('unit_price', filter=pending, default=Decimal('0.00')),
+        )
+        .order_by()
+    }
+    # Existing totals go to slot 0; the other slots start empty.
+    RaffleStats.objects.bulk_create(
+        (
+            RaffleStats(
+                raffle_id=raffle_id,
+                slot=slot,
+                **(totals.get(raffle_id, {}) if slot == 0 else {}),
+            )
+            for raffle_id in Raffle.objects.values_list('pk', flat=True).iterator()
+            for slot in range(RAFFLE_STATS_SLOTS)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0013_drop_redundant_fk_indexes'),
+        ('raffles', '0004_remove_raffle_image_url_raffle_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaffleStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField()),
+                ('sold_count', models.IntegerField(default=0)),
+                ('reserved_count', models.IntegerField(default=0)),
+                ('collected_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('outstanding_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('raffle', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='raffles.raffle')),
+            ],
+            options={
+                'verbose_name_plural': 'raffle stats',
+                'constraints': [models.UniqueConstraint(fields=('raffle', 'slot'), name='unique_raffle_stats_slot')],
+            },
+        ),
+        migrations.RunPython(backfill_raffle_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import JSONArray
+
+
+def backfill_receipt_numbers(apps, schema_editor):
+    PurchaseDetail = apps.get_model('purchases', 'PurchaseDetail')
+    ReceiptNumber = apps.get_model('purchases', 'ReceiptNumber')
+    # Every (receipt, detail) pair whose number the receipt selected.
+    pairs = PurchaseDetail.objects.filter(
+        purchase__payments__receipt__selected_numbers__contains=JSONArray(F('number'))
+    ).values_list('purchase__payments__receipt', 'pk').order_by()
+    ReceiptNumber.objects.bulk_create(
+        (
+            ReceiptNumber(receipt_id=receipt_id, detail_id=detail_id)
+            for receipt_id, detail_id in pairs.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0014_raffle_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptNumber',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_numbers', to='purchases.purchasedetail')),
+                ('receipt', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='numbers', to='purchases.paymentwithreceipt')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('receipt', 'detail'), name='unique_receipt_number')],
+            },
+        ),
+        migrations.RunPython(backfill_receipt_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:19
+
+import apps.purchases.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0015_receipt_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentwithreceipt',
+            name='image_status',
+            field=models.CharField(choices=[('staged', 'Staged'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='paymentwithreceipt',
+            name='receipt_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='receipts/thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='paymentwithreceipt',
+            name='receipt_image',
+            field=models.ImageField(blank=True, null=True, upload_to=apps.purchases.models.receipt_upload_to),
+        ),
+    ]
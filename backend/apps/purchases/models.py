@@ -1,13 +1,34 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from dataclasses import astuple, dataclass, fields
 from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import reduce
+from operator import or_
 from typing import TYPE_CHECKING, ClassVar
 
 from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Mod
+from django.db.models.lookups import Exact
 from django.utils import timezone
 
 if TYPE_CHECKING:
@@ -31,6 +52,51 @@ class PurchaseQuerySet(QuerySet["Purchase"]):
     def paid(self) -> PurchaseQuerySet:
         return self.filter(status=Purchase.Status.PAID)
 
+    def with_processing_numbers(self) -> PurchaseQuerySet:
+        """Annotate ``processing_numbers``: the numbers of each purchase that a
+        pending receipt covers, sorted."""
+        return self.annotate(
+            processing_numbers=ArraySubquery(
+                ReceiptNumber.objects.processing()
+                .filter(detail__purchase_id=OuterRef("pk"))
+                .order_by("detail__number")
+                .distinct()
+                .values("detail__number")
+            )
+        )
+
+    def overdue(self, now: datetime | None = None) -> PurchaseQuerySet:
+        """PENDING purchases whose reservation window has closed."""
+        return self.filter(
+            status=Purchase.Status.PENDING,
+            expires_at__lte=now or timezone.now(),
+        ).order_by("expires_at")
+
+    def sync_status_from_details(self) -> int:
+        """
+        Set every purchase's status from its details in one UPDATE, following
+        the rules of ``Purchase.update_status_from_details``. Each status is
+        derived in SQL from the lowest and highest detail status, so the cost
+        does not grow with tickets per purchase. Purchases without details are
+        left alone.
+
+        Returns the number of purchases updated.
+        """
+        details = PurchaseDetail.objects.filter(purchase_id=OuterRef("pk"))
+        statuses = details.order_by().values("purchase_id")
+        lowest = Subquery(statuses.annotate(status=Min("status")).values("status"))
+        highest = Subquery(statuses.annotate(status=Max("status")).values("status"))
+        return self.filter(Exists(details)).update(
+            status=Case(
+                When(Exact(lowest, highest), then=lowest),
+                When(
+                    Exists(details.filter(status=Purchase.Status.PAID)),
+                    then=Value(Purchase.Status.PAID),
+                ),
+                default=Value(Purchase.Status.PENDING),
+            )
+        )
+
 
 class PurchaseManager(models.Manager["Purchase"]):
     def get_queryset(self) -> PurchaseQuerySet:  # type: ignore[override]
@@ -39,6 +105,9 @@ class PurchaseManager(models.Manager["Purchase"]):
     def active(self) -> PurchaseQuerySet:
         return self.get_queryset().active()
 
+    def overdue(self, now: datetime | None = None) -> PurchaseQuerySet:
+        return self.get_queryset().overdue(now)
+
 
 class Purchase(models.Model):
     id: int
@@ -63,6 +132,7 @@ class Purchase(models.Model):
         related_name="raffle_purchases",
         null=True,
         blank=True,
+        db_index=False,  # Covered by purchase_customer_idx.
     )
     details: models.QuerySet[PurchaseDetail]  # type: ignore
     payments: models.QuerySet[Payment]  # type: ignore
@@ -89,6 +159,23 @@ class Purchase(models.Model):
                 name="purchase_expires_after_reserved",
             ),
         )
+        indexes = (
+            # active() and the expiry sweeper: equality on status, range on
+            # expires_at.
+            models.Index(
+                fields=("status", "expires_at"),
+                name="purchase_status_expiry_idx",
+            ),
+            # "My purchases" lookups, newest first.
+            models.Index(
+                fields=("guest_phone", "-created_at"),
+                name="purchase_guest_phone_idx",
+            ),
+            models.Index(
+                fields=("customer", "-created_at"),
+                name="purchase_customer_idx",
+            ),
+        )
         ordering = ("-created_at",)
 
     def __str__(self) -> str:
@@ -113,24 +200,14 @@ class Purchase(models.Model):
         - If ALL are EXPIRED -> EXPIRED
         - If ALL are PENDING -> PENDING
         - If Mixed (e.g. PAID + CANCELED) -> PAID (We treat partial payment as a success for the purchase)
+        - Other mixes (e.g. PENDING + CANCELED) -> PENDING until resolved
         """
-        details = list(self.details.all())  # type: ignore[attr-defined]
-        if not details:
-            return
+        Purchase.objects.filter(pk=self.pk).sync_status_from_details()
+        self.refresh_from_db(fields=["status"])
 
-        statuses = {d.status for d in details}
-
-        if len(statuses) == 1:
-            self.status = statuses.pop()
-        elif self.Status.PAID in statuses:
-            # If at least one ticket is paid, the purchase is considered "Fulfilled/Paid" in terms of "Active Business"
-            # The unpaid ones will be marked canceled.
-            self.status = self.Status.PAID
-        else:
-            # Fallback (e.g., Pending + Canceled -> Pending until resolved)
-            self.status = self.Status.PENDING
 
-        self.save(update_fields=["status"])
+# Ticket states that keep a number out of circulation.
+ACTIVE_STATUSES = (Purchase.Status.PENDING, Purchase.Status.PAID)
 
 
 class PurchaseDetail(models.Model):
@@ -140,6 +217,7 @@ class PurchaseDetail(models.Model):
         Purchase,
         on_delete=models.CASCADE,
         related_name="details",
+        db_index=False,  # Covered by the (purchase, ...) indexes below.
     )
     number = models.PositiveIntegerField()
     unit_price = models.DecimalField(
@@ -159,6 +237,12 @@ class PurchaseDetail(models.Model):
                 name="unique_number_per_purchase",
             ),
         )
+        indexes = (
+            models.Index(
+                fields=("purchase", "status"),
+                name="purchase_detail_status_idx",
+            ),
+        )
         ordering = ("number",)
 
     def __str__(self) -> str:
@@ -166,6 +250,314 @@ class PurchaseDetail(models.Model):
         return f"Number {self.number} for purchase {purchase_ref or 'unknown'}"
 
 
+@dataclass(frozen=True)
+class TicketTotals:
+    """Counts and amounts of a set of active tickets, or a change to them."""
+
+    sold_count: int = 0
+    reserved_count: int = 0
+    collected_amount: Decimal = Decimal("0.00")
+    outstanding_amount: Decimal = Decimal("0.00")
+
+    @classmethod
+    def of(cls, status: str, unit_price: Decimal) -> TicketTotals:
+        if status == Purchase.Status.PAID:
+            return cls(sold_count=1, collected_amount=unit_price)
+        return cls(reserved_count=1, outstanding_amount=unit_price)
+
+    def __add__(self, other: TicketTotals) -> TicketTotals:
+        return TicketTotals(
+            *(a + b for a, b in zip(astuple(self), astuple(other), strict=True))
+        )
+
+    def __neg__(self) -> TicketTotals:
+        return TicketTotals(*(-value for value in astuple(self)))
+
+    def __sub__(self, other: TicketTotals) -> TicketTotals:
+        return self + -other
+
+    def __bool__(self) -> bool:
+        return any(astuple(self))
+
+
+# Counter rows per raffle. A ticket is counted in the slot of its purchase, so
+# concurrent reservations on one raffle update different rows.
+RAFFLE_STATS_SLOTS = 8
+
+# (raffle_id, slot)
+StatsKey = tuple[int, int]
+
+
+def _slot(purchase_id: int) -> int:
+    return purchase_id % RAFFLE_STATS_SLOTS
+
+
+def _group_totals(
+    tickets: QuerySet, price_field: str, *keys: str
+) -> dict[tuple, TicketTotals]:
+    """Group ``tickets`` (active details or claims) into totals per ``keys``."""
+    paid = Q(status=Purchase.Status.PAID)
+    pending = Q(status=Purchase.Status.PENDING)
+    rows = (
+        tickets.values(*keys)
+        .annotate(
+            sold_count=Count("pk", filter=paid),
+            reserved_count=Count("pk", filter=pending),
+            collected_amount=Sum(price_field, filter=paid, default=Decimal("0.00")),
+            outstanding_amount=Sum(
+                price_field, filter=pending, default=Decimal("0.00")
+            ),
+        )
+        .order_by()
+    )
+    return {tuple(row.pop(key) for key in keys): TicketTotals(**row) for row in rows}
+
+
+def _claim_totals(claims: QuerySet[RaffleNumber]) -> dict[StatsKey, TicketTotals]:
+    slotted = claims.annotate(
+        slot=Mod("detail__purchase_id", Value(RAFFLE_STATS_SLOTS))
+    )
+    return _group_totals(slotted, "detail__unit_price", "raffle_id", "slot")
+
+
+def _lock_details(details: QuerySet[PurchaseDetail]) -> list[int]:
+    """Lock ``details`` in pk order and return their pks. Claims are read only
+    once the lock is held, so a concurrent change to the same tickets is
+    waited for and its committed result counted, never counted twice."""
+    return list(
+        details.select_for_update(of=("self",))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+class RaffleNumberManager(models.Manager["RaffleNumber"]):
+    """Every change to the claims also moves ``RaffleStats`` by the same
+    tickets, inside the caller's transaction."""
+
+    def claim(self, raffle_id: int, details: Iterable[PurchaseDetail]) -> None:
+        """Record claims for freshly created active details."""
+        details = list(details)
+        self.bulk_create(
+            RaffleNumber(
+                detail=detail,
+                raffle_id=raffle_id,
+                number=detail.number,
+                status=detail.status,
+            )
+            for detail in details
+        )
+        changes: dict[StatsKey, TicketTotals] = {}
+        for detail in details:
+            key = (raffle_id, _slot(detail.purchase_id))
+            changes[key] = changes.get(key, TicketTotals()) + TicketTotals.of(
+                detail.status, detail.unit_price
+            )
+        RaffleStats.objects.adjust(changes)
+
+    def sync(self, details: QuerySet[PurchaseDetail]) -> None:
+        """Reconcile the claims of ``details`` with their current status."""
+        details = PurchaseDetail.objects.filter(pk__in=_lock_details(details))
+        claims = self.filter(detail__in=details)
+        changes = {key: -totals for key, totals in _claim_totals(claims).items()}
+        active = list(
+            details.filter(
+                status__in=ACTIVE_STATUSES, purchase__status__in=ACTIVE_STATUSES
+            ).values_list(
+                "pk",
+                "purchase__raffle_id",
+                "number",
+                "status",
+                "purchase_id",
+                "unit_price",
+            )
+        )
+        claims.exclude(detail__in=[pk for pk, *_ in active]).delete()
+        if active:
+            self.bulk_create(
+                [
+                    RaffleNumber(
+                        detail_id=pk, raffle_id=raffle_id, number=number, status=status
+                    )
+                    for pk, raffle_id, number, status, *_ in active
+                ],
+                update_conflicts=True,
+                unique_fields=["detail"],
+                update_fields=["status"],
+            )
+
+        for _, raffle_id, _, status, purchase_id, unit_price in active:
+            key = (raffle_id, _slot(purchase_id))
+            changes[key] = changes.get(key, TicketTotals()) + TicketTotals.of(
+                status, unit_price
+            )
+        RaffleStats.objects.adjust(changes)
+
+    def release(self, details: QuerySet[PurchaseDetail]) -> None:
+        """Drop the claims of ``details`` that are leaving circulation."""
+        claims = self.filter(detail__in=_lock_details(details))
+        released = _claim_totals(claims)
+        claims.delete()
+        RaffleStats.objects.adjust({key: -totals for key, totals in released.items()})
+
+
+class RaffleNumber(models.Model):
+    """
+    Denormalized claim on a raffle number, one row per active PurchaseDetail.
+
+    A row exists only while its ticket is PENDING or PAID, so "is N taken" and
+    "all taken numbers" are lookups on the (raffle, number) index instead of
+    joins over the whole purchase history. The index is unique: the database
+    itself refuses a second active claim on the same number.
+    """
+
+    detail: models.OneToOneField[PurchaseDetail]
+    raffle: models.ForeignKey[Raffle]
+
+    detail = models.OneToOneField(
+        PurchaseDetail, on_delete=models.CASCADE, primary_key=True, related_name="claim"
+    )
+    raffle = models.ForeignKey(
+        "raffles.Raffle",
+        on_delete=models.CASCADE,
+        related_name="numbers",
+        db_index=False,  # Covered by unique_active_number_per_raffle.
+    )
+    number = models.PositiveIntegerField()
+    status = models.CharField(max_length=16, choices=Purchase.Status.choices)
+
+    objects: ClassVar[RaffleNumberManager] = RaffleNumberManager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("raffle", "number"),
+                name="unique_active_number_per_raffle",
+            ),
+        )
+        ordering = ("number",)
+
+    def __str__(self) -> str:
+        raffle_ref = getattr(self, "raffle_id", None)
+        return f"Number {self.number} taken in raffle {raffle_ref or 'unknown'}"
+
+
+class RaffleStatsManager(models.Manager["RaffleStats"]):
+    def adjust(self, changes: Mapping[StatsKey, TicketTotals]) -> None:
+        """Add ``changes`` to the counters in one UPDATE, creating missing
+        slot rows. When several rows move they are locked in key order first,
+        so writers touching several raffles cannot deadlock each other."""
+        changes = {key: change for key, change in changes.items() if change}
+        if not changes:
+            return
+        rows = self.filter(
+            reduce(
+                or_, (Q(raffle_id=raffle_id, slot=slot) for raffle_id, slot in changes)
+            )
+        )
+        increments = {
+            field.name: F(field.name)
+            + Case(
+                *(
+                    When(
+                        raffle_id=raffle_id,
+                        slot=slot,
+                        then=Value(getattr(change, field.name)),
+                    )
+                    for (raffle_id, slot), change in changes.items()
+                ),
+                default=Value(0),
+                output_field=self.model._meta.get_field(field.name),
+            )
+            for field in fields(TicketTotals)
+        }
+        if len(changes) > 1:
+            locked = rows.select_for_update().order_by("raffle_id", "slot")
+            missing = changes.keys() - set(locked.values_list("raffle_id", "slot"))
+        elif rows.update(**increments):
+            return
+        else:
+            missing = changes.keys()
+        if missing:
+            self.bulk_create(
+                [
+                    RaffleStats(raffle_id=raffle_id, slot=slot)
+                    for raffle_id, slot in sorted(missing)
+                ],
+                ignore_conflicts=True,
+            )
+        rows.update(**increments)
+
+    def totals(self, raffle_ids: Iterable[int]) -> dict[int, TicketTotals]:
+        """Stored totals per raffle, summed over its slots."""
+        rows = (
+            self.filter(raffle_id__in=list(raffle_ids))
+            .values("raffle_id")
+            .annotate(**{field.name: Sum(field.name) for field in fields(TicketTotals)})
+            .order_by()
+        )
+        return {row.pop("raffle_id"): TicketTotals(**row) for row in rows}
+
+    def recompute(
+        self, raffle_ids: Iterable[int] | None = None
+    ) -> dict[int, TicketTotals]:
+        """Totals straight from ``PurchaseDetail``, the source of truth."""
+        details = PurchaseDetail.objects.filter(
+            status__in=ACTIVE_STATUSES, purchase__status__in=ACTIVE_STATUSES
+        )
+        if raffle_ids is not None:
+            details = details.filter(purchase__raffle_id__in=list(raffle_ids))
+        totals = _group_totals(details, "unit_price", "purchase__raffle_id")
+        return {raffle_id: value for (raffle_id,), value in totals.items()}
+
+
+class RaffleStats(models.Model):
+    """
+    Running ticket totals per raffle, so dashboards and listings read a few
+    rows instead of aggregating the purchase history.
+
+    ``RaffleNumberManager`` moves the counters in the same transaction as the
+    claims they summarize. Each raffle has ``RAFFLE_STATS_SLOTS`` rows and a
+    ticket is counted in the slot of its purchase, so writers for different
+    purchases rarely wait on the same row lock; readers sum the slots.
+    Anything that bypasses the manager (cascading deletes, raw SQL) shows up
+    as drift in ``manage.py reconcile_raffle_stats``.
+    """
+
+    raffle: models.ForeignKey[Raffle]
+
+    raffle = models.ForeignKey(
+        "raffles.Raffle",
+        on_delete=models.CASCADE,
+        related_name="stats",
+        db_index=False,  # Covered by unique_raffle_stats_slot.
+    )
+    slot = models.PositiveSmallIntegerField()
+    sold_count = models.IntegerField(default=0)
+    reserved_count = models.IntegerField(default=0)
+    collected_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00")
+    )
+    outstanding_amount = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00")
+    )
+
+    objects: ClassVar[RaffleStatsManager] = RaffleStatsManager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("raffle", "slot"),
+                name="unique_raffle_stats_slot",
+            ),
+        )
+        verbose_name_plural = "raffle stats"
+
+    def __str__(self) -> str:
+        raffle_ref = getattr(self, "raffle_id", None)
+        return f"Stats slot {self.slot} for raffle {raffle_ref or 'unknown'}"
+
+
 class Payment(models.Model):
     purchase: models.ForeignKey[Purchase]
     created_by: models.ForeignKey[User]
@@ -212,6 +604,45 @@ class OnlinePayment(models.Model):
         return f"{self.gateway_name} payment {self.gateway_tx_id}"
 
 
+class PaymentWithReceiptQuerySet(QuerySet["PaymentWithReceipt"]):
+    def pending(self) -> PaymentWithReceiptQuerySet:
+        return self.filter(
+            verification_status=PaymentWithReceipt.VerificationStatus.PENDING
+        )
+
+    def mark_verified(
+        self,
+        status: str,
+        *,
+        verified_at: datetime | None = None,
+        verified_by: User | None = None,
+    ) -> int:
+        """``PaymentWithReceipt.mark_verified`` for every receipt in one UPDATE.
+        ``verified_by`` is left as is when not given."""
+        changes: dict[str, object] = {
+            "verification_status": status,
+            "verification_date": verified_at or timezone.now(),
+        }
+        if verified_by is not None:
+            changes["verified_by"] = verified_by
+        return self.update(**changes)
+
+
+class PaymentWithReceiptManager(models.Manager["PaymentWithReceipt"]):
+    def get_queryset(self) -> PaymentWithReceiptQuerySet:  # type: ignore[override]
+        return PaymentWithReceiptQuerySet(self.model, using=self._db)
+
+    def pending(self) -> PaymentWithReceiptQuerySet:
+        return self.get_queryset().pending()
+
+
+def receipt_upload_to(instance: PaymentWithReceipt, filename: str) -> str:
+    """Uploads wait under ``receipts/staging/`` until they are re-encoded."""
+    if instance.image_status == PaymentWithReceipt.ImageStatus.STAGED:
+        return f"receipts/staging/{filename}"
+    return f"receipts/{filename}"
+
+
 class PaymentWithReceipt(models.Model):
     payment: models.OneToOneField[Payment]
     verified_by: models.ForeignKey[User]
@@ -221,10 +652,25 @@ class PaymentWithReceipt(models.Model):
         APPROVED = "approved", "Approved"
         REJECTED = "rejected", "Rejected"
 
+    class ImageStatus(models.TextChoices):
+        STAGED = "staged", "Staged"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     payment = models.OneToOneField(
         Payment, on_delete=models.CASCADE, primary_key=True, related_name="receipt"
     )
-    receipt_image = models.ImageField(upload_to="receipts/", null=True, blank=True)
+    receipt_image = models.ImageField(
+        upload_to=receipt_upload_to, null=True, blank=True
+    )
+    receipt_thumbnail = models.ImageField(
+        upload_to="receipts/thumbnails/", null=True, blank=True
+    )
+    # Uploads are STAGED until the worker re-encodes them; FAILED keeps the
+    # original when it cannot be decoded.
+    image_status = models.CharField(
+        max_length=16, choices=ImageStatus.choices, default=ImageStatus.READY
+    )
     selected_numbers = models.JSONField(default=list, blank=True)
 
     verification_status = models.CharField(
@@ -242,6 +688,18 @@ class PaymentWithReceipt(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects: ClassVar[PaymentWithReceiptManager] = PaymentWithReceiptManager()
+
+    class Meta:
+        indexes = (
+            # The verification queue only ever reads pending receipts.
+            models.Index(
+                fields=("payment",),
+                condition=models.Q(verification_status="pending"),
+                name="receipt_pending_idx",
+            ),
+        )
+
     def __str__(self) -> str:
         payment_ref = getattr(self, "payment_id", None)
         return f"Receipt for payment {payment_ref or 'unknown'}"
@@ -250,3 +708,61 @@ class PaymentWithReceipt(models.Model):
         self.verification_status = status
         self.verification_date = verified_at or timezone.now()
         self.save(update_fields=["verification_status", "verification_date"])
+
+
+class ReceiptNumberManager(models.Manager["ReceiptNumber"]):
+    def sync(self, receipt: PaymentWithReceipt, *, created: bool = False) -> None:
+        """Rebuild the rows of ``receipt`` from its ``selected_numbers``."""
+        if not created:
+            self.filter(receipt=receipt).delete()
+        numbers = receipt.selected_numbers
+        if not isinstance(numbers, list) or not numbers:
+            return
+        details = PurchaseDetail.objects.filter(
+            purchase__payments=receipt.payment_id, number__in=numbers
+        ).values_list("pk", flat=True)
+        self.bulk_create(
+            ReceiptNumber(receipt=receipt, detail_id=detail_id) for detail_id in details
+        )
+
+    def processing(self) -> QuerySet[ReceiptNumber]:
+        """Rows of receipts that still await verification."""
+        return self.filter(
+            receipt__verification_status=PaymentWithReceipt.VerificationStatus.PENDING
+        )
+
+
+class ReceiptNumber(models.Model):
+    """
+    One row per ticket a receipt pays for, mirroring ``selected_numbers``.
+
+    "Is this ticket awaiting verification" and "which tickets does this batch
+    of receipts pay for" are indexed joins on these rows instead of unions of
+    JSON lists built in Python. ``selected_numbers`` stays as the
+    client-facing copy.
+    """
+
+    receipt: models.ForeignKey[PaymentWithReceipt]
+    detail: models.ForeignKey[PurchaseDetail]
+
+    receipt = models.ForeignKey(
+        PaymentWithReceipt,
+        on_delete=models.CASCADE,
+        related_name="numbers",
+        db_index=False,  # Covered by unique_receipt_number.
+    )
+    detail = models.ForeignKey(
+        PurchaseDetail, on_delete=models.CASCADE, related_name="receipt_numbers"
+    )
+
+    objects: ClassVar[ReceiptNumberManager] = ReceiptNumberManager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("receipt", "detail"), name="unique_receipt_number"
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Receipt {self.receipt_id} pays detail {self.detail_id}"
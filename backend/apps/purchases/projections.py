@@ -0,0 +1,198 @@
+"""Projections for the purchase read endpoints; see ``apps.common.projections``."""
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Max,
+    Min,
+    OuterRef,
+    QuerySet,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Concat
+
+from apps.common.projections import (
+    Column,
+    Projection,
+    column,
+    decimal_string,
+    iso_datetime,
+)
+
+from .models import PaymentWithReceipt, PurchaseDetail
+
+
+def _customer_name(
+    customer_id: int | None, name: str, email: str, guest_name: str
+) -> str:
+    if customer_id is not None:
+        return name or email
+    return guest_name
+
+
+def _customer_phone(guest_phone: str, customer_id: int | None, phone: str) -> str:
+    if guest_phone:
+        return guest_phone
+    if customer_id is not None:
+        return phone
+    return ""
+
+
+def _customer_email(customer_id: int | None, email: str, guest_email: str) -> str:
+    return email if customer_id is not None else guest_email
+
+
+def _tickets(selected_numbers: list[int], purchase_numbers: list[int]) -> list[str]:
+    return [str(number).zfill(3) for number in selected_numbers or purchase_numbers]
+
+
+class PurchaseManifestProjection(Projection):
+    """Rows of ``PurchaseManifestSerializer`` from a ``PurchaseDetail`` queryset."""
+
+    columns: ClassVar[dict[str, Column]] = {
+        "number": column("number"),
+        "status": column("purchase__status"),
+        "customer_name": column(
+            "purchase__customer_id",
+            "purchase__customer__name",
+            "purchase__customer__email",
+            "purchase__guest_name",
+            convert=_customer_name,
+        ),
+        "customer_phone": column(
+            "purchase__guest_phone",
+            "purchase__customer_id",
+            "purchase__customer__phone",
+            convert=_customer_phone,
+        ),
+        "customer_email": column(
+            "purchase__customer_id",
+            "purchase__customer__email",
+            "purchase__guest_email",
+            convert=_customer_email,
+        ),
+        "reserved_at": column("purchase__reserved_at", convert=iso_datetime),
+        "expires_at": column("purchase__expires_at", convert=iso_datetime),
+        "purchase_id": column("purchase_id"),
+    }
+
+
+class VerificationProjection(Projection):
+    """Rows of ``VerificationReadSerializer`` from a ``PaymentWithReceipt``
+    queryset; ticket fallbacks come from one array subquery, not per row."""
+
+    columns: ClassVar[dict[str, Column]] = {
+        "payment_id": column("payment_id"),
+        "purchase_id": column("payment__purchase_id", convert=str),
+        "raffle_name": column("payment__purchase__raffle__name"),
+        "customer_name": column(
+            "payment__purchase__customer_id",
+            "payment__purchase__customer__name",
+            "payment__purchase__customer__email",
+            "payment__purchase__guest_name",
+            convert=_customer_name,
+        ),
+        "total_amount": column("payment__amount", convert=decimal_string),
+        "tickets": column("selected_numbers", "purchase_numbers", convert=_tickets),
+        "receipt_url": column("receipt_image", convert="get_receipt_url"),
+        "receipt_thumbnail_url": column(
+            "receipt_thumbnail", convert="get_receipt_thumbnail_url"
+        ),
+        "image_status": column("image_status"),
+        "payment_date": column("payment__payment_date", convert=iso_datetime),
+        "status": column("verification_status"),
+    }
+
+    def prepare(self, queryset: QuerySet) -> QuerySet:
+        return queryset.annotate(
+            purchase_numbers=ArraySubquery(
+                PurchaseDetail.objects.filter(
+                    purchase_id=OuterRef("payment__purchase_id")
+                )
+                .order_by("number")
+                .values("number")
+            )
+        )
+
+    def get_receipt_url(self, name: str | None) -> str | None:
+        storage = PaymentWithReceipt._meta.get_field("receipt_image").storage
+        return self.file_url(storage, name)
+
+    def get_receipt_thumbnail_url(self, name: str | None) -> str | None:
+        storage = PaymentWithReceipt._meta.get_field("receipt_thumbnail").storage
+        return self.file_url(storage, name)
+
+
+class DebtorProjection(Projection):
+    """One row per customer or guest phone owing on reserved numbers, from a
+    queryset of pending ``PurchaseDetail`` rows; grouping happens in SQL.
+
+    ``debtor`` is a stable key (``customer:<id>`` or ``guest:<phone>``) that
+    cursor pages are ordered by.
+    """
+
+    columns: ClassVar[dict[str, Column]] = {
+        "debtor": column("debtor"),
+        "customer_id": column("purchase__customer_id"),
+        "customer_name": column(
+            "purchase__customer_id",
+            "customer_name",
+            "customer_email",
+            "guest_name",
+            convert=_customer_name,
+        ),
+        "customer_phone": column(
+            "guest_phone",
+            "purchase__customer_id",
+            "customer_phone",
+            convert=_customer_phone,
+        ),
+        "customer_email": column(
+            "purchase__customer_id",
+            "customer_email",
+            "guest_email",
+            convert=_customer_email,
+        ),
+        "numbers": column("numbers"),
+        "reserved_count": column("reserved_count"),
+        "amount_owed": column("amount_owed", convert=decimal_string),
+        "expires_at": column("expires_at", convert=iso_datetime),
+    }
+
+    def prepare(self, queryset: QuerySet) -> QuerySet:
+        debtor = Case(
+            When(
+                purchase__customer_id__isnull=False,
+                then=Concat(
+                    Value("customer:"),
+                    Cast("purchase__customer_id", output_field=CharField()),
+                ),
+            ),
+            default=Concat(Value("guest:"), "purchase__guest_phone"),
+        )
+        return (
+            queryset.annotate(debtor=debtor)
+            .values("debtor", "purchase__customer_id")
+            .annotate(
+                customer_name=Max("purchase__customer__name"),
+                customer_email=Max("purchase__customer__email"),
+                customer_phone=Max("purchase__customer__phone"),
+                guest_name=Max("purchase__guest_name"),
+                guest_phone=Max("purchase__guest_phone"),
+                guest_email=Max("purchase__guest_email"),
+                numbers=ArrayAgg("number", order_by="number"),
+                reserved_count=Count("pk"),
+                amount_owed=Sum("unit_price"),
+                expires_at=Min("purchase__expires_at"),
+            )
+            .order_by("debtor")
+        )
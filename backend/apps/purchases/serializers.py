@@ -4,7 +4,9 @@ from django.core.validators import RegexValidator
 
 from rest_framework import serializers
 
-from .models import PaymentWithReceipt, Purchase, PurchaseDetail
+from apps.raffles.serializers import ImageVariantsField
+
+from .models import PaymentWithReceipt, Purchase, PurchaseDetail, ReceiptNumber
 
 
 class ReservationSerializer(serializers.Serializer):
@@ -62,6 +64,7 @@ class PurchaseReadSerializer(serializers.ModelSerializer):
         source="raffle.draw_scheduled_at", read_only=True
     )
     raffle_image = serializers.ImageField(source="raffle.image", read_only=True)
+    raffle_image_variants = ImageVariantsField(source="raffle.image_variants")
     details = PurchaseDetailSerializer(many=True, read_only=True)
     processing_numbers = serializers.SerializerMethodField()
 
@@ -81,6 +84,7 @@ class PurchaseReadSerializer(serializers.ModelSerializer):
             "guest_name",
             "guest_phone",
             "raffle_image",
+            "raffle_image_variants",
             "processing_numbers",
         ]
 
@@ -93,16 +97,17 @@ class PurchaseReadSerializer(serializers.ModelSerializer):
         return "closed"
 
     def get_processing_numbers(self, obj: Purchase) -> list[int]:
-        processing = set()
-        for payment in obj.payments.all():  # type: ignore
-            if hasattr(payment, "receipt"):
-                receipt = payment.receipt
-                if (
-                    receipt.verification_status
-                    == PaymentWithReceipt.VerificationStatus.PENDING
-                ):
-                    processing.update(receipt.selected_numbers)
-        return sorted(processing)
+        # Listings annotate these via PurchaseQuerySet.with_processing_numbers().
+        numbers = getattr(obj, "processing_numbers", None)
+        if numbers is None:
+            numbers = (
+                ReceiptNumber.objects.processing()
+                .filter(detail__purchase=obj)
+                .order_by("detail__number")
+                .distinct()
+                .values_list("detail__number", flat=True)
+            )
+        return list(numbers)
 
 
 class PaymentReceiptSerializer(serializers.Serializer):
@@ -180,6 +185,9 @@ class VerificationReadSerializer(serializers.ModelSerializer):
     )
     status = serializers.CharField(source="verification_status", read_only=True)
     receipt_url = serializers.ImageField(source="receipt_image", read_only=True)
+    receipt_thumbnail_url = serializers.ImageField(
+        source="receipt_thumbnail", read_only=True
+    )
 
     class Meta:
         model = PaymentWithReceipt
@@ -191,6 +199,8 @@ class VerificationReadSerializer(serializers.ModelSerializer):
             "total_amount",
             "tickets",
             "receipt_url",
+            "receipt_thumbnail_url",
+            "image_status",
             "payment_date",
             "status",
         ]
@@ -224,3 +234,47 @@ class VerificationActionSerializer(serializers.Serializer):
     """Serializer for the approve/reject action."""
 
     action = serializers.ChoiceField(choices=["approve", "reject"])
+
+
+class VerificationQueueFilterSerializer(serializers.Serializer):
+    """Query parameters of the verification queue."""
+
+    raffle = serializers.IntegerField(required=False, min_value=1)
+    date_from = serializers.DateField(
+        required=False, help_text="First payment date included (YYYY-MM-DD)."
+    )
+    date_to = serializers.DateField(
+        required=False, help_text="Last payment date included (YYYY-MM-DD)."
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError(
+                {"date_to": "La fecha final no puede ser anterior a la inicial."}
+            )
+        return attrs
+
+
+# Receipts an organizer can approve or reject in one request.
+BULK_VERIFICATION_LIMIT = 500
+
+
+class BulkVerificationActionSerializer(VerificationActionSerializer):
+    """Serializer for approving or rejecting many receipts at once."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_VERIFICATION_LIMIT,
+        help_text="Receipt (payment) ids to verify.",
+    )
+
+
+class BulkVerificationResultSerializer(serializers.Serializer):
+    verified = serializers.ListField(child=serializers.IntegerField())
+    skipped = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Ids that do not exist or are no longer pending.",
+    )
@@ -1,13 +1,37 @@
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 
-from apps.purchases.models import Purchase, PurchaseDetail
+from apps.common.images import (
+    InvalidImageError,
+    encode_image,
+    extension,
+    load_image,
+)
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleNumber,
+    RaffleStats,
+    ReceiptNumber,
+    TicketTotals,
+)
 from apps.raffles.models import Raffle
+from apps.raffles.services import invalidate_raffle_availability
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AnonymousUser
+    from django.core.files.uploadedfile import UploadedFile
 
     from apps.authentication.models import User
 
@@ -25,9 +49,9 @@ def create_reservation(
         guest_info = {}
 
     with transaction.atomic():
-        # 1. Get Raffle (lock it to prevent race conditions)
+        # 1. Get Raffle (no row lock: the number claims below are the lock)
         try:
-            raffle = Raffle.objects.select_for_update().get(pk=raffle_id)
+            raffle = Raffle.objects.get(pk=raffle_id)
         except Raffle.DoesNotExist:
             raise ValidationError("Sorteo no encontrado.") from None
 
@@ -39,23 +63,7 @@ def create_reservation(
             if not (raffle.number_start <= num <= raffle.number_end):
                 raise ValidationError(f"El número {num} está fuera de rango.")
 
-        # 3. Check Availability (Locking)
-        # We need to ensure these numbers aren't taken by ACTIVE purchases
-        # Active = Pending (not expired) OR Paid
-        taken_numbers = PurchaseDetail.objects.filter(
-            purchase__raffle=raffle, number__in=numbers
-        ).select_related("purchase")
-
-        for detail in taken_numbers:
-            # Check if purchase is active
-            if detail.purchase.status in [
-                Purchase.Status.PAID,
-                Purchase.Status.PENDING,
-            ]:
-                # You might want to check expiration here too, but for simplicity:
-                raise ValidationError(f"El número {detail.number} no está disponible.")
-
-        # 4. Create Purchase
+        # 3. Create Purchase
         total_amount = raffle.price_per_number * len(numbers)
 
         purchase = Purchase(
@@ -72,7 +80,7 @@ def create_reservation(
         purchase.full_clean()  # Validate model constraints
         purchase.save()
 
-        # 5. Create Details
+        # 4. Create Details
         details = [
             PurchaseDetail(
                 purchase=purchase,
@@ -80,8 +88,300 @@ def create_reservation(
                 unit_price=raffle.price_per_number,
                 status=Purchase.Status.PENDING,
             )
-            for num in numbers
+            for num in sorted(numbers)
         ]
         PurchaseDetail.objects.bulk_create(details)
 
+        # 5. Claim the numbers. The unique (raffle, number) constraint rejects
+        # numbers held by an active purchase, including one committed by a
+        # concurrent request; claims are inserted in ascending order so
+        # overlapping requests cannot deadlock.
+        try:
+            with transaction.atomic():
+                RaffleNumber.objects.claim(raffle.id, details)
+        except IntegrityError:
+            taken_number = (
+                RaffleNumber.objects.filter(raffle=raffle, number__in=numbers)
+                .values_list("number", flat=True)
+                .first()
+            )
+            if taken_number is None:
+                raise ValidationError(
+                    "Uno de los números seleccionados ya no está disponible."
+                ) from None
+            raise ValidationError(
+                f"El número {taken_number} no está disponible."
+            ) from None
+
+        invalidate_raffle_availability(raffle.id)
+
         return purchase
+
+
+def expire_reservations(*, batch_size: int = 500, now: datetime | None = None) -> int:
+    """
+    Expires PENDING purchases whose ``expires_at`` has passed, together with
+    their pending details, and releases the numbers they held.
+
+    Work is done in batches of ``batch_size`` purchases, each in its own short
+    transaction. Rows locked by a concurrent request are skipped and picked up
+    by the next run. Purchases with a receipt awaiting verification are left
+    alone so the organizer can still approve them.
+
+    Returns the number of purchases expired.
+    """
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Purchase.objects.overdue(now)
+                .exclude(
+                    payments__receipt__verification_status=(
+                        PaymentWithReceipt.VerificationStatus.PENDING
+                    )
+                )
+                .select_for_update(skip_locked=True, of=("self",))
+                .values_list("pk", "raffle_id")[:batch_size]
+            )
+            if not batch:
+                break
+
+            purchase_ids = [pk for pk, _ in batch]
+            details = PurchaseDetail.objects.filter(
+                purchase_id__in=purchase_ids, status=Purchase.Status.PENDING
+            )
+            RaffleNumber.objects.release(details)
+            details.update(status=Purchase.Status.EXPIRED)
+            Purchase.objects.filter(pk__in=purchase_ids).update(
+                status=Purchase.Status.EXPIRED
+            )
+            for raffle_id in {raffle_id for _, raffle_id in batch}:
+                invalidate_raffle_availability(raffle_id)
+
+        expired += len(batch)
+        if len(batch) < batch_size:
+            break
+    return expired
+
+
+def upload_receipt(
+    purchase: Purchase,
+    numbers: list[int],
+    receipt_image: "UploadedFile",
+    *,
+    user: "User | AnonymousUser",
+) -> list[int]:
+    """
+    Records a payment with its receipt for ``numbers`` of ``purchase``.
+
+    The purchase row is locked so concurrent uploads for it are serialized,
+    then one query returns each ticket's status and whether a pending receipt
+    already covers it, through the ``ReceiptNumber`` rows. Numbers outside the purchase, or already awaiting
+    verification, are refused.
+
+    The image is stored as uploaded, in the staging area, and handed to
+    ``process_receipt_image`` on a worker once the transaction commits.
+
+    Returns the purchase's numbers that are neither paid nor awaiting
+    verification once this receipt is recorded.
+    """
+    with transaction.atomic():
+        Purchase.objects.select_for_update().filter(pk=purchase.pk).order_by().exists()
+        awaiting = ReceiptNumber.objects.processing().filter(detail=OuterRef("pk"))
+        tickets = {
+            number: (pk, status, unit_price, processing)
+            for pk, number, status, unit_price, processing in purchase.details.annotate(
+                processing=Exists(awaiting)
+            ).values_list("pk", "number", "status", "unit_price", "processing")
+        }
+        if not tickets:
+            raise ValidationError("La compra no tiene boletos asociados.")
+
+        selected = set(numbers)
+        if not selected.issubset(tickets):
+            raise ValidationError(
+                {"numbers": "Los números enviados no pertenecen a esta reservación."}
+            )
+        already_processing = sorted(number for number in selected if tickets[number][3])
+        if already_processing:
+            raise ValidationError(
+                {
+                    "numbers": "Los siguientes números ya se encuentran en proceso "
+                    f"de verificación: {already_processing}"
+                }
+            )
+
+        payment = Payment.objects.create(
+            purchase=purchase,
+            amount=sum(tickets[number][2] for number in numbers),
+            created_by=user if user.is_authenticated else None,
+        )
+        # Bulk insert skips the post_save mirror; the rows are known already.
+        (receipt,) = PaymentWithReceipt.objects.bulk_create(
+            [
+                PaymentWithReceipt(
+                    payment=payment,
+                    receipt_image=receipt_image,
+                    image_status=PaymentWithReceipt.ImageStatus.STAGED,
+                    selected_numbers=numbers,
+                )
+            ]
+        )
+        ReceiptNumber.objects.bulk_create(
+            ReceiptNumber(receipt=receipt, detail_id=tickets[number][0])
+            for number in selected
+        )
+        # Imported here: the tasks module imports this one.
+        from apps.purchases.tasks import process_receipt_image as process_image
+
+        transaction.on_commit(lambda: process_image.delay(receipt.pk))
+
+    return sorted(
+        number
+        for number, (_, status, _, processing) in tickets.items()
+        if status != Purchase.Status.PAID and not processing and number not in selected
+    )
+
+
+def process_receipt_image(receipt_id: int) -> bool:
+    """
+    Re-encodes a staged receipt upload: upright, at most
+    ``RECEIPT_IMAGE_MAX_EDGE`` pixels on its longest side, as JPEG without
+    metadata, plus a ``RECEIPT_THUMBNAIL_EDGE`` thumbnail for the
+    verification queue. The staged original is deleted afterwards.
+
+    An upload that cannot be read or decoded (missing from the worker's
+    storage, unreadable, not an image) is marked FAILED and kept as is.
+
+    Returns whether the image was processed.
+    """
+    receipt = PaymentWithReceipt.objects.filter(
+        pk=receipt_id, image_status=PaymentWithReceipt.ImageStatus.STAGED
+    ).first()
+    if receipt is None or not receipt.receipt_image:
+        return False
+
+    staged = receipt.receipt_image.name
+    try:
+        with receipt.receipt_image.open("rb") as file:
+            image = load_image(file)
+    except (InvalidImageError, OSError):
+        PaymentWithReceipt.objects.filter(pk=receipt_id).update(
+            image_status=PaymentWithReceipt.ImageStatus.FAILED
+        )
+        return False
+
+    name = f"{Path(staged).stem}.{extension('JPEG')}"
+    receipt.image_status = PaymentWithReceipt.ImageStatus.READY
+    receipt.receipt_image.save(
+        name,
+        encode_image(image, max_edge=settings.RECEIPT_IMAGE_MAX_EDGE),
+        save=False,
+    )
+    receipt.receipt_thumbnail.save(
+        name,
+        encode_image(image, max_edge=settings.RECEIPT_THUMBNAIL_EDGE),
+        save=False,
+    )
+    receipt.save(update_fields=["receipt_image", "receipt_thumbnail", "image_status"])
+    receipt.receipt_image.storage.delete(staged)
+    return True
+
+
+@dataclass(frozen=True)
+class BulkVerification:
+    verified: list[int]
+    skipped: list[int]
+
+
+def verify_receipts(
+    receipt_ids: Iterable[int], *, approve: bool, user: "User"
+) -> BulkVerification:
+    """
+    Approves or rejects many pending receipts in one transaction.
+
+    Approving marks the numbers each receipt selected as PAID; rejecting puts
+    them back to PENDING, like ``VerificationViewSet.verify`` does for one
+    receipt. Receipts, tickets and claims are each updated with a constant
+    number of statements whatever the batch size.
+
+    Ids that do not exist or are no longer pending are returned as skipped.
+    """
+    receipt_ids = list(dict.fromkeys(receipt_ids))
+    verification_status, ticket_status = (
+        (PaymentWithReceipt.VerificationStatus.APPROVED, Purchase.Status.PAID)
+        if approve
+        else (PaymentWithReceipt.VerificationStatus.REJECTED, Purchase.Status.PENDING)
+    )
+
+    with transaction.atomic():
+        receipts = list(
+            PaymentWithReceipt.objects.pending()
+            .filter(pk__in=receipt_ids)
+            .select_for_update(of=("self",))
+            .order_by("pk")
+            .values_list("pk", "payment__purchase_id")
+        )
+        verified = [pk for pk, _ in receipts]
+        PaymentWithReceipt.objects.filter(pk__in=verified).mark_verified(
+            verification_status, verified_by=user
+        )
+
+        details = PurchaseDetail.objects.filter(
+            pk__in=ReceiptNumber.objects.filter(receipt__in=verified).values("detail")
+        )
+        if details.update(status=ticket_status):
+            RaffleNumber.objects.sync(details)
+
+        Purchase.objects.filter(
+            pk__in={purchase_id for _, purchase_id in receipts}
+        ).sync_status_from_details()
+
+    verified_ids = set(verified)
+    return BulkVerification(
+        verified=verified,
+        skipped=[pk for pk in receipt_ids if pk not in verified_ids],
+    )
+
+
+@dataclass(frozen=True)
+class StatsDrift:
+    raffle_id: int
+    stored: TicketTotals
+    expected: TicketTotals
+
+
+def reconcile_raffle_stats(
+    *, raffle_ids: Iterable[int] | None = None, dry_run: bool = False
+) -> list[StatsDrift]:
+    """
+    Compare each raffle's ``RaffleStats`` with totals recomputed from
+    ``PurchaseDetail`` and, unless ``dry_run``, overwrite the counters that
+    drifted. Each raffle is checked in its own transaction under a lock on its
+    slots; writers move the counters last, so once the slots are locked every
+    committed ticket change is visible.
+
+    Returns the raffles that had drifted.
+    """
+    raffles = Raffle.objects.order_by("pk")
+    if raffle_ids is not None:
+        raffles = raffles.filter(pk__in=list(raffle_ids))
+    drifts = []
+    for raffle_id in raffles.values_list("pk", flat=True):
+        with transaction.atomic():
+            slots = RaffleStats.objects.select_for_update().filter(raffle_id=raffle_id)
+            list(slots.values_list("pk", flat=True))
+            stored = RaffleStats.objects.totals([raffle_id]).get(
+                raffle_id, TicketTotals()
+            )
+            expected = RaffleStats.objects.recompute([raffle_id]).get(
+                raffle_id, TicketTotals()
+            )
+            if stored == expected:
+                continue
+            drifts.append(StatsDrift(raffle_id, stored, expected))
+            if not dry_run:
+                slots.update(**asdict(TicketTotals()))
+                RaffleStats.objects.adjust({(raffle_id, 0): expected})
+    return drifts
@@ -0,0 +1,60 @@
+"""Signal handlers for purchases app."""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.raffles.models import Raffle
+
+from .models import (
+    RAFFLE_STATS_SLOTS,
+    PaymentWithReceipt,
+    PurchaseDetail,
+    RaffleNumber,
+    RaffleStats,
+    ReceiptNumber,
+)
+
+
+@receiver(post_save, sender=Raffle)
+def create_raffle_stats(
+    sender: type[Raffle], instance: Raffle, created: bool, **kwargs: object
+) -> None:
+    """Start every raffle with its counter rows so ticket writes only update."""
+    if created:
+        RaffleStats.objects.bulk_create(
+            RaffleStats(raffle=instance, slot=slot)
+            for slot in range(RAFFLE_STATS_SLOTS)
+        )
+
+
+@receiver(post_save, sender=PurchaseDetail)
+def sync_raffle_number(
+    sender: type[PurchaseDetail], instance: PurchaseDetail, **kwargs: object
+) -> None:
+    """Keep the number claim in step with details saved one at a time.
+
+    Bulk writes (``bulk_create``/``update``) bypass this handler and go through
+    ``RaffleNumber.objects.claim``/``sync`` explicitly.
+    """
+    RaffleNumber.objects.sync(PurchaseDetail.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=PaymentWithReceipt)
+def sync_receipt_numbers(
+    sender: type[PaymentWithReceipt],
+    instance: PaymentWithReceipt,
+    created: bool,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: object,
+) -> None:
+    """Mirror ``selected_numbers`` into ``ReceiptNumber`` rows.
+
+    Saves limited to other fields (verification status, reviewer) are skipped.
+    Bulk writes bypass this handler and call ``ReceiptNumber.objects.sync`` or
+    create the rows explicitly.
+    """
+    if update_fields is not None and "selected_numbers" not in update_fields:
+        return
+    ReceiptNumber.objects.sync(instance, created=created)
@@ -0,0 +1,26 @@
+from django.conf import settings
+
+from celery import shared_task
+
+from apps.purchases.services import expire_reservations as expire_overdue
+from apps.purchases.services import process_receipt_image as process_image
+from apps.purchases.services import reconcile_raffle_stats as reconcile_stats
+
+
+@shared_task(ignore_result=True)
+def expire_reservations() -> int:
+    """Periodic sweep that releases numbers held by overdue reservations."""
+    return expire_overdue(batch_size=settings.RESERVATION_EXPIRY_BATCH_SIZE)
+
+
+@shared_task(ignore_result=True)
+def reconcile_raffle_stats() -> int:
+    """Periodic check that corrects drift in the raffle counters, keeping the
+    historical report exact. Returns how many raffles were corrected."""
+    return len(reconcile_stats())
+
+
+@shared_task(ignore_result=True)
+def process_receipt_image(receipt_id: int) -> bool:
+    """Re-encode a staged receipt upload and generate its thumbnail."""
+    return process_image(receipt_id)
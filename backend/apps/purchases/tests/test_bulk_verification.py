@@ -0,0 +1,186 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleStats,
+    TicketTotals,
+)
+from apps.purchases.serializers import BULK_VERIFICATION_LIMIT
+from apps.purchases.services import create_reservation
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+GUEST = {"guest_name": "Guest", "guest_phone": "1234567890"}
+URL = reverse("verifications-bulk-verify")
+
+
+@pytest.fixture
+def raffle(organizer_user):
+    return Raffle.objects.create(
+        name="Bulk Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+@pytest.fixture
+def organizer_client(api_client, organizer_user):
+    api_client.force_authenticate(user=organizer_user)
+    return api_client
+
+
+def receipt_for(purchase, numbers):
+    payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+    return PaymentWithReceipt.objects.create(payment=payment, selected_numbers=numbers)
+
+
+def reserve(raffle, numbers):
+    return create_reservation(AnonymousUser(), raffle.id, numbers, GUEST)
+
+
+def ticket_statuses(purchase):
+    return dict(purchase.details.values_list("number", "status"))
+
+
+class TestBulkVerification:
+    def test_approve_marks_selected_numbers_paid(
+        self, organizer_client, organizer_user, raffle
+    ):
+        first = reserve(raffle, [1, 2])
+        second = reserve(raffle, [3])
+        receipts = [receipt_for(first, [1]), receipt_for(second, [3])]
+
+        response = organizer_client.post(
+            URL,
+            {"action": "approve", "ids": [receipt.pk for receipt in receipts]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "verified": [receipt.pk for receipt in receipts],
+            "skipped": [],
+        }
+        for receipt in receipts:
+            receipt.refresh_from_db()
+            assert (
+                receipt.verification_status
+                == PaymentWithReceipt.VerificationStatus.APPROVED
+            )
+            assert receipt.verified_by == organizer_user
+            assert receipt.verification_date is not None
+
+        assert ticket_statuses(first) == {
+            1: Purchase.Status.PAID,
+            2: Purchase.Status.PENDING,
+        }
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.status == Purchase.Status.PAID
+        assert second.status == Purchase.Status.PAID
+
+        totals = RaffleStats.objects.totals([raffle.id])[raffle.id]
+        assert totals == TicketTotals(
+            sold_count=2,
+            reserved_count=1,
+            collected_amount=Decimal("20.00"),
+            outstanding_amount=Decimal("10.00"),
+        )
+
+    def test_reject_reverts_numbers_to_pending(self, organizer_client, raffle):
+        purchase = reserve(raffle, [5, 6])
+        PurchaseDetail.objects.filter(purchase=purchase, number=5).update(
+            status=Purchase.Status.PAID
+        )
+        receipt = receipt_for(purchase, [5])
+
+        response = organizer_client.post(
+            URL, {"action": "reject", "ids": [receipt.pk]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        receipt.refresh_from_db()
+        assert (
+            receipt.verification_status
+            == PaymentWithReceipt.VerificationStatus.REJECTED
+        )
+        assert ticket_statuses(purchase) == {
+            5: Purchase.Status.PENDING,
+            6: Purchase.Status.PENDING,
+        }
+
+    def test_skips_missing_and_already_verified_receipts(
+        self, organizer_client, raffle
+    ):
+        purchase = reserve(raffle, [7, 8])
+        pending = receipt_for(purchase, [7])
+        done = receipt_for(purchase, [8])
+        done.mark_verified(PaymentWithReceipt.VerificationStatus.REJECTED)
+
+        response = organizer_client.post(
+            URL,
+            {"action": "approve", "ids": [done.pk, pending.pk, 999999, pending.pk]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"verified": [pending.pk], "skipped": [done.pk, 999999]}
+        assert ticket_statuses(purchase) == {
+            7: Purchase.Status.PAID,
+            8: Purchase.Status.PENDING,
+        }
+
+    def test_query_count_does_not_grow_with_receipts_of_a_purchase(
+        self, organizer_client, raffle, django_assert_max_num_queries
+    ):
+        numbers = list(range(10, 60))
+        purchase = reserve(raffle, numbers)
+        ids = [receipt_for(purchase, [number]).pk for number in numbers]
+
+        with django_assert_max_num_queries(16):
+            response = organizer_client.post(
+                URL, {"action": "approve", "ids": ids}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["verified"]) == len(numbers)
+        purchase.refresh_from_db()
+        assert purchase.status == Purchase.Status.PAID
+
+    def test_rejects_batches_over_the_limit(self, organizer_client):
+        ids = list(range(1, BULK_VERIFICATION_LIMIT + 2))
+        response = organizer_client.post(
+            URL, {"action": "approve", "ids": ids}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_customer_is_forbidden(self, api_client, user_factory, raffle):
+        receipt = receipt_for(reserve(raffle, [9]), [9])
+        api_client.force_authenticate(user=user_factory(email="c@example.com"))
+
+        response = api_client.post(
+            URL, {"action": "approve", "ids": [receipt.pk]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        receipt.refresh_from_db()
+        assert (
+            receipt.verification_status == PaymentWithReceipt.VerificationStatus.PENDING
+        )
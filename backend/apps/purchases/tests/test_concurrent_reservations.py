@@ -0,0 +1,188 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+import pytest
+
+from apps.purchases.models import RaffleNumber, RaffleStats, TicketTotals
+from apps.purchases.services import create_reservation
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+GUEST = {"guest_name": "Guest", "guest_phone": "1234567890"}
+
+
+@pytest.fixture(autouse=True)
+def _requires_postgres():
+    if connection.vendor != "postgresql":
+        pytest.skip("Concurrent claim semantics are checked against PostgreSQL.")
+
+
+@pytest.fixture
+def raffle(organizer_user):
+    return Raffle.objects.create(
+        name="Concurrent Raffle",
+        number_start=1,
+        number_end=1000,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+def reserve(raffle_id, numbers, start=None):
+    try:
+        if start is not None:
+            start.wait(timeout=10)
+        return create_reservation(AnonymousUser(), raffle_id, numbers, GUEST)
+    finally:
+        connection.close()
+
+
+def hold(work, ready, release):
+    """Run ``work`` in a transaction and keep it open until ``release``."""
+    try:
+        with transaction.atomic():
+            work()
+            ready.set()
+            release.wait(timeout=10)
+    finally:
+        connection.close()
+
+
+class TestNumberLocking:
+    def test_disjoint_numbers_do_not_wait(self, raffle):
+        ready, release = threading.Event(), threading.Event()
+        holder = threading.Thread(
+            target=hold,
+            args=(
+                lambda: create_reservation(AnonymousUser(), raffle.id, [1], GUEST),
+                ready,
+                release,
+            ),
+        )
+        holder.start()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            assert ready.wait(timeout=10)
+            future = pool.submit(reserve, raffle.id, [2])
+            purchase = future.result(timeout=5)
+            assert purchase.details.count() == 1
+        finally:
+            release.set()
+            holder.join()
+            pool.shutdown()
+
+    def test_overlapping_numbers_wait_for_holder(self, raffle):
+        ready, release = threading.Event(), threading.Event()
+        holder = threading.Thread(
+            target=hold,
+            args=(
+                lambda: create_reservation(AnonymousUser(), raffle.id, [5, 6], GUEST),
+                ready,
+                release,
+            ),
+        )
+        holder.start()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            assert ready.wait(timeout=10)
+            future = pool.submit(reserve, raffle.id, [6, 7])
+            time.sleep(0.5)
+            assert not future.done()
+
+            release.set()
+            with pytest.raises(ValidationError, match="6"):
+                future.result(timeout=10)
+        finally:
+            release.set()
+            holder.join()
+            pool.shutdown()
+
+        assert sorted(
+            RaffleNumber.objects.filter(raffle=raffle).values_list("number", flat=True)
+        ) == [5, 6]
+
+
+class TestConcurrentClients:
+    CLIENTS = 8
+
+    def test_disjoint_reservations_all_succeed(self, raffle):
+        start = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.CLIENTS) as pool:
+            futures = [
+                pool.submit(reserve, raffle.id, [10 * i + 1, 10 * i + 2], start)
+                for i in range(self.CLIENTS)
+            ]
+            start.set()
+            purchases = [future.result(timeout=30) for future in futures]
+
+        assert len(purchases) == self.CLIENTS
+        assert RaffleNumber.objects.filter(raffle=raffle).count() == 2 * self.CLIENTS
+
+    def test_contended_number_is_sold_once(self, raffle):
+        start = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.CLIENTS) as pool:
+            futures = [
+                pool.submit(reserve, raffle.id, [500, 600 + i], start)
+                for i in range(self.CLIENTS)
+            ]
+            start.set()
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(future.result(timeout=30))
+                except ValidationError:
+                    outcomes.append(None)
+
+        assert sum(outcome is not None for outcome in outcomes) == 1
+        assert RaffleNumber.objects.filter(raffle=raffle, number=500).count() == 1
+
+
+def release(purchase):
+    try:
+        with transaction.atomic():
+            RaffleNumber.objects.release(purchase.details.all())
+    finally:
+        connection.close()
+
+
+class TestConcurrentRelease:
+    def test_double_release_subtracts_once(self, raffle):
+        purchase = create_reservation(AnonymousUser(), raffle.id, [1, 2, 3], GUEST)
+        ready, done = threading.Event(), threading.Event()
+        holder = threading.Thread(
+            target=hold,
+            args=(
+                lambda: RaffleNumber.objects.release(purchase.details.all()),
+                ready,
+                done,
+            ),
+        )
+        holder.start()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            assert ready.wait(timeout=10)
+            future = pool.submit(release, purchase)
+            time.sleep(0.5)
+            assert not future.done()
+
+            done.set()
+            future.result(timeout=10)
+        finally:
+            done.set()
+            holder.join()
+            pool.shutdown()
+
+        assert not RaffleNumber.objects.filter(raffle=raffle).exists()
+        assert RaffleStats.objects.totals([raffle.id])[raffle.id] == TicketTotals()
@@ -0,0 +1,130 @@
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def raffle(organizer_user):
+    return Raffle.objects.create(
+        name="Debtors Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+def reserve(raffle, numbers, *, status=Purchase.Status.PENDING, **owner):
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        status=status,
+        total_amount=Decimal("10.00") * len(numbers),
+        **owner,
+    )
+    for number in numbers:
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=number, unit_price=10, status=status
+        )
+    return purchase
+
+
+@pytest.fixture
+def debtors_url(api_client, organizer_user, user_factory, raffle):
+    customer = user_factory(email="debtor@example.com", name="Debtor")
+    reserve(raffle, [7, 3], customer=customer)
+    reserve(raffle, [12], customer=customer)
+    guest = {"guest_name": "Guest", "guest_phone": "1234567890"}
+    reserve(raffle, [20], **guest)
+    reserve(raffle, [21, 22], **guest)
+    reserve(raffle, [30], status=Purchase.Status.PAID, guest_phone="5555555555")
+    reserve(raffle, [31], status=Purchase.Status.CANCELED, guest_phone="5555555555")
+
+    api_client.force_authenticate(user=organizer_user)
+    return reverse("raffle-debtors", kwargs={"pk": raffle.pk})
+
+
+class TestDebtorsReport:
+    def test_groups_pending_numbers_per_debtor(
+        self, api_client, debtors_url, django_assert_num_queries
+    ):
+        # The raffle lookup and the grouped report query.
+        with django_assert_num_queries(2):
+            response = api_client.get(debtors_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        by_name = {row["customer_name"]: row for row in response.data}
+        assert set(by_name) == {"Debtor", "Guest"}
+
+        customer = by_name["Debtor"]
+        assert customer["customer_email"] == "debtor@example.com"
+        assert customer["numbers"] == [3, 7, 12]
+        assert customer["reserved_count"] == 3
+        assert customer["amount_owed"] == "30.00"
+
+        guest = by_name["Guest"]
+        assert guest["debtor"] == "guest:1234567890"
+        assert guest["customer_id"] is None
+        assert guest["customer_phone"] == "1234567890"
+        assert guest["numbers"] == [20, 21, 22]
+        assert guest["amount_owed"] == "30.00"
+
+    def test_partially_paid_purchase_still_owes_pending_numbers(
+        self, api_client, raffle, debtors_url
+    ):
+        purchase = reserve(raffle, [40, 41], guest_phone="4444444444")
+        purchase.details.filter(number=40).update(status=Purchase.Status.PAID)
+        Purchase.objects.filter(pk=purchase.pk).update(status=Purchase.Status.PAID)
+
+        rows = api_client.get(debtors_url).data
+        row = next(row for row in rows if row["debtor"] == "guest:4444444444")
+        assert row["numbers"] == [41]
+
+    def test_cursor_pages(self, api_client, raffle, debtors_url):
+        for index in range(3):
+            reserve(raffle, [50 + index], guest_phone=f"90000000{index:02d}")
+
+        first = api_client.get(debtors_url, {"page_size": 3}).data
+        second = api_client.get(first["next"]).data
+
+        assert len(first["results"]) == 3
+        assert len(second["results"]) == 2
+        assert second["next"] is None
+        keys = [row["debtor"] for row in first["results"] + second["results"]]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == 5
+
+    def test_csv_export(self, api_client, debtors_url):
+        response = api_client.get(debtors_url, {"export": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert 'debtors.csv"' in response["Content-Disposition"]
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert [row["customer_name"] for row in rows] == ["Debtor", "Guest"]
+        assert [row["numbers"] for row in rows] == ["3 7 12", "20 21 22"]
+        assert rows[1]["amount_owed"] == "30.00"
+
+    def test_unknown_export_format(self, api_client, debtors_url):
+        response = api_client.get(debtors_url, {"export": "xlsx"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_other_users_are_forbidden(self, api_client, user_factory, raffle):
+        api_client.force_authenticate(user=user_factory(email="other@example.com"))
+        response = api_client.get(reverse("raffle-debtors", kwargs={"pk": raffle.pk}))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
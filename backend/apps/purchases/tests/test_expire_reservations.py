@@ -0,0 +1,111 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleNumber,
+)
+from apps.purchases.services import expire_reservations
+from apps.purchases.tasks import expire_reservations as expire_reservations_task
+from apps.raffles.models import Raffle
+
+
+@pytest.fixture
+def raffle(db, organizer_user):
+    return Raffle.objects.create(
+        name="Expiry Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+def reserve(raffle, numbers, expires_in):
+    now = timezone.now()
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        guest_phone="1234567890",
+        total_amount=Decimal("10.00") * len(numbers),
+        reserved_at=now - timedelta(days=2),
+        expires_at=now + expires_in,
+    )
+    for number in numbers:
+        PurchaseDetail.objects.create(purchase=purchase, number=number, unit_price=10)
+    return purchase
+
+
+def claimed(raffle):
+    return sorted(
+        RaffleNumber.objects.filter(raffle=raffle).values_list("number", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestExpireReservations:
+    def test_expires_overdue_purchases_and_releases_numbers(self, raffle):
+        overdue = reserve(raffle, [1, 2], expires_in=-timedelta(minutes=1))
+        current = reserve(raffle, [3], expires_in=timedelta(hours=1))
+
+        assert expire_reservations() == 1
+
+        overdue.refresh_from_db()
+        current.refresh_from_db()
+        assert overdue.status == Purchase.Status.EXPIRED
+        assert set(overdue.details.values_list("status", flat=True)) == {
+            Purchase.Status.EXPIRED
+        }
+        assert current.status == Purchase.Status.PENDING
+        assert claimed(raffle) == [3]
+
+    def test_processes_all_batches(self, raffle):
+        for number in range(1, 8):
+            reserve(raffle, [number], expires_in=-timedelta(minutes=number))
+
+        assert expire_reservations(batch_size=3) == 7
+        assert claimed(raffle) == []
+        assert not Purchase.objects.filter(status=Purchase.Status.PENDING).exists()
+
+    def test_keeps_purchases_awaiting_verification(self, raffle):
+        purchase = reserve(raffle, [4], expires_in=-timedelta(minutes=1))
+        payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+        PaymentWithReceipt.objects.create(payment=payment, selected_numbers=[4])
+
+        assert expire_reservations() == 0
+        purchase.refresh_from_db()
+        assert purchase.status == Purchase.Status.PENDING
+        assert claimed(raffle) == [4]
+
+    def test_released_numbers_show_as_available(
+        self, api_client, raffle, django_capture_on_commit_callbacks
+    ):
+        reserve(raffle, [5], expires_in=-timedelta(minutes=1))
+        url = reverse("raffle-availability", args=[raffle.pk])
+        assert api_client.get(url).data["taken_numbers"] == [5]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            expire_reservations()
+
+        assert api_client.get(url).data["taken_numbers"] == []
+
+    def test_management_command(self, raffle, capsys):
+        reserve(raffle, [6], expires_in=-timedelta(minutes=1))
+        call_command("expire_reservations", "--batch-size", "10")
+        assert "Expired 1" in capsys.readouterr().out
+        assert claimed(raffle) == []
+
+    def test_task(self, raffle):
+        reserve(raffle, [7], expires_in=-timedelta(minutes=1))
+        assert expire_reservations_task() == 1
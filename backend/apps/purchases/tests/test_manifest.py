@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import timedelta
 from decimal import Decimal
 
@@ -121,3 +124,74 @@ class TestRaffleManifest:
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 0  # No purchases yet
+
+
+@pytest.mark.django_db
+class TestRaffleManifestExport:
+    @pytest.fixture
+    def manifest_url(self, api_client, organizer_user, raffle, purchase_factory):
+        guest = purchase_factory(
+            raffle=raffle,
+            status=Purchase.Status.PAID,
+            guest_name="Guest 1",
+            guest_phone="1234567890",
+            guest_email="guest@example.com",
+        )
+        PurchaseDetail.objects.create(purchase=guest, number=5, unit_price=100)
+        customer = purchase_factory(raffle=raffle, customer=organizer_user)
+        PurchaseDetail.objects.create(purchase=customer, number=2, unit_price=100)
+        canceled = purchase_factory(
+            raffle=raffle,
+            status=Purchase.Status.CANCELED,
+            guest_phone="0987654321",
+        )
+        PurchaseDetail.objects.create(purchase=canceled, number=9, unit_price=100)
+
+        api_client.force_authenticate(user=organizer_user)
+        return reverse("raffle-manifest", kwargs={"pk": raffle.id})
+
+    def manifest(self, api_client, url):
+        return [dict(row) for row in api_client.get(url).data]
+
+    def test_csv_export_matches_manifest(self, api_client, manifest_url):
+        response = api_client.get(manifest_url, {"export": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("text/csv")
+        assert "attachment" in response["Content-Disposition"]
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+
+        expected = self.manifest(api_client, manifest_url)
+        assert [row["number"] for row in rows] == ["2", "5"]
+        for row, item in zip(rows, expected, strict=True):
+            assert row["customer_name"] == item["customer_name"]
+            assert row["customer_phone"] == item["customer_phone"]
+            assert row["customer_email"] == item["customer_email"]
+            assert row["status"] == item["status"]
+            assert row["purchase_id"] == str(item["purchase_id"])
+
+    def test_ndjson_export(self, api_client, manifest_url, organizer_user):
+        response = api_client.get(manifest_url, {"export": "ndjson"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+
+        assert [row["number"] for row in rows] == [2, 5]
+        assert rows[0]["customer_email"] == organizer_user.email
+        assert rows[1]["customer_name"] == "Guest 1"
+        assert rows[1]["status"] == "paid"
+
+    def test_unknown_export_format(self, api_client, manifest_url):
+        response = api_client.get(manifest_url, {"export": "xlsx"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "export" in response.data
+
+    def test_export_requires_organizer(self, api_client, user_factory, raffle):
+        api_client.force_authenticate(user=user_factory())
+        url = reverse("raffle-manifest", kwargs={"pk": raffle.id})
+        response = api_client.get(url, {"export": "csv"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -223,3 +223,50 @@ class TestPaymentUpload:
 
         # We paid for 1. Remaining should be 2, 3.
         assert response.data["remaining_numbers"] == [2, 3]
+
+    def test_remaining_numbers_skip_paid_and_processing(
+        self, api_client, user, user_purchase, image_file
+    ):
+        """Paid numbers and numbers awaiting verification are not remaining."""
+        from apps.purchases.models import PurchaseDetail
+
+        for number, ticket_status in [
+            (1, Purchase.Status.PAID),
+            (2, Purchase.Status.PENDING),
+            (3, Purchase.Status.PENDING),
+            (4, Purchase.Status.PENDING),
+        ]:
+            PurchaseDetail.objects.create(
+                purchase=user_purchase,
+                number=number,
+                unit_price=10.0,
+                status=ticket_status,
+            )
+        payment = Payment.objects.create(purchase=user_purchase, amount=10.0)
+        PaymentWithReceipt.objects.create(payment=payment, selected_numbers=[2])
+
+        api_client.force_authenticate(user=user)
+        url = reverse("purchase-upload-receipt", args=[user_purchase.id])
+
+        response = api_client.post(
+            url,
+            {"receipt_image": image_file, "numbers": [3], "phone": "9999999999"},
+            format="multipart",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["remaining_numbers"] == [4]
+        receipt = PaymentWithReceipt.objects.get(selected_numbers=[3])
+        assert receipt.payment.amount == 10
+
+        # Number 2 is already awaiting verification.
+        image_file.seek(0)
+        response = api_client.post(
+            url,
+            {"receipt_image": image_file, "numbers": [2, 4], "phone": "9999999999"},
+            format="multipart",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "[2]" in str(response.data["numbers"])
+        assert PaymentWithReceipt.objects.count() == 2
@@ -5,7 +5,12 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.authentication.models import User
-from apps.purchases.models import Purchase
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+)
 from apps.raffles.models import Raffle
 
 
@@ -129,3 +134,44 @@ class TestPersonalPanel:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
         assert response.data[0]["id"] == guest_purchase.id
+
+    def test_processing_numbers_in_list(self, api_client, guest_purchase):
+        """Numbers under a pending receipt are reported; reviewed ones are not."""
+        for number in (1, 2, 3):
+            PurchaseDetail.objects.create(
+                purchase=guest_purchase, number=number, unit_price=10
+            )
+        pending = Payment.objects.create(purchase=guest_purchase, amount=10)
+        PaymentWithReceipt.objects.create(payment=pending, selected_numbers=[2, 1])
+        rejected = Payment.objects.create(purchase=guest_purchase, amount=10)
+        PaymentWithReceipt.objects.create(
+            payment=rejected,
+            selected_numbers=[3],
+            verification_status=PaymentWithReceipt.VerificationStatus.REJECTED,
+        )
+
+        response = api_client.get(reverse("purchase-list"), {"phone": "1234567890"})
+
+        assert response.data[0]["processing_numbers"] == [1, 2]
+
+    def test_list_query_count_is_constant(
+        self, api_client, customer_purchase, django_assert_num_queries
+    ):
+        """Hundreds of purchases with receipts load in a fixed number of queries."""
+        purchase, customer = customer_purchase
+        for index in range(300):
+            extra = Purchase.objects.create(
+                raffle=purchase.raffle, customer=customer, total_amount=10
+            )
+            PurchaseDetail.objects.create(purchase=extra, number=index, unit_price=10)
+            payment = Payment.objects.create(purchase=extra, amount=10)
+            PaymentWithReceipt.objects.create(payment=payment, selected_numbers=[index])
+        api_client.force_authenticate(user=customer)
+
+        # Purchases with raffles and processing numbers, then their details.
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse("purchase-list"))
+
+        assert len(response.data) == 301
+        by_id = {row["id"]: row for row in response.data}
+        assert by_id[extra.id]["processing_numbers"] == [299]
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.models import User
+from apps.purchases.models import Payment, PaymentWithReceipt, Purchase, PurchaseDetail
+from apps.purchases.projections import (
+    PurchaseManifestProjection,
+    VerificationProjection,
+)
+from apps.purchases.serializers import (
+    PurchaseManifestSerializer,
+    VerificationReadSerializer,
+)
+from apps.raffles.models import Raffle
+
+GIF = (
+    b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x05\x04\x04\x00\x00"
+    b"\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x44\x01\x00\x3b"
+)
+
+
+@pytest.fixture
+def context():
+    return {"request": APIRequestFactory().get("/")}
+
+
+@pytest.fixture
+def purchases(db, organizer_user, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    raffle = Raffle.objects.create(
+        name="Projection Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    named = User.objects.create_user(
+        email="named@example.com", password="password", name="Named", phone="555"
+    )
+    unnamed = User.objects.create_user(email="unnamed@example.com", password="pw")
+    guest = Purchase.objects.create(
+        raffle=raffle,
+        guest_name="Guest",
+        guest_phone="1234567890",
+        guest_email="guest@example.com",
+        total_amount=Decimal("20.00"),
+    )
+    by_named = Purchase.objects.create(
+        raffle=raffle, customer=named, total_amount=Decimal("10.00")
+    )
+    by_unnamed = Purchase.objects.create(
+        raffle=raffle,
+        customer=unnamed,
+        guest_phone="0987654321",
+        total_amount=Decimal("10.00"),
+    )
+    for purchase, numbers in ((guest, [7, 3]), (by_named, [9]), (by_unnamed, [1])):
+        for number in numbers:
+            PurchaseDetail.objects.create(
+                purchase=purchase, number=number, unit_price=10
+            )
+
+    with_image = Payment.objects.create(purchase=guest, amount=Decimal("20.00"))
+    PaymentWithReceipt.objects.create(
+        payment=with_image,
+        selected_numbers=[],
+        receipt_image=SimpleUploadedFile("r.gif", GIF, content_type="image/gif"),
+    )
+    for purchase, selected in ((by_named, [9]), (by_unnamed, [1])):
+        payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+        PaymentWithReceipt.objects.create(payment=payment, selected_numbers=selected)
+    return raffle
+
+
+def as_plain(data):
+    return [dict(row) for row in data]
+
+
+@pytest.mark.django_db
+class TestProjectionParity:
+    def test_manifest_matches_serializer(self, purchases, context):
+        queryset = (
+            PurchaseDetail.objects.filter(purchase__raffle=purchases)
+            .select_related("purchase", "purchase__customer")
+            .order_by("number")
+        )
+        expected = PurchaseManifestSerializer(queryset, many=True, context=context)
+
+        rows = list(PurchaseManifestProjection(context).rows(queryset))
+
+        assert rows == as_plain(expected.data)
+
+    def test_verification_matches_serializer(self, purchases, context):
+        queryset = PaymentWithReceipt.objects.select_related(
+            "payment", "payment__purchase", "payment__purchase__customer"
+        ).order_by("payment__payment_date")
+        expected = VerificationReadSerializer(queryset, many=True, context=context)
+
+        rows = list(VerificationProjection(context).rows(queryset))
+
+        assert rows == as_plain(expected.data)
+        assert rows[0]["tickets"] == ["003", "007"]
+        assert rows[0]["receipt_url"].startswith("http://testserver/")
+
+    def test_chunked_rows_match(self, purchases, context):
+        queryset = PurchaseDetail.objects.filter(purchase__raffle=purchases).order_by(
+            "number"
+        )
+        projection = PurchaseManifestProjection(context)
+        assert list(projection.rows(queryset, chunk_size=2)) == list(
+            projection.rows(queryset)
+        )
@@ -0,0 +1,97 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+
+from apps.authentication.models import User
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+
+@pytest.fixture
+def purchases(db, organizer_user):
+    raffle = Raffle.objects.create(
+        name="Paged Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    created = []
+    for number in range(1, 8):
+        purchase = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+        PurchaseDetail.objects.create(purchase=purchase, number=number, unit_price=10)
+        created.append(purchase)
+    # Two purchases share a timestamp so ties are broken by id.
+    Purchase.objects.filter(pk=created[3].pk).update(created_at=created[4].created_at)
+    return created
+
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+
+@pytest.mark.django_db
+class TestPurchaseListPagination:
+    url = reverse("purchase-list")
+
+    def expected_order(self):
+        return list(
+            Purchase.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_unpaginated_by_default(self, api_client, purchases):
+        response = api_client.get(self.url, {"phone": "1234567890"})
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == len(purchases)
+
+    def test_cursor_pages_cover_every_purchase_once(self, api_client, purchases):
+        response = api_client.get(self.url, {"phone": "1234567890", "page_size": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["previous"] is None
+        seen = ids(response.data["results"])
+
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            assert len(response.data["results"]) <= 3
+            seen += ids(response.data["results"])
+
+        assert seen == self.expected_order()
+
+    def test_organizer_pages(self, api_client, purchases):
+        organizer = User.objects.create_user(
+            email="admin@example.com",
+            password="password",
+            user_type=User.UserType.ORGANIZER,
+        )
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.get(self.url, {"page_size": 5})
+
+        assert ids(response.data["results"]) == self.expected_order()[:5]
+        assert response.data["next"]
+
+    def test_stream_returns_full_array(self, api_client, purchases):
+        response = api_client.get(self.url, {"phone": "1234567890", "stream": "true"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        rows = json.loads(b"".join(response.streaming_content))
+
+        assert ids(rows) == self.expected_order()
+        assert rows[0]["details"][0]["number"] == 7
+        assert rows[0]["processing_numbers"] == []
+
+    def test_stream_still_requires_guest_phone(self, api_client, purchases):
+        response = api_client.get(self.url, {"stream": "true"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
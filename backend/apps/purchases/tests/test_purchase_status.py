@@ -0,0 +1,90 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+import pytest
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+PAID = Purchase.Status.PAID
+PENDING = Purchase.Status.PENDING
+CANCELED = Purchase.Status.CANCELED
+EXPIRED = Purchase.Status.EXPIRED
+
+
+@pytest.fixture
+def raffle(organizer_user):
+    return Raffle.objects.create(
+        name="Status Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+def purchase_with(raffle, statuses, start=1):
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        guest_phone="1234567890",
+        status=PENDING,
+        total_amount=Decimal("10.00") * len(statuses),
+    )
+    PurchaseDetail.objects.bulk_create(
+        PurchaseDetail(
+            purchase=purchase, number=start + offset, unit_price=10, status=status
+        )
+        for offset, status in enumerate(statuses)
+    )
+    return purchase
+
+
+@pytest.mark.parametrize(
+    ("statuses", "expected"),
+    [
+        ([PAID, PAID], PAID),
+        ([CANCELED, CANCELED], CANCELED),
+        ([EXPIRED], EXPIRED),
+        ([PENDING, PENDING], PENDING),
+        ([PAID, CANCELED], PAID),
+        ([PAID, PENDING, EXPIRED], PAID),
+        ([PENDING, CANCELED], PENDING),
+        ([CANCELED, EXPIRED], PENDING),
+    ],
+)
+def test_status_follows_details(raffle, statuses, expected):
+    purchase = purchase_with(raffle, statuses)
+
+    purchase.update_status_from_details()
+
+    assert purchase.status == expected
+    purchase.refresh_from_db()
+    assert purchase.status == expected
+
+
+def test_syncs_many_purchases_in_one_statement(raffle, django_assert_num_queries):
+    paid = purchase_with(raffle, [PAID, PAID], start=1)
+    mixed = purchase_with(raffle, [PENDING, CANCELED], start=10)
+    canceled = purchase_with(raffle, [CANCELED] * 50, start=20)
+    empty = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", status=PAID, total_amount=0
+    )
+
+    with django_assert_num_queries(1):
+        updated = Purchase.objects.filter(raffle=raffle).sync_status_from_details()
+
+    assert updated == 3
+    statuses = dict(Purchase.objects.values_list("pk", "status"))
+    assert statuses == {
+        paid.pk: PAID,
+        mixed.pk: PENDING,
+        canceled.pk: CANCELED,
+        empty.pk: PAID,
+    }
@@ -0,0 +1,122 @@
+"""
+Plan regression tests for the hot purchase queries.
+
+Test tables are tiny, so sequential scans are disabled for the transaction:
+the assertions check that each query *can* be answered from the intended
+index, which is what breaks when a filter or an index definition drifts.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.utils import timezone
+
+import pytest
+
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleNumber,
+)
+from apps.raffles.models import Raffle
+from apps.raffles.services import get_raffle_number_counts, get_taken_numbers
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _index_only_plans():
+    if connection.vendor != "postgresql":
+        pytest.skip("Query plans are checked against PostgreSQL.")
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+@pytest.fixture
+def purchase(organizer_user):
+    raffle = Raffle.objects.create(
+        name="Plan Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("20.00")
+    )
+    for number in (1, 2):
+        PurchaseDetail.objects.create(purchase=purchase, number=number, unit_price=10)
+    payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+    PaymentWithReceipt.objects.create(payment=payment, selected_numbers=[1])
+    return purchase
+
+
+def assert_uses_index(queryset, *index_names):
+    plan = queryset.explain()
+    assert any(name in plan for name in index_names), plan
+    assert "Seq Scan" not in plan, plan
+
+
+class TestPurchasePlans:
+    def test_active_reservations(self, purchase):
+        assert_uses_index(Purchase.objects.active(), "purchase_status_expiry_idx")
+
+    def test_expiry_sweep(self, purchase):
+        assert_uses_index(Purchase.objects.overdue(), "purchase_status_expiry_idx")
+
+    def test_guest_purchase_list(self, purchase):
+        assert_uses_index(
+            Purchase.objects.filter(guest_phone="1234567890").order_by("-created_at"),
+            "purchase_guest_phone_idx",
+        )
+
+    def test_customer_purchase_list(self, purchase, organizer_user):
+        assert_uses_index(
+            Purchase.objects.filter(customer=organizer_user).order_by("-created_at"),
+            "purchase_customer_idx",
+        )
+
+    def test_details_by_status(self, purchase):
+        assert_uses_index(
+            purchase.details.filter(status=Purchase.Status.PENDING),
+            # Either composite leads with purchase_id; which one wins depends
+            # on the table statistics.
+            "purchase_detail_status_idx",
+            "unique_number_per_purchase",
+        )
+
+
+class TestReceiptPlans:
+    def test_pending_verification_queue(self, purchase):
+        assert_uses_index(
+            PaymentWithReceipt.objects.filter(
+                verification_status=PaymentWithReceipt.VerificationStatus.PENDING
+            ),
+            "receipt_pending_idx",
+        )
+
+
+class TestAvailabilityPlans:
+    def test_taken_numbers(self, purchase, django_assert_num_queries):
+        assert_uses_index(
+            RaffleNumber.objects.filter(raffle_id=purchase.raffle_id).order_by(
+                "number"
+            ),
+            "unique_active_number_per_raffle",
+        )
+        with django_assert_num_queries(1):
+            get_taken_numbers([purchase.raffle_id])
+
+    def test_number_counts(self, purchase, django_assert_num_queries):
+        with django_assert_num_queries(1) as ctx:
+            get_raffle_number_counts([purchase.raffle_id])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {ctx.captured_queries[0]['sql']}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        assert "unique_raffle_stats_slot" in plan, plan
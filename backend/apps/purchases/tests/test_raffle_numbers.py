@@ -0,0 +1,146 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleNumber,
+)
+from apps.raffles.models import Raffle
+
+
+@pytest.fixture
+def raffle(db, organizer_user):
+    return Raffle.objects.create(
+        name="Claims Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+def claimed(raffle):
+    return dict(
+        RaffleNumber.objects.filter(raffle=raffle).values_list("number", "status")
+    )
+
+
+@pytest.mark.django_db
+class TestRaffleNumberClaims:
+    def test_reservation_claims_numbers(self, api_client, raffle):
+        response = api_client.post(
+            reverse("purchase-list"),
+            {
+                "raffle_id": raffle.id,
+                "numbers": [5, 6],
+                "guest_name": "Guest",
+                "guest_phone": "1234567890",
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert claimed(raffle) == {5: "pending", 6: "pending"}
+
+    def test_claimed_number_rejects_new_reservation(self, api_client, raffle):
+        purchase = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+        PurchaseDetail.objects.create(purchase=purchase, number=9, unit_price=10)
+
+        response = api_client.post(
+            reverse("purchase-list"),
+            {"raffle_id": raffle.id, "numbers": [8, 9], "guest_phone": "0987654321"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "9" in response.data["detail"]
+
+    def test_database_rejects_second_active_claim(self, raffle):
+        first = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+        PurchaseDetail.objects.create(purchase=first, number=4, unit_price=10)
+        second = Purchase.objects.create(
+            raffle=raffle, guest_phone="0987654321", total_amount=Decimal("10.00")
+        )
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            PurchaseDetail.objects.create(purchase=second, number=4, unit_price=10)
+
+    def test_released_number_can_be_claimed_again(self, raffle):
+        first = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+        detail = PurchaseDetail.objects.create(purchase=first, number=4, unit_price=10)
+        detail.status = Purchase.Status.CANCELED
+        detail.save()
+        second = Purchase.objects.create(
+            raffle=raffle, guest_phone="0987654321", total_amount=Decimal("10.00")
+        )
+
+        PurchaseDetail.objects.create(purchase=second, number=4, unit_price=10)
+        assert claimed(raffle) == {4: "pending"}
+
+    def test_direct_detail_saves_follow_purchase_state(self, raffle):
+        canceled = Purchase.objects.create(
+            raffle=raffle,
+            guest_phone="1234567890",
+            status=Purchase.Status.CANCELED,
+            total_amount=Decimal("10.00"),
+        )
+        PurchaseDetail.objects.create(purchase=canceled, number=1, unit_price=10)
+        pending = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+        detail = PurchaseDetail.objects.create(
+            purchase=pending, number=2, unit_price=10
+        )
+        assert claimed(raffle) == {2: "pending"}
+
+        detail.status = Purchase.Status.EXPIRED
+        detail.save()
+        assert claimed(raffle) == {}
+
+    def test_cancel_releases_only_pending_numbers(self, api_client, raffle):
+        purchase = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("20.00")
+        )
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=1, unit_price=10, status=Purchase.Status.PAID
+        )
+        PurchaseDetail.objects.create(purchase=purchase, number=2, unit_price=10)
+
+        response = api_client.post(
+            reverse("purchase-cancel", args=[purchase.id]), {"phone": "1234567890"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert claimed(raffle) == {1: "paid"}
+
+    def test_verify_updates_claim_status(self, api_client, organizer_user, raffle):
+        purchase = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("20.00")
+        )
+        PurchaseDetail.objects.create(purchase=purchase, number=3, unit_price=10)
+        PurchaseDetail.objects.create(purchase=purchase, number=4, unit_price=10)
+        payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+        receipt = PaymentWithReceipt.objects.create(
+            payment=payment, selected_numbers=[3]
+        )
+
+        api_client.force_authenticate(user=organizer_user)
+        response = api_client.post(
+            reverse("verifications-verify", args=[receipt.pk]), {"action": "approve"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert claimed(raffle) == {3: "paid", 4: "pending"}
@@ -0,0 +1,205 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.purchases.models import (
+    RAFFLE_STATS_SLOTS,
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    RaffleStats,
+    TicketTotals,
+)
+from apps.purchases.services import create_reservation, expire_reservations
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+GUEST = {"guest_name": "Guest", "guest_phone": "1234567890"}
+
+
+@pytest.fixture
+def raffle(organizer_user):
+    return Raffle.objects.create(
+        name="Stats Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+@pytest.fixture
+def organizer_client(organizer_user):
+    client = APIClient()
+    client.force_authenticate(user=organizer_user)
+    return client
+
+
+def stored(raffle):
+    return RaffleStats.objects.totals([raffle.id]).get(raffle.id, TicketTotals())
+
+
+def expected(raffle):
+    return RaffleStats.objects.recompute([raffle.id]).get(raffle.id, TicketTotals())
+
+
+def receipt_for(purchase, numbers):
+    payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+    return PaymentWithReceipt.objects.create(payment=payment, selected_numbers=numbers)
+
+
+def test_new_raffle_starts_with_empty_slots(raffle):
+    assert RaffleStats.objects.filter(raffle=raffle).count() == RAFFLE_STATS_SLOTS
+    assert stored(raffle) == TicketTotals()
+
+
+def test_reservation_counts_reserved_tickets(raffle):
+    create_reservation(AnonymousUser(), raffle.id, [1, 2, 3], GUEST)
+
+    assert stored(raffle) == TicketTotals(
+        reserved_count=3, outstanding_amount=Decimal("30.00")
+    )
+
+
+def test_concurrent_purchases_use_different_slots(raffle):
+    first = create_reservation(AnonymousUser(), raffle.id, [1], GUEST)
+    second = create_reservation(AnonymousUser(), raffle.id, [2], GUEST)
+
+    touched = RaffleStats.objects.filter(raffle=raffle, reserved_count=1)
+    assert set(touched.values_list("slot", flat=True)) == {
+        first.pk % RAFFLE_STATS_SLOTS,
+        second.pk % RAFFLE_STATS_SLOTS,
+    }
+
+
+def test_approve_moves_tickets_to_sold(raffle, organizer_client):
+    purchase = create_reservation(AnonymousUser(), raffle.id, [1, 2], GUEST)
+    receipt = receipt_for(purchase, [1])
+
+    organizer_client.post(
+        reverse("verifications-verify", args=[receipt.pk]), {"action": "approve"}
+    )
+
+    assert stored(raffle) == TicketTotals(
+        sold_count=1,
+        reserved_count=1,
+        collected_amount=Decimal("10.00"),
+        outstanding_amount=Decimal("10.00"),
+    )
+
+
+def test_reject_after_approve_restores_reserved(raffle, organizer_client):
+    purchase = create_reservation(AnonymousUser(), raffle.id, [1], GUEST)
+    receipt = receipt_for(purchase, [1])
+    url = reverse("verifications-verify", args=[receipt.pk])
+
+    organizer_client.post(url, {"action": "approve"})
+    organizer_client.post(url, {"action": "reject"})
+
+    assert stored(raffle) == expected(raffle)
+
+
+def test_cancel_releases_reserved(raffle):
+    purchase = create_reservation(AnonymousUser(), raffle.id, [1, 2], GUEST)
+
+    APIClient().post(
+        reverse("purchase-cancel", args=[purchase.pk]), {"phone": "1234567890"}
+    )
+
+    assert stored(raffle) == TicketTotals()
+
+
+def test_expiry_releases_reserved(raffle):
+    purchase = create_reservation(AnonymousUser(), raffle.id, [1, 2], GUEST)
+
+    expire_reservations(now=purchase.expires_at + timedelta(minutes=1))
+
+    assert stored(raffle) == TicketTotals()
+
+
+def test_detail_saved_one_at_a_time_is_counted(raffle):
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+    )
+    detail = PurchaseDetail.objects.create(purchase=purchase, number=7, unit_price=10)
+    detail.status = Purchase.Status.PAID
+    detail.save()
+
+    assert stored(raffle) == TicketTotals(
+        sold_count=1, collected_amount=Decimal("10.00")
+    )
+
+
+def test_adjust_moves_several_slots_in_one_update(
+    raffle, organizer_user, django_assert_num_queries
+):
+    other = Raffle.objects.create(
+        name="Other Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    RaffleStats.objects.filter(raffle=other, slot=3).delete()
+    ticket = TicketTotals.of(Purchase.Status.PAID, Decimal("10.00"))
+
+    # Lock the existing rows, create the missing one, one UPDATE for all.
+    with django_assert_num_queries(3):
+        RaffleStats.objects.adjust(
+            {(raffle.id, 1): ticket, (raffle.id, 2): ticket, (other.id, 3): ticket}
+        )
+
+    assert stored(raffle) == ticket + ticket
+    assert stored(other) == ticket
+
+
+class TestReconcileCommand:
+    def _drift(self, raffle):
+        create_reservation(AnonymousUser(), raffle.id, [1, 2], GUEST)
+        RaffleStats.objects.filter(raffle=raffle).update(sold_count=5)
+
+    def test_reports_and_corrects_drift(self, raffle):
+        self._drift(raffle)
+        out = StringIO()
+
+        call_command("reconcile_raffle_stats", stdout=out)
+
+        assert (
+            f"Raffle {raffle.id}: stored sold={5 * RAFFLE_STATS_SLOTS}"
+            in out.getvalue()
+        )
+        assert "Corrected drift in 1 raffle(s)." in out.getvalue()
+        assert stored(raffle) == expected(raffle)
+
+    def test_dry_run_leaves_counters(self, raffle):
+        self._drift(raffle)
+        out = StringIO()
+
+        call_command("reconcile_raffle_stats", "--dry-run", stdout=out)
+
+        assert "Found drift in 1 raffle(s)." in out.getvalue()
+        assert stored(raffle).sold_count == 5 * RAFFLE_STATS_SLOTS
+
+    def test_consistent_counters_are_left_alone(self, raffle):
+        create_reservation(AnonymousUser(), raffle.id, [1], GUEST)
+        out = StringIO()
+
+        call_command("reconcile_raffle_stats", stdout=out)
+
+        assert "Corrected drift in 0 raffle(s)." in out.getvalue()
@@ -0,0 +1,151 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from PIL import Image
+from rest_framework import status
+
+from apps.purchases.models import PaymentWithReceipt, Purchase, PurchaseDetail
+from apps.purchases.services import process_receipt_image
+from apps.raffles.models import Raffle
+from config import celery_app
+
+pytestmark = pytest.mark.django_db
+
+# EXIF tags: orientation and the GPS block pointer.
+ORIENTATION = 0x0112
+GPS_INFO = 0x8825
+
+
+def photo(width=3000, height=2000, **exif_tags):
+    image = Image.new("RGB", (width, height), "red")
+    exif = Image.Exif()
+    for tag, value in exif_tags.items():
+        exif[int(tag)] = value
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile("receipt.jpg", buffer.getvalue(), "image/jpeg")
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.RECEIPT_IMAGE_MAX_EDGE = 1000
+    settings.RECEIPT_THUMBNAIL_EDGE = 100
+    return tmp_path
+
+
+@pytest.fixture
+def eager_celery(monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+
+@pytest.fixture
+def purchase(organizer_user):
+    raffle = Raffle.objects.create(
+        name="Receipt Images",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+    )
+    PurchaseDetail.objects.create(purchase=purchase, number=5, unit_price=10)
+    return purchase
+
+
+def upload(api_client, purchase, image):
+    return api_client.post(
+        reverse("purchase-upload-receipt", args=[purchase.pk]),
+        {"receipt_image": image, "phone": "1234567890", "numbers": [5]},
+        format="multipart",
+    )
+
+
+def test_upload_is_staged_until_processed(api_client, purchase, media):
+    response = upload(api_client, purchase, photo())
+
+    assert response.status_code == status.HTTP_201_CREATED
+    receipt = PaymentWithReceipt.objects.get()
+    assert receipt.image_status == PaymentWithReceipt.ImageStatus.STAGED
+    assert receipt.receipt_image.name.startswith("receipts/staging/")
+    assert not receipt.receipt_thumbnail
+
+
+def test_upload_is_processed_after_commit(
+    api_client, purchase, media, eager_celery, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        upload(api_client, purchase, photo(**{str(GPS_INFO): {}}))
+
+    receipt = PaymentWithReceipt.objects.get()
+    assert receipt.image_status == PaymentWithReceipt.ImageStatus.READY
+    assert receipt.receipt_image.name.startswith("receipts/")
+    assert not receipt.receipt_image.name.startswith("receipts/staging/")
+    assert not list((media / "receipts" / "staging").iterdir())
+
+    with Image.open(receipt.receipt_image.path) as image:
+        assert image.format == "JPEG"
+        assert image.size == (1000, 667)
+        assert not image.getexif()
+    with Image.open(receipt.receipt_thumbnail.path) as thumbnail:
+        assert max(thumbnail.size) == 100
+
+
+def test_orientation_is_applied_to_the_pixels(api_client, purchase):
+    # Orientation 6: the camera was rotated, display turned 90 degrees.
+    upload(api_client, purchase, photo(**{str(ORIENTATION): 6}))
+    receipt = PaymentWithReceipt.objects.get()
+
+    assert process_receipt_image(receipt.pk) is True
+
+    receipt.refresh_from_db()
+    with Image.open(receipt.receipt_image.path) as image:
+        assert image.size == (667, 1000)
+        assert ORIENTATION not in image.getexif()
+
+
+def test_processing_runs_once(api_client, purchase):
+    upload(api_client, purchase, photo())
+    receipt = PaymentWithReceipt.objects.get()
+
+    assert process_receipt_image(receipt.pk) is True
+    assert process_receipt_image(receipt.pk) is False
+
+
+def test_undecodable_upload_is_kept_and_marked_failed(purchase, media):
+    receipt = PaymentWithReceipt.objects.create(
+        payment=purchase.payments.create(amount=Decimal("10.00")),
+        image_status=PaymentWithReceipt.ImageStatus.STAGED,
+        receipt_image=SimpleUploadedFile("broken.jpg", b"not an image"),
+    )
+
+    assert process_receipt_image(receipt.pk) is False
+
+    receipt.refresh_from_db()
+    assert receipt.image_status == PaymentWithReceipt.ImageStatus.FAILED
+    assert (media / receipt.receipt_image.name).exists()
+
+
+def test_missing_upload_is_marked_failed(purchase, media):
+    receipt = PaymentWithReceipt.objects.create(
+        payment=purchase.payments.create(amount=Decimal("10.00")),
+        image_status=PaymentWithReceipt.ImageStatus.STAGED,
+        receipt_image=SimpleUploadedFile("gone.jpg", b"not an image"),
+    )
+    (media / receipt.receipt_image.name).unlink()
+
+    assert process_receipt_image(receipt.pk) is False
+
+    receipt.refresh_from_db()
+    assert receipt.image_status == PaymentWithReceipt.ImageStatus.FAILED
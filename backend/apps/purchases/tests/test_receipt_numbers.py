@@ -0,0 +1,89 @@
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.db import connection
+from django.utils import timezone
+
+import pytest
+
+from apps.purchases.models import (
+    Payment,
+    PaymentWithReceipt,
+    Purchase,
+    PurchaseDetail,
+    ReceiptNumber,
+)
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def purchase(organizer_user):
+    raffle = Raffle.objects.create(
+        name="Receipt Raffle",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("30.00")
+    )
+    PurchaseDetail.objects.bulk_create(
+        PurchaseDetail(purchase=purchase, number=number, unit_price=10)
+        for number in (1, 2, 3)
+    )
+    return purchase
+
+
+def receipt_for(purchase, numbers):
+    payment = Payment.objects.create(purchase=purchase, amount=Decimal("10.00"))
+    return PaymentWithReceipt.objects.create(payment=payment, selected_numbers=numbers)
+
+
+def mirrored(receipt):
+    return sorted(receipt.numbers.values_list("detail__number", flat=True))
+
+
+def test_saved_receipt_is_mirrored(purchase):
+    receipt = receipt_for(purchase, [1, 3, 99])
+
+    # Numbers outside the purchase have no detail to point at.
+    assert mirrored(receipt) == [1, 3]
+
+
+def test_changed_selection_is_mirrored(purchase):
+    receipt = receipt_for(purchase, [1])
+
+    receipt.selected_numbers = [2, 3]
+    receipt.save()
+
+    assert mirrored(receipt) == [2, 3]
+
+
+def test_verification_saves_leave_rows_alone(purchase, django_assert_num_queries):
+    receipt = receipt_for(purchase, [2])
+
+    with django_assert_num_queries(1):
+        receipt.mark_verified(PaymentWithReceipt.VerificationStatus.APPROVED)
+
+    assert mirrored(receipt) == [2]
+    assert not ReceiptNumber.objects.processing().exists()
+
+
+def test_migration_backfills_existing_receipts(purchase):
+    first = receipt_for(purchase, [1, 2])
+    second = receipt_for(purchase, [])
+    ReceiptNumber.objects.all().delete()
+
+    migration = import_module("apps.purchases.migrations.0015_receipt_number")
+    migration.backfill_receipt_numbers(apps, connection.schema_editor())
+
+    assert mirrored(first) == [1, 2]
+    assert mirrored(second) == []
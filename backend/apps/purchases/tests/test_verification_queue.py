@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+
+from apps.purchases.models import Payment, PaymentWithReceipt, Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+pytestmark = pytest.mark.django_db
+
+
+def make_raffle(organizer, name):
+    return Raffle.objects.create(
+        name=name,
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer,
+    )
+
+
+def make_receipt(raffle, number, paid_at):
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+    )
+    PurchaseDetail.objects.create(purchase=purchase, number=number, unit_price=10)
+    payment = Payment.objects.create(
+        purchase=purchase, amount=Decimal("10.00"), payment_date=paid_at
+    )
+    return PaymentWithReceipt.objects.create(payment=payment, selected_numbers=[number])
+
+
+@pytest.fixture
+def queue(organizer_user):
+    first = make_raffle(organizer_user, "First")
+    second = make_raffle(organizer_user, "Second")
+    day = timezone.make_aware(datetime(2026, 3, 10, 12))
+    receipts = [
+        make_receipt(first, 1, day),
+        make_receipt(second, 2, day + timedelta(hours=1)),
+        make_receipt(first, 3, day + timedelta(days=1)),
+        make_receipt(first, 4, day + timedelta(days=1)),
+        make_receipt(second, 5, day + timedelta(days=2)),
+    ]
+    done = make_receipt(first, 6, day)
+    done.mark_verified(PaymentWithReceipt.VerificationStatus.APPROVED)
+    return first, second, receipts
+
+
+def payment_ids(rows):
+    return [row["payment_id"] for row in rows]
+
+
+class TestVerificationQueue:
+    url = reverse("verifications-list")
+
+    @pytest.fixture(autouse=True)
+    def login(self, api_client, organizer_user):
+        api_client.force_authenticate(user=organizer_user)
+
+    def test_unpaginated_by_default(self, api_client, queue):
+        _, _, receipts = queue
+        response = api_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert payment_ids(response.data) == [receipt.pk for receipt in receipts]
+
+    def test_cursor_pages_cover_the_queue_once(
+        self, api_client, queue, django_assert_num_queries
+    ):
+        _, _, receipts = queue
+        with django_assert_num_queries(1):
+            response = api_client.get(self.url, {"page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["previous"] is None
+        seen = payment_ids(response.data["results"])
+
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            assert len(response.data["results"]) <= 2
+            seen += payment_ids(response.data["results"])
+
+        # Receipts paid at the same moment are ordered by id.
+        assert seen == [receipt.pk for receipt in receipts]
+
+    def test_filters_by_raffle(self, api_client, queue):
+        _, second, receipts = queue
+        response = api_client.get(self.url, {"raffle": second.pk})
+        assert payment_ids(response.data) == [receipts[1].pk, receipts[4].pk]
+        assert {row["raffle_name"] for row in response.data} == {"Second"}
+
+    def test_filters_by_payment_date(self, api_client, queue):
+        first, _, receipts = queue
+        response = api_client.get(
+            self.url, {"date_from": "2026-03-11", "date_to": "2026-03-11"}
+        )
+        assert payment_ids(response.data) == [receipts[2].pk, receipts[3].pk]
+
+        response = api_client.get(
+            self.url, {"date_from": "2026-03-11", "raffle": first.pk, "page_size": 1}
+        )
+        assert payment_ids(response.data["results"]) == [receipts[2].pk]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"raffle": "abc"},
+            {"date_from": "not-a-date"},
+            {"date_from": "2026-03-12", "date_to": "2026-03-11"},
+        ],
+    )
+    def test_rejects_invalid_filters(self, api_client, params):
+        response = api_client.get(self.url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,8 +1,11 @@
 import re
+from datetime import datetime, time, timedelta
 from typing import TYPE_CHECKING, Any, ClassVar, cast
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
@@ -10,24 +13,55 @@ from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, parsers, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.pagination import BasePagination, CursorPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from .models import Payment, PaymentWithReceipt, Purchase
+from apps.common.params import parse_bool_param
+from apps.common.streaming import stream_json_array
+from apps.raffles.services import invalidate_raffle_availability
+
+from .models import PaymentWithReceipt, Purchase, RaffleNumber
+from .projections import VerificationProjection
 from .serializers import (
+    BulkVerificationActionSerializer,
+    BulkVerificationResultSerializer,
     PaymentReceiptSerializer,
     PurchaseCancellationSerializer,
     PurchaseReadSerializer,
     ReservationSerializer,
     VerificationActionSerializer,
+    VerificationQueueFilterSerializer,
     VerificationReadSerializer,
 )
-from .services import create_reservation
+from .services import create_reservation, upload_receipt, verify_receipts
 
 if TYPE_CHECKING:
     from apps.authentication.models import User
 
 
+class PurchaseCursorPagination(CursorPagination):
+    """Keyset pages over ``(created_at, id)``, newest first."""
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
+
+
+class VerificationCursorPagination(CursorPagination):
+    """Keyset pages over ``(payment_date, payment_id)``, oldest first."""
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("payment__payment_date", "payment_id")
+
+
+# Rows fetched per round trip when streaming the purchase list.
+PURCHASE_STREAM_CHUNK_SIZE = 500
+
+
 @extend_schema(
     tags=["Purchases"],
     summary="Create a new reservation",
@@ -41,7 +75,15 @@ class PurchaseViewSet(
     queryset = Purchase.objects.all()
     serializer_class = ReservationSerializer
     permission_classes: ClassVar[list[Any]] = [permissions.AllowAny]  # Allow guests
-    pagination_class = None
+    pagination_class = PurchaseCursorPagination
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        # Clients that don't ask for pages keep getting a plain array.
+        params = self.request.query_params
+        if "cursor" not in params and "page_size" not in params:
+            return None
+        return super().paginator
 
     def get_serializer_class(self) -> type[serializers.Serializer]:
         if self.action == "upload_receipt":
@@ -53,18 +95,41 @@ class PurchaseViewSet(
     @extend_schema(
         tags=["Purchases"],
         summary="List purchases",
-        description="List purchases. Guests must provide 'phone'. Authenticated users see their own or can filter by 'phone'.",
+        description=(
+            "List purchases. Guests must provide 'phone'. Authenticated users see "
+            "their own or can filter by 'phone'. Pass `cursor` or `page_size` for "
+            "cursor pages (newest first), or `stream=true` to stream the full "
+            "list as a JSON array."
+        ),
         parameters=[
             OpenApiParameter(
                 name="phone",
                 description="Phone number to filter by (required for guests)",
                 required=False,
                 type=str,
-            )
+            ),
+            OpenApiParameter(
+                name="stream",
+                description="Stream every matching purchase as a JSON array.",
+                required=False,
+                type=bool,
+            ),
         ],
         responses=PurchaseReadSerializer(many=True),
     )
-    def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+    def list(
+        self, request: Request, *args: object, **kwargs: object
+    ) -> Response | StreamingHttpResponse:
+        if parse_bool_param(request.query_params.get("stream")):
+            queryset = self.get_queryset().order_by("-created_at", "-id")
+            context = self.get_serializer_context()
+            rows = (
+                PurchaseReadSerializer(purchase, context=context).data
+                for purchase in queryset.iterator(chunk_size=PURCHASE_STREAM_CHUNK_SIZE)
+            )
+            return StreamingHttpResponse(
+                stream_json_array(rows), content_type="application/json"
+            )
         return super().list(request, *args, **kwargs)
 
     def get_queryset(self) -> QuerySet[Purchase]:
@@ -78,7 +143,11 @@ class PurchaseViewSet(
                 {"phone": "Ingrese un número de teléfono válido de 10 dígitos."}
             )
 
-        queryset = Purchase.objects.select_related("raffle").prefetch_related("details")
+        queryset = (
+            Purchase.objects.select_related("raffle")
+            .prefetch_related("details")
+            .with_processing_numbers()
+        )
 
         if user.is_authenticated:
             user = cast("User", user)
@@ -166,69 +235,17 @@ class PurchaseViewSet(
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        receipt_image = serializer.validated_data["receipt_image"]
-        numbers = serializer.validated_data["numbers"]
-
-        valid_numbers = set(purchase.details.values_list("number", flat=True))
-        if not set(numbers).issubset(valid_numbers):
-            raise ValidationError(
-                {"numbers": "Los números enviados no pertenecen a esta reservación."}
+        try:
+            remaining_numbers = upload_receipt(
+                purchase,
+                serializer.validated_data["numbers"],
+                serializer.validated_data["receipt_image"],
+                user=user,
             )
-
-        pending_receipts = PaymentWithReceipt.objects.filter(
-            payment__purchase=purchase,
-            verification_status=PaymentWithReceipt.VerificationStatus.PENDING,
-        )
-        processing_numbers = set()
-        for receipt in pending_receipts:
-            processing_numbers.update(receipt.selected_numbers)
-
-        already_processing = set(numbers).intersection(processing_numbers)
-        if already_processing:
-            sorted_dups = sorted(already_processing)
+        except DjangoValidationError as e:
             raise ValidationError(
-                {
-                    "numbers": f"Los siguientes números ya se encuentran en proceso de verificación: {sorted_dups}"
-                }
-            )
-
-        first_detail = purchase.details.first()
-        if not first_detail:
-            raise ValidationError("La compra no tiene boletos asociados.")
-
-        price_per_number = first_detail.unit_price
-        amount = len(numbers) * price_per_number
-
-        payment = Payment.objects.create(
-            purchase=purchase,
-            amount=amount,
-            created_by=user if user.is_authenticated else None,
-        )
-
-        PaymentWithReceipt.objects.create(
-            payment=payment,
-            receipt_image=receipt_image,
-            selected_numbers=numbers,
-        )
-
-        all_numbers = set(purchase.details.values_list("number", flat=True))
-
-        paid_numbers = set(
-            purchase.details.filter(status=Purchase.Status.PAID).values_list(
-                "number", flat=True
-            )
-        )
-
-        pending_receipts = PaymentWithReceipt.objects.filter(
-            payment__purchase=purchase,
-            verification_status=PaymentWithReceipt.VerificationStatus.PENDING,
-        )
-        processing_numbers = set()
-        for receipt in pending_receipts:
-            processing_numbers.update(receipt.selected_numbers)
-
-        remaining_numbers = list(all_numbers - paid_numbers - processing_numbers)
-        remaining_numbers.sort()
+                e.message_dict if hasattr(e, "error_dict") else e.messages
+            ) from None
 
         return Response(
             {
@@ -283,34 +300,22 @@ class PurchaseViewSet(
                     "No se puede cancelar una compra totalmente pagada."
                 )
 
-        # Reject any pending payment receipts
-        for payment in purchase.payments.all():  # type: ignore
-            try:
-                receipt = payment.receipt
-                if (
-                    receipt.verification_status
-                    == PaymentWithReceipt.VerificationStatus.PENDING
-                ):
-                    receipt.mark_verified(
-                        PaymentWithReceipt.VerificationStatus.REJECTED,
-                        verified_at=timezone.now(),
-                    )
-                    if user.is_authenticated:
-                        receipt.verified_by = cast("User", user)
-                        receipt.save(update_fields=["verified_by"])
-            except PaymentWithReceipt.DoesNotExist:
-                continue
-
-        # Only cancel PENDING tickets.
-        purchase.details.filter(status=Purchase.Status.PENDING).update(
-            status=Purchase.Status.CANCELED
-        )
+        with transaction.atomic():
+            # Reject any pending payment receipts
+            PaymentWithReceipt.objects.pending().filter(
+                payment__purchase=purchase
+            ).mark_verified(
+                PaymentWithReceipt.VerificationStatus.REJECTED,
+                verified_by=cast("User", user) if user.is_authenticated else None,
+            )
 
-        # Clear prefetch cache to ensure update_status_from_details sees the DB changes
-        if hasattr(purchase, "_prefetched_objects_cache"):
-            purchase._prefetched_objects_cache = {}  # type: ignore
+            # Only cancel PENDING tickets.
+            pending_details = purchase.details.filter(status=Purchase.Status.PENDING)
+            RaffleNumber.objects.release(pending_details)
+            pending_details.update(status=Purchase.Status.CANCELED)
+            invalidate_raffle_availability(purchase.raffle_id)
 
-        purchase.update_status_from_details()
+            purchase.update_status_from_details()
 
         return Response(status=status.HTTP_200_OK)
 
@@ -323,11 +328,22 @@ class PurchaseViewSet(
 )
 class VerificationViewSet(viewsets.GenericViewSet):
     permission_classes: ClassVar[list[Any]] = [permissions.IsAuthenticated]
+    pagination_class = VerificationCursorPagination
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        # Clients that don't ask for pages keep getting a plain array.
+        params = self.request.query_params
+        if "cursor" not in params and "page_size" not in params:
+            return None
+        return super().paginator
 
     def get_serializer_class(self) -> type[serializers.Serializer]:
         if self.action == "verify":
             # Debería devolver la clase real, no un placeholder
             return VerificationActionSerializer
+        if self.action == "bulk_verify":
+            return BulkVerificationActionSerializer
         # Debería devolver la clase real, no un placeholder
         return VerificationReadSerializer
 
@@ -346,17 +362,54 @@ class VerificationViewSet(viewsets.GenericViewSet):
                 "payment__purchase__customer",
             )
             .filter(verification_status=PaymentWithReceipt.VerificationStatus.PENDING)
-            .order_by("payment__payment_date")
+            .order_by("payment__payment_date", "payment_id")
         )
 
+    def filter_queryset(
+        self, queryset: QuerySet[PaymentWithReceipt]
+    ) -> QuerySet[PaymentWithReceipt]:
+        params = VerificationQueueFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        if "raffle" in filters:
+            queryset = queryset.filter(payment__purchase__raffle_id=filters["raffle"])
+        # Whole days in the server time zone, as a range the index can use.
+        if "date_from" in filters:
+            start = datetime.combine(filters["date_from"], time.min)
+            queryset = queryset.filter(
+                payment__payment_date__gte=timezone.make_aware(start)
+            )
+        if "date_to" in filters:
+            end = datetime.combine(filters["date_to"] + timedelta(days=1), time.min)
+            queryset = queryset.filter(
+                payment__payment_date__lt=timezone.make_aware(end)
+            )
+        return queryset
+
+    @extend_schema(
+        tags=["Purchases"],
+        summary="List pending verifications",
+        description=(
+            "List payments requiring verification, oldest first. Organizer only. "
+            "Filter by `raffle` and by payment date with `date_from`/`date_to`. "
+            "Pass `cursor` or `page_size` for cursor pages."
+        ),
+        parameters=[VerificationQueueFilterSerializer],
+        responses=VerificationReadSerializer(many=True),
+    )
     def list(self, request: Request, *args: object, **kwargs: object) -> Response:
         user = cast("User", request.user)
         if user.user_type != "organizer":
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        projection = VerificationProjection(self.get_serializer_context())
+        values = projection.values(
+            self.filter_queryset(self.get_queryset()), named=True
+        )
+        page = self.paginate_queryset(values)
+        if page is None:
+            return Response(list(projection.build(values)))
+        return self.get_paginated_response(list(projection.build(page)))
 
     @extend_schema(
         tags=["Purchases"],
@@ -391,41 +444,74 @@ class VerificationViewSet(viewsets.GenericViewSet):
         if not isinstance(selected_numbers, list):
             selected_numbers = []
 
-        if action_val == "approve":
-            # 1. Update status of selected numbers to PAID
-            if selected_numbers:  # Solo actualiza si hay números seleccionados
-                purchase.details.filter(number__in=selected_numbers).update(
-                    status=Purchase.Status.PAID
-                )
-
-            # 2. Marcar el comprobante como APROBADO
-            receipt.mark_verified(
-                PaymentWithReceipt.VerificationStatus.APPROVED,
-                verified_at=timezone.now(),
-            )
-            receipt.verified_by = user
-            receipt.save()
+        with transaction.atomic():
+            if action_val == "approve":
+                # 1. Update status of selected numbers to PAID
+                if selected_numbers:  # Solo actualiza si hay números seleccionados
+                    purchase.details.filter(number__in=selected_numbers).update(
+                        status=Purchase.Status.PAID
+                    )
+                    RaffleNumber.objects.sync(
+                        purchase.details.filter(number__in=selected_numbers)
+                    )
 
-            # 3. Sync parent purchase status
-            purchase.update_status_from_details()
+                # 2. Marcar el comprobante como APROBADO
+                receipt.mark_verified(
+                    PaymentWithReceipt.VerificationStatus.APPROVED,
+                    verified_at=timezone.now(),
+                )
+                receipt.verified_by = user
+                receipt.save(update_fields=["verified_by"])
 
-        elif action_val == "reject":
-            # 1. Marcar el comprobante como RECHAZADO
-            receipt.mark_verified(
-                PaymentWithReceipt.VerificationStatus.REJECTED,
-                verified_at=timezone.now(),
-            )
-            receipt.verified_by = user
-            receipt.save()
+                # 3. Sync parent purchase status
+                purchase.update_status_from_details()
 
-            # 2. Revertir los números seleccionados en ESTE comprobante a PENDING (Apartado).
-            if selected_numbers:  # Solo revierte si hay números seleccionados
-                purchase.details.filter(number__in=selected_numbers).update(
-                    status=Purchase.Status.PENDING
+            elif action_val == "reject":
+                # 1. Marcar el comprobante como RECHAZADO
+                receipt.mark_verified(
+                    PaymentWithReceipt.VerificationStatus.REJECTED,
+                    verified_at=timezone.now(),
                 )
+                receipt.verified_by = user
+                receipt.save(update_fields=["verified_by"])
 
-            # 3. Sincronizar el estado de la compra padre
-            purchase.update_status_from_details()
+                # 2. Revertir los números seleccionados en ESTE comprobante a PENDING (Apartado).
+                if selected_numbers:  # Solo revierte si hay números seleccionados
+                    purchase.details.filter(number__in=selected_numbers).update(
+                        status=Purchase.Status.PENDING
+                    )
+                    RaffleNumber.objects.sync(
+                        purchase.details.filter(number__in=selected_numbers)
+                    )
+
+                # 3. Sincronizar el estado de la compra padre
+                purchase.update_status_from_details()
 
         # 4. Devolver la respuesta
         return Response(VerificationReadSerializer(receipt).data)
+
+    @extend_schema(
+        tags=["Purchases"],
+        summary="Verify many payment receipts",
+        description=(
+            "Approve or reject a batch of pending payment receipts in one "
+            "transaction. Receipts that are missing or already verified are "
+            "reported as skipped. Organizer only."
+        ),
+        request=BulkVerificationActionSerializer,
+        responses={200: BulkVerificationResultSerializer},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk-verify")
+    def bulk_verify(self, request: Request) -> Response:
+        user = cast("User", request.user)
+        if user.user_type != "organizer":
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = verify_receipts(
+            serializer.validated_data["ids"],
+            approve=serializer.validated_data["action"] == "approve",
+            user=user,
+        )
+        return Response(BulkVerificationResultSerializer(result).data)
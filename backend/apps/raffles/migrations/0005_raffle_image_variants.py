@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raffles', '0004_remove_raffle_image_url_raffle_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='raffle',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import ClassVar, Self
 
 from django.conf import settings
@@ -19,6 +20,22 @@ class RaffleQuerySet(models.QuerySet["Raffle"]):
     def upcoming(self) -> Self:
         return self.active().filter(sale_start_at__gt=timezone.now())
 
+    def with_ticket_totals(self) -> Self:
+        """Annotate the counters kept in ``purchases.RaffleStats``, summed
+        over their slots: a few rows per raffle, whatever its ticket count."""
+        totals = {
+            "sold_count": 0,
+            "reserved_count": 0,
+            "collected_amount": Decimal("0.00"),
+            "outstanding_amount": Decimal("0.00"),
+        }
+        return self.annotate(
+            **{
+                name: models.Sum(f"stats__{name}", default=default)
+                for name, default in totals.items()
+            }
+        )
+
 
 class RaffleManager(models.Manager["Raffle"]):
     def get_queryset(self) -> RaffleQuerySet:
@@ -39,6 +56,9 @@ class Raffle(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, default="")
     image = models.ImageField(upload_to="raffles/", blank=True)
+    # Storage names of the downscaled copies of ``image``, keyed by longest
+    # side and then format: {"320": {"webp": ..., "jpeg": ...}, ...}.
+    image_variants = models.JSONField(default=dict, blank=True)
 
     number_start = models.PositiveIntegerField()
     number_end = models.PositiveIntegerField()
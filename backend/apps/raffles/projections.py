@@ -0,0 +1,134 @@
+"""Projections for the raffle list endpoints; see ``apps.common.projections``."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, ClassVar
+
+from django.utils import timezone
+
+from apps.common.projections import (
+    Column,
+    Projection,
+    column,
+    decimal_string,
+    iso_datetime,
+)
+
+from .models import Raffle
+from .serializers import NUMBER_COUNT_FIELDS
+from .services import RaffleNumberCounts, image_variant_urls, raffle_state
+
+_STATE_SOURCES = (
+    "deleted_at",
+    "winner_number",
+    "sale_start_at",
+    "sale_end_at",
+    "draw_scheduled_at",
+)
+
+
+class RaffleCardProjection(Projection):
+    """Rows of ``PublicRaffleSerializer``. Counts are included when the view
+    puts ``number_counts`` in the context before building rows."""
+
+    columns: ClassVar[dict[str, Column]] = {
+        "id": column("id"),
+        "name": column("name"),
+        "description": column("description"),
+        "image": column("image", convert="get_image"),
+        "image_variants": column("image_variants", convert="get_image_variants"),
+        "number_start": column("number_start"),
+        "number_end": column("number_end"),
+        "price_per_number": column("price_per_number", convert=decimal_string),
+        "sale_start_at": column("sale_start_at", convert=iso_datetime),
+        "sale_end_at": column("sale_end_at", convert=iso_datetime),
+        "draw_scheduled_at": column("draw_scheduled_at", convert=iso_datetime),
+        "winner_number": column("winner_number"),
+        "organizer_name": column(
+            "organizer__name", "organizer__email", convert="get_organizer_name"
+        ),
+        "state": column(*_STATE_SOURCES, convert="get_state"),
+        "is_on_sale": column(
+            "deleted_at", "sale_start_at", "sale_end_at", convert="get_is_on_sale"
+        ),
+        "has_winner": column("winner_number", convert="get_has_winner"),
+        "sold_count": column("id", convert="get_sold_count"),
+        "reserved_count": column("id", convert="get_reserved_count"),
+        "free_count": column(
+            "id", "number_start", "number_end", convert="get_free_count"
+        ),
+    }
+
+    def __init__(self, context: dict[str, Any] | None = None) -> None:
+        super().__init__(context)
+        self.now = timezone.now()
+
+    def omitted(self) -> frozenset[str]:
+        if "number_counts" in self.context:
+            return frozenset()
+        return frozenset(NUMBER_COUNT_FIELDS)
+
+    def get_image(self, name: str) -> str | None:
+        return self.file_url(Raffle._meta.get_field("image").storage, name)
+
+    def get_image_variants(
+        self, variants: dict[str, dict[str, str]]
+    ) -> dict[str, dict[str, str]]:
+        return image_variant_urls(variants, self.context.get("request"))
+
+    def get_organizer_name(self, name: str, email: str) -> str:
+        return name or email
+
+    def get_state(
+        self,
+        deleted_at: datetime | None,
+        winner_number: int | None,
+        sale_start_at: datetime,
+        sale_end_at: datetime,
+        draw_scheduled_at: datetime,
+    ) -> str:
+        return raffle_state(
+            deleted_at=deleted_at,
+            winner_number=winner_number,
+            sale_start_at=sale_start_at,
+            sale_end_at=sale_end_at,
+            draw_scheduled_at=draw_scheduled_at,
+            now=self.now,
+        )
+
+    def get_is_on_sale(
+        self,
+        deleted_at: datetime | None,
+        sale_start_at: datetime,
+        sale_end_at: datetime,
+    ) -> bool:
+        return deleted_at is None and sale_start_at <= self.now <= sale_end_at
+
+    def get_has_winner(self, winner_number: int | None) -> bool:
+        return winner_number is not None
+
+    def _number_counts(self, raffle_id: int) -> RaffleNumberCounts:
+        return self.context["number_counts"].get(raffle_id, RaffleNumberCounts())
+
+    def get_sold_count(self, raffle_id: int) -> int:
+        return self._number_counts(raffle_id).sold
+
+    def get_reserved_count(self, raffle_id: int) -> int:
+        return self._number_counts(raffle_id).reserved
+
+    def get_free_count(self, raffle_id: int, number_start: int, number_end: int) -> int:
+        counts = self._number_counts(raffle_id)
+        return number_end - number_start + 1 - counts.sold - counts.reserved
+
+
+class OrganizerRaffleCardProjection(RaffleCardProjection):
+    """Rows of ``OrganizerRaffleSerializer``."""
+
+    columns: ClassVar[dict[str, Column]] = {
+        **RaffleCardProjection.columns,
+        "created_at": column("created_at", convert=iso_datetime),
+        "updated_at": column("updated_at", convert=iso_datetime),
+        "created_by": column("created_by"),
+        "updated_by": column("updated_by"),
+    }
@@ -6,6 +6,25 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from .models import Raffle
+from .services import (
+    RaffleNumberCounts,
+    generate_image_variants,
+    image_variant_urls,
+    raffle_state,
+)
+
+NUMBER_COUNT_FIELDS = ("sold_count", "reserved_count", "free_count")
+
+
+class ImageVariantsField(serializers.Field):
+    """URLs of ``Raffle.image_variants``; see ``image_variant_urls``."""
+
+    def __init__(self, **kwargs: object) -> None:
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value: dict[str, dict[str, str]]) -> dict:
+        return image_variant_urls(value, self.context.get("request"))
 
 
 class RaffleBaseSerializer(serializers.ModelSerializer):
@@ -13,6 +32,10 @@ class RaffleBaseSerializer(serializers.ModelSerializer):
     is_on_sale = serializers.SerializerMethodField()
     has_winner = serializers.SerializerMethodField()
     organizer_name = serializers.SerializerMethodField()
+    sold_count = serializers.SerializerMethodField()
+    reserved_count = serializers.SerializerMethodField()
+    free_count = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Raffle
@@ -21,6 +44,7 @@ class RaffleBaseSerializer(serializers.ModelSerializer):
             "name",
             "description",
             "image",
+            "image_variants",
             "number_start",
             "number_end",
             "price_per_number",
@@ -32,22 +56,26 @@ class RaffleBaseSerializer(serializers.ModelSerializer):
             "state",
             "is_on_sale",
             "has_winner",
+            *NUMBER_COUNT_FIELDS,
         ]
         read_only_fields = fields
 
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)
+        # Counts are only rendered when the view precomputed them for the page.
+        if "number_counts" not in self.context:
+            for name in NUMBER_COUNT_FIELDS:
+                self.fields.pop(name, None)
+
     def get_state(self, obj: Raffle) -> str:
-        if obj.deleted_at:
-            return "archived"
-        if obj.winner_number is not None:
-            return "completed"
-        now = timezone.now()
-        if now < obj.sale_start_at:
-            return "upcoming"
-        if obj.sale_start_at <= now <= obj.sale_end_at:
-            return "selling"
-        if now <= obj.draw_scheduled_at:
-            return "closed"
-        return "archived"
+        return raffle_state(
+            deleted_at=obj.deleted_at,
+            winner_number=obj.winner_number,
+            sale_start_at=obj.sale_start_at,
+            sale_end_at=obj.sale_end_at,
+            draw_scheduled_at=obj.draw_scheduled_at,
+            now=timezone.now(),
+        )
 
     def get_is_on_sale(self, obj: Raffle) -> bool:
         return obj.is_on_sale
@@ -66,6 +94,20 @@ class RaffleBaseSerializer(serializers.ModelSerializer):
             or getattr(organizer, "email", None)
         )
 
+    def _number_counts(self, obj: Raffle) -> RaffleNumberCounts:
+        return self.context["number_counts"].get(obj.id, RaffleNumberCounts())
+
+    def get_sold_count(self, obj: Raffle) -> int:
+        return self._number_counts(obj).sold
+
+    def get_reserved_count(self, obj: Raffle) -> int:
+        return self._number_counts(obj).reserved
+
+    def get_free_count(self, obj: Raffle) -> int:
+        counts = self._number_counts(obj)
+        width = obj.number_end - obj.number_start + 1
+        return width - counts.sold - counts.reserved
+
 
 class PublicRaffleSerializer(RaffleBaseSerializer):
     pass
@@ -137,9 +179,124 @@ class OrganizerRaffleWriteSerializer(serializers.ModelSerializer):
         except DjangoValidationError as exc:
             raise serializers.ValidationError(exc.message_dict) from exc
         raffle.save()
+        generate_image_variants(raffle)
         return raffle
 
 
 class RaffleAvailabilitySerializer(serializers.Serializer):
     raffle_id = serializers.IntegerField()
     taken_numbers = serializers.ListField(child=serializers.IntegerField())
+
+
+class RaffleCompactAvailabilitySerializer(serializers.Serializer):
+    """Shared fields for availability encodings keyed off the raffle range."""
+
+    raffle_id = serializers.IntegerField()
+    number_start = serializers.IntegerField()
+    number_end = serializers.IntegerField()
+    taken_count = serializers.IntegerField()
+
+
+class RaffleAvailabilityBitmapSerializer(RaffleCompactAvailabilitySerializer):
+    bitmap = serializers.CharField()
+
+
+class RaffleAvailabilityRangesSerializer(RaffleCompactAvailabilitySerializer):
+    taken_ranges = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(), min_length=2, max_length=2
+        )
+    )
+
+
+class RaffleAvailabilitySummarySerializer(serializers.Serializer):
+    raffle_id = serializers.IntegerField()
+    number_start = serializers.IntegerField()
+    number_end = serializers.IntegerField()
+    sold_count = serializers.IntegerField()
+    reserved_count = serializers.IntegerField()
+    free_count = serializers.IntegerField()
+
+
+class RaffleAvailabilitySummaryListSerializer(RaffleAvailabilitySummarySerializer):
+    taken_numbers = serializers.ListField(child=serializers.IntegerField())
+
+
+class RaffleAvailabilitySummaryBitmapSerializer(RaffleAvailabilitySummarySerializer):
+    bitmap = serializers.CharField()
+
+
+class RaffleAvailabilitySummaryRangesSerializer(RaffleAvailabilitySummarySerializer):
+    taken_ranges = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.IntegerField(), min_length=2, max_length=2
+        )
+    )
+
+
+class RaffleDashboardSerializer(RaffleAvailabilitySummarySerializer):
+    collected_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    outstanding_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    sale_end_at = serializers.DateTimeField()
+    days_left = serializers.IntegerField()
+
+
+class RaffleDebtorSerializer(serializers.Serializer):
+    """Schema of a debtors report row, built by ``DebtorProjection``."""
+
+    debtor = serializers.CharField()
+    customer_id = serializers.IntegerField(allow_null=True)
+    customer_name = serializers.CharField()
+    customer_phone = serializers.CharField()
+    customer_email = serializers.CharField()
+    numbers = serializers.ListField(child=serializers.IntegerField())
+    reserved_count = serializers.IntegerField()
+    amount_owed = serializers.DecimalField(max_digits=12, decimal_places=2)
+    expires_at = serializers.DateTimeField()
+
+
+class RaffleHistorySerializer(serializers.ModelSerializer):
+    """Row of the historical report; expects ``with_ticket_totals()``."""
+
+    state = serializers.SerializerMethodField()
+    sold_count = serializers.IntegerField(read_only=True)
+    reserved_count = serializers.IntegerField(read_only=True)
+    free_count = serializers.SerializerMethodField()
+    collected_amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+    outstanding_amount = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Raffle
+        fields: ClassVar[list[str]] = [
+            "id",
+            "name",
+            "sale_start_at",
+            "sale_end_at",
+            "draw_scheduled_at",
+            "winner_number",
+            "state",
+            "sold_count",
+            "reserved_count",
+            "free_count",
+            "collected_amount",
+            "outstanding_amount",
+        ]
+        read_only_fields = fields
+
+    def get_state(self, obj: Raffle) -> str:
+        return raffle_state(
+            deleted_at=obj.deleted_at,
+            winner_number=obj.winner_number,
+            sale_start_at=obj.sale_start_at,
+            sale_end_at=obj.sale_end_at,
+            draw_scheduled_at=obj.draw_scheduled_at,
+            now=timezone.now(),
+        )
+
+    def get_free_count(self, obj: Raffle) -> int:
+        width = obj.number_end - obj.number_start + 1
+        return width - obj.sold_count - obj.reserved_count  # type: ignore[attr-defined]
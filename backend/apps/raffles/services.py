@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import base64
+import math
+import time
+from collections.abc import Iterable
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
 
-from apps.purchases.models import Purchase, PurchaseDetail
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils import timezone
+
+from apps.common.images import InvalidImageError, encode_image, extension, load_image
+from apps.purchases.models import RaffleNumber, RaffleStats, TicketTotals
 
 from .models import Raffle
 
@@ -13,23 +28,293 @@ from .models import Raffle
 class RaffleAvailability:
     raffle_id: int
     taken_numbers: list[int]
+    number_start: int
+    number_end: int
 
+    @property
+    def taken_count(self) -> int:
+        return len(self.taken_numbers)
 
-def get_raffle_availability(raffle: Raffle) -> RaffleAvailability:
-    # Get all numbers that are either PAID or RESERVED (not CANCELED)
-    # We don't need customer info anymore for the public endpoint
-    taken_numbers = (
-        PurchaseDetail.objects.filter(purchase__raffle=raffle)
-        .exclude(status=Purchase.Status.CANCELED)
-        .exclude(status=Purchase.Status.EXPIRED)
-        .exclude(purchase__status=Purchase.Status.CANCELED)
-        .exclude(purchase__status=Purchase.Status.EXPIRED)
-        .values_list("number", flat=True)
-        .order_by("number")
-        .distinct()
+    @property
+    def bitmap(self) -> str:
+        """Base64 bitset over the raffle range; bit ``i`` (MSB first) is
+        set when ``number_start + i`` is taken."""
+        width = self.number_end - self.number_start + 1
+        bits = bytearray((width + 7) // 8)
+        for number in self.taken_numbers:
+            offset = number - self.number_start
+            if 0 <= offset < width:
+                bits[offset >> 3] |= 0x80 >> (offset & 7)
+        return base64.b64encode(bytes(bits)).decode("ascii")
+
+    @property
+    def taken_ranges(self) -> list[list[int]]:
+        """Inclusive ``[first, last]`` runs of consecutive taken numbers."""
+        ranges: list[list[int]] = []
+        for number in self.taken_numbers:
+            if ranges and number == ranges[-1][1] + 1:
+                ranges[-1][1] = number
+            else:
+                ranges.append([number, number])
+        return ranges
+
+
+@dataclass(frozen=True)
+class RaffleNumberCounts:
+    sold: int = 0
+    reserved: int = 0
+
+
+@dataclass(frozen=True)
+class RaffleAvailabilitySummary(RaffleAvailability):
+    """Per-raffle counts; ``taken_numbers`` is only filled when requested."""
+
+    sold_count: int
+    reserved_count: int
+
+    @property
+    def taken_count(self) -> int:
+        return self.sold_count + self.reserved_count
+
+    @property
+    def free_count(self) -> int:
+        return self.number_end - self.number_start + 1 - self.taken_count
+
+
+@dataclass(frozen=True)
+class RaffleDashboard(RaffleAvailabilitySummary):
+    """Organizer control board: ticket counts, money and time left to sell."""
+
+    collected_amount: Decimal
+    outstanding_amount: Decimal
+    sale_end_at: datetime
+    days_left: int
+
+
+def raffle_state(
+    *,
+    deleted_at: datetime | None,
+    winner_number: int | None,
+    sale_start_at: datetime,
+    sale_end_at: datetime,
+    draw_scheduled_at: datetime,
+    now: datetime,
+) -> str:
+    """Lifecycle label shown on raffle cards."""
+    if deleted_at:
+        return "archived"
+    if winner_number is not None:
+        return "completed"
+    if now < sale_start_at:
+        return "upcoming"
+    if sale_start_at <= now <= sale_end_at:
+        return "selling"
+    if now <= draw_scheduled_at:
+        return "closed"
+    return "archived"
+
+
+# Cache alias holding availability snapshots; see ``CACHES``.
+AVAILABILITY_CACHE = "availability"
+
+
+def _availability_cache() -> BaseCache:
+    return caches[AVAILABILITY_CACHE]
+
+
+def _generation_key(raffle_id: int) -> str:
+    return f"raffles:availability:{raffle_id}:generation"
+
+
+def _availability_cache_key(raffle_id: int, generation: int) -> str:
+    return f"raffles:availability:{raffle_id}:{generation}"
+
+
+def _generations(raffle_ids: Iterable[int]) -> dict[int, int]:
+    """Current snapshot generation per raffle. A missing counter starts at a
+    value no earlier generation can have had, so snapshots stored before it
+    was evicted are never read again."""
+    cache = _availability_cache()
+    keys = {raffle_id: _generation_key(raffle_id) for raffle_id in raffle_ids}
+    found = cache.get_many(keys.values())
+    start = time.time_ns()
+    generations = {raffle_id: found.get(key, start) for raffle_id, key in keys.items()}
+    missing = {key: start for key in keys.values() if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return generations
+
+
+def _load_taken_numbers(raffle_ids: list[int]) -> dict[int, list[int]]:
+    loaded: dict[int, list[int]] = {raffle_id: [] for raffle_id in raffle_ids}
+    # Claims only exist for PAID or RESERVED tickets, so this is a single
+    # scan of the (raffle, number) index.
+    rows = (
+        RaffleNumber.objects.filter(raffle_id__in=raffle_ids)
+        .values_list("raffle_id", "number")
+        .order_by("raffle_id", "number")
     )
+    for raffle_id, number in rows:
+        loaded[raffle_id].append(number)
+    return loaded
+
+
+def get_taken_numbers(raffle_ids: Iterable[int]) -> dict[int, list[int]]:
+    """Sorted taken numbers per raffle, read through the availability cache.
 
+    Snapshots are keyed by the raffle's generation, which writers bump on
+    commit: a snapshot loaded before a commit is stored under a generation no
+    reader asks for afterwards. Cache misses for all raffles are loaded with a
+    single query.
+    """
+    cache = _availability_cache()
+    keys = {
+        raffle_id: _availability_cache_key(raffle_id, generation)
+        for raffle_id, generation in _generations(raffle_ids).items()
+    }
+    cached = cache.get_many(keys.values())
+    taken = {raffle_id: cached[key] for raffle_id, key in keys.items() if key in cached}
+    missing = [raffle_id for raffle_id in keys if raffle_id not in taken]
+    if missing:
+        loaded = _load_taken_numbers(missing)
+        cache.set_many(
+            {keys[raffle_id]: numbers for raffle_id, numbers in loaded.items()},
+            settings.RAFFLE_AVAILABILITY_CACHE_TIMEOUT,
+        )
+        taken.update(loaded)
+    return taken
+
+
+def get_raffle_availability(raffle: Raffle) -> RaffleAvailability:
     return RaffleAvailability(
         raffle_id=raffle.id,
-        taken_numbers=list(taken_numbers),
+        taken_numbers=get_taken_numbers([raffle.id])[raffle.id],
+        number_start=raffle.number_start,
+        number_end=raffle.number_end,
     )
+
+
+def get_raffle_number_counts(
+    raffle_ids: Iterable[int],
+) -> dict[int, RaffleNumberCounts]:
+    """Sold/reserved counts for many raffles from their ``RaffleStats`` rows."""
+    return {
+        raffle_id: RaffleNumberCounts(
+            sold=totals.sold_count, reserved=totals.reserved_count
+        )
+        for raffle_id, totals in RaffleStats.objects.totals(raffle_ids).items()
+    }
+
+
+def get_availability_summaries(
+    raffles: Iterable[Raffle], *, include_taken: bool = False
+) -> list[RaffleAvailabilitySummary]:
+    raffles = list(raffles)
+    raffle_ids = [raffle.id for raffle in raffles]
+    counts = get_raffle_number_counts(raffle_ids)
+    taken = get_taken_numbers(raffle_ids) if include_taken else {}
+    summaries = []
+    for raffle in raffles:
+        raffle_counts = counts.get(raffle.id, RaffleNumberCounts())
+        summaries.append(
+            RaffleAvailabilitySummary(
+                raffle_id=raffle.id,
+                taken_numbers=taken.get(raffle.id, []),
+                number_start=raffle.number_start,
+                number_end=raffle.number_end,
+                sold_count=raffle_counts.sold,
+                reserved_count=raffle_counts.reserved,
+            )
+        )
+    return summaries
+
+
+def get_raffle_dashboard(
+    raffle: Raffle, *, now: datetime | None = None
+) -> RaffleDashboard:
+    """Dashboard metrics for one raffle, read from its ``RaffleStats``."""
+    totals = RaffleStats.objects.totals([raffle.id]).get(raffle.id, TicketTotals())
+    now = now or timezone.now()
+    remaining = (raffle.sale_end_at - now) / timedelta(days=1)
+    return RaffleDashboard(
+        raffle_id=raffle.id,
+        taken_numbers=[],
+        number_start=raffle.number_start,
+        number_end=raffle.number_end,
+        sale_end_at=raffle.sale_end_at,
+        days_left=max(math.ceil(remaining), 0),
+        **asdict(totals),
+    )
+
+
+def invalidate_raffle_availability(raffle_id: int) -> None:
+    """Move readers to a new availability snapshot once the current
+    transaction commits. Bumping a generation rather than deleting the
+    snapshot means a reader that loaded the numbers before the commit cannot
+    put its stale list back in front of later readers."""
+    key = _generation_key(raffle_id)
+
+    def bump() -> None:
+        # Without a counter the next reader starts a fresh generation anyway.
+        with suppress(ValueError):
+            _availability_cache().incr(key)
+
+    transaction.on_commit(bump)
+
+
+# Formats every raffle image variant is written in; WebP first, JPEG for
+# clients without WebP support.
+IMAGE_VARIANT_FORMATS = ("WEBP", "JPEG")
+
+
+def generate_image_variants(raffle: Raffle) -> dict[str, dict[str, str]]:
+    """
+    Writes downscaled copies of ``raffle.image`` for each edge in
+    ``RAFFLE_IMAGE_VARIANT_EDGES`` and each of ``IMAGE_VARIANT_FORMATS``, and
+    records their storage names in ``raffle.image_variants``.
+
+    Edges not smaller than the original are skipped, keeping the smallest, so
+    a small upload is not stored several times at the same size. An image
+    that cannot be decoded gets no variants; cards fall back to ``image``.
+    """
+    if not raffle.image:
+        return {}
+    try:
+        with raffle.image.open("rb") as file:
+            image = load_image(file)
+    except InvalidImageError:
+        return {}
+
+    edges = sorted(settings.RAFFLE_IMAGE_VARIANT_EDGES)
+    edges = [edge for edge in edges if edge < max(image.size)] or edges[:1]
+    storage = raffle.image.storage
+    stem = Path(raffle.image.name).stem
+    raffle.image_variants = {
+        str(edge): {
+            image_format.lower(): storage.save(
+                f"raffles/variants/{stem}-{edge}.{extension(image_format)}",
+                encode_image(image, max_edge=edge, image_format=image_format),
+            )
+            for image_format in IMAGE_VARIANT_FORMATS
+        }
+        for edge in edges
+    }
+    raffle.save(update_fields=["image_variants"])
+    return raffle.image_variants
+
+
+def image_variant_urls(
+    variants: dict[str, dict[str, str]], request: HttpRequest | None = None
+) -> dict[str, dict[str, str]]:
+    """URLs of the ``raffle.image_variants`` storage names, in the same shape;
+    absolute when a request is known, like DRF's ``ImageField``."""
+    storage = Raffle._meta.get_field("image").storage
+    urls: dict[str, dict[str, str]] = {}
+    for edge, names in variants.items():
+        urls[edge] = {}
+        for image_format, name in names.items():
+            url = storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls[edge][image_format] = url
+    return urls
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.purchases.services import create_reservation
+from apps.raffles import services
+from apps.raffles.models import Raffle
+
+
+@pytest.fixture
+def raffle(organizer_user: Any) -> Raffle:
+    return Raffle.objects.create(
+        name="Cached",
+        number_start=1,
+        number_end=50,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer_user,
+    )
+
+
+@pytest.mark.django_db
+class TestAvailabilityCache:
+    def _taken(self, client: APIClient, raffle: Raffle) -> list[int]:
+        url = reverse("raffle-availability", kwargs={"pk": raffle.pk})
+        resp = client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+        return resp.json()["taken_numbers"]
+
+    def test_repeated_reads_skip_purchase_query(
+        self,
+        api_client: APIClient,
+        raffle: Raffle,
+        django_assert_num_queries: Any,
+    ) -> None:
+        assert self._taken(api_client, raffle) == []
+
+        # Only the raffle lookup remains once the snapshot is cached.
+        with django_assert_num_queries(1):
+            assert self._taken(api_client, raffle) == []
+
+    def test_reservation_invalidates_snapshot(
+        self,
+        api_client: APIClient,
+        raffle: Raffle,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        assert self._taken(api_client, raffle) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resp = api_client.post(
+                reverse("purchase-list"),
+                {
+                    "raffle_id": raffle.pk,
+                    "numbers": [3, 4],
+                    "guest_name": "Guest",
+                    "guest_phone": "1234567890",
+                },
+            )
+        assert resp.status_code == status.HTTP_201_CREATED
+
+        assert self._taken(api_client, raffle) == [3, 4]
+
+    def test_cancel_invalidates_snapshot(
+        self,
+        api_client: APIClient,
+        raffle: Raffle,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        purchase = Purchase.objects.create(
+            raffle=raffle,
+            guest_phone="1234567890",
+            status=Purchase.Status.PENDING,
+            total_amount=Decimal("10.00"),
+        )
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=7, unit_price=Decimal("10.00")
+        )
+        assert self._taken(api_client, raffle) == [7]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            resp = api_client.post(
+                reverse("purchase-cancel", args=[purchase.pk]),
+                {"phone": "1234567890"},
+            )
+        assert resp.status_code == status.HTTP_200_OK
+
+        assert self._taken(api_client, raffle) == []
+
+    def test_snapshot_loaded_before_a_commit_is_not_served(
+        self,
+        raffle: Raffle,
+        monkeypatch: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        load = services._load_taken_numbers
+
+        def load_then_commit(raffle_ids: list[int]) -> dict[int, list[int]]:
+            # A reservation commits after this reader queried, before it caches.
+            loaded = load(raffle_ids)
+            with django_capture_on_commit_callbacks(execute=True):
+                create_reservation(
+                    AnonymousUser(), raffle.pk, [9], {"guest_phone": "1234567890"}
+                )
+            return loaded
+
+        monkeypatch.setattr(services, "_load_taken_numbers", load_then_commit)
+        assert services.get_taken_numbers([raffle.pk]) == {raffle.pk: []}
+        monkeypatch.undo()
+
+        assert services.get_taken_numbers([raffle.pk]) == {raffle.pk: [9]}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import base64
+from decimal import Decimal
+from typing import Any
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+from apps.raffles.services import RaffleAvailability
+
+
+@pytest.fixture
+def raffle_with_numbers(user_factory: Any) -> Raffle:
+    organizer = user_factory()
+    customer = user_factory(email="bits@example.com")
+    raffle = Raffle.objects.create(
+        name="Bits",
+        number_start=10,
+        number_end=29,
+        price_per_number=Decimal("1.00"),
+        sale_start_at="2025-01-01T00:00:00Z",
+        sale_end_at="2025-12-31T00:00:00Z",
+        draw_scheduled_at="2026-01-01T00:00:00Z",
+        organizer=organizer,
+    )
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        customer=customer,
+        status=Purchase.Status.PENDING,
+        total_amount=Decimal("5.00"),
+    )
+    for number in (10, 11, 12, 20, 29):
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=number, unit_price=Decimal("1.00")
+        )
+    return raffle
+
+
+class TestAvailabilityEncodings:
+    def test_bitmap_marks_offsets_from_number_start(self) -> None:
+        availability = RaffleAvailability(
+            raffle_id=1, taken_numbers=[0, 7, 8, 15], number_start=0, number_end=15
+        )
+        assert base64.b64decode(availability.bitmap) == bytes([0b10000001, 0b10000001])
+
+    def test_bitmap_width_covers_partial_last_byte(self) -> None:
+        availability = RaffleAvailability(
+            raffle_id=1, taken_numbers=[], number_start=1, number_end=9
+        )
+        assert base64.b64decode(availability.bitmap) == bytes(2)
+
+    def test_ranges_collapse_consecutive_numbers(self) -> None:
+        availability = RaffleAvailability(
+            raffle_id=1,
+            taken_numbers=[1, 2, 3, 5, 7, 8],
+            number_start=1,
+            number_end=10,
+        )
+        assert availability.taken_ranges == [[1, 3], [5, 5], [7, 8]]
+
+
+@pytest.mark.django_db
+class TestAvailabilityEncodingEndpoint:
+    def test_default_encoding_is_plain_list(
+        self, api_client: APIClient, raffle_with_numbers: Raffle
+    ) -> None:
+        url = reverse("raffle-availability", kwargs={"pk": raffle_with_numbers.pk})
+        resp: Response = api_client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["taken_numbers"] == [10, 11, 12, 20, 29]
+
+    def test_bitmap_encoding(
+        self, api_client: APIClient, raffle_with_numbers: Raffle
+    ) -> None:
+        url = reverse("raffle-availability", kwargs={"pk": raffle_with_numbers.pk})
+        resp: Response = api_client.get(url, {"encoding": "bitmap"})
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.json()
+        assert "taken_numbers" not in data
+        assert data["number_start"] == 10
+        assert data["number_end"] == 29
+        assert data["taken_count"] == 5
+
+        bits = base64.b64decode(data["bitmap"])
+        assert len(bits) == 3
+        decoded = [
+            10 + offset
+            for offset in range(20)
+            if bits[offset >> 3] & (0x80 >> (offset & 7))
+        ]
+        assert decoded == [10, 11, 12, 20, 29]
+
+    def test_ranges_encoding(
+        self, api_client: APIClient, raffle_with_numbers: Raffle
+    ) -> None:
+        url = reverse("raffle-availability", kwargs={"pk": raffle_with_numbers.pk})
+        resp: Response = api_client.get(url, {"encoding": "ranges"})
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.json()
+        assert data["taken_ranges"] == [[10, 12], [20, 20], [29, 29]]
+        assert data["taken_count"] == 5
+
+    def test_unknown_encoding_returns_400(
+        self, api_client: APIClient, raffle_with_numbers: Raffle
+    ) -> None:
+        url = reverse("raffle-availability", kwargs={"pk": raffle_with_numbers.pk})
+        resp: Response = api_client.get(url, {"encoding": "xml"})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert "encoding" in resp.json()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+
+def make_raffle(organizer: Any, name: str, number_end: int = 10) -> Raffle:
+    return Raffle.objects.create(
+        name=name,
+        number_start=1,
+        number_end=number_end,
+        price_per_number=Decimal("1.00"),
+        sale_start_at="2025-01-01T00:00:00Z",
+        sale_end_at="2025-12-31T00:00:00Z",
+        draw_scheduled_at="2026-01-01T00:00:00Z",
+        organizer=organizer,
+    )
+
+
+def take(raffle: Raffle, numbers: list[int], status: str) -> None:
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        guest_phone="1234567890",
+        status=status,
+        total_amount=Decimal(len(numbers)),
+    )
+    for number in numbers:
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=number, unit_price=Decimal("1.00"), status=status
+        )
+
+
+@pytest.mark.django_db
+class TestBulkAvailability:
+    url = reverse("raffle-availability-bulk")
+
+    @pytest.fixture
+    def raffles(self, organizer_user: Any) -> list[Raffle]:
+        first = make_raffle(organizer_user, "First")
+        second = make_raffle(organizer_user, "Second", number_end=20)
+        take(first, [1, 2], Purchase.Status.PAID)
+        take(first, [5], Purchase.Status.PENDING)
+        take(second, [3], Purchase.Status.CANCELED)
+        return [first, second]
+
+    def test_returns_counts_per_raffle(
+        self, api_client: APIClient, raffles: list[Raffle]
+    ) -> None:
+        first, second = raffles
+        resp = api_client.get(self.url, {"ids": f"{first.pk},{second.pk}"})
+        assert resp.status_code == status.HTTP_200_OK
+        data = {row["raffle_id"]: row for row in resp.json()}
+
+        assert data[first.pk]["sold_count"] == 2
+        assert data[first.pk]["reserved_count"] == 1
+        assert data[first.pk]["free_count"] == 7
+        assert "taken_numbers" not in data[first.pk]
+        assert data[second.pk]["sold_count"] == 0
+        assert data[second.pk]["free_count"] == 20
+
+    def test_query_count_does_not_grow_with_raffles(
+        self,
+        api_client: APIClient,
+        organizer_user: Any,
+        django_assert_num_queries: Any,
+    ) -> None:
+        raffles = [make_raffle(organizer_user, f"R{i}") for i in range(10)]
+        for raffle in raffles:
+            take(raffle, [1], Purchase.Status.PENDING)
+        ids = ",".join(str(raffle.pk) for raffle in raffles)
+
+        # Raffle lookup, grouped counts, taken numbers.
+        with django_assert_num_queries(3):
+            resp = api_client.get(self.url, {"ids": ids, "encoding": "list"})
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.json()) == 10
+
+    def test_includes_taken_numbers_in_requested_encoding(
+        self, api_client: APIClient, raffles: list[Raffle]
+    ) -> None:
+        first, _ = raffles
+        resp = api_client.get(self.url, {"ids": str(first.pk), "encoding": "ranges"})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()[0]["taken_ranges"] == [[1, 2], [5, 5]]
+
+    def test_skips_unknown_and_deleted_raffles(
+        self, api_client: APIClient, raffles: list[Raffle]
+    ) -> None:
+        first, second = raffles
+        second.mark_deleted()
+        resp = api_client.get(self.url, {"ids": f"{first.pk},{second.pk},999999"})
+        assert resp.status_code == status.HTTP_200_OK
+        assert [row["raffle_id"] for row in resp.json()] == [first.pk]
+
+    @pytest.mark.parametrize("ids", ["", "1,abc", ",".join(map(str, range(61)))])
+    def test_rejects_invalid_id_lists(self, api_client: APIClient, ids: str) -> None:
+        resp = api_client.get(self.url, {"ids": ids})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ids" in resp.json()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Purchase, PurchaseDetail, RaffleNumber
+from apps.raffles.models import Raffle
+
+
+@pytest.fixture
+def raffle(organizer_user: Any) -> Raffle:
+    now = timezone.now()
+    return Raffle.objects.create(
+        name="Dashboard",
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("25.00"),
+        sale_start_at=now - timedelta(days=1),
+        sale_end_at=now + timedelta(days=3, hours=2),
+        draw_scheduled_at=now + timedelta(days=4),
+        organizer=organizer_user,
+    )
+
+
+def _purchase(
+    raffle: Raffle, numbers: list[int], status: str = Purchase.Status.PENDING
+) -> Purchase:
+    purchase = Purchase.objects.create(
+        raffle=raffle,
+        guest_name="Guest",
+        guest_phone="1234567890",
+        status=status,
+        total_amount=raffle.price_per_number * len(numbers),
+    )
+    details = PurchaseDetail.objects.bulk_create(
+        PurchaseDetail(
+            purchase=purchase,
+            number=number,
+            unit_price=raffle.price_per_number,
+            status=status,
+        )
+        for number in numbers
+    )
+    if status in (Purchase.Status.PENDING, Purchase.Status.PAID):
+        RaffleNumber.objects.claim(raffle.id, details)
+    return purchase
+
+
+@pytest.mark.django_db
+class TestRaffleDashboard:
+    def _dashboard(self, client: APIClient, raffle: Raffle) -> dict[str, Any]:
+        resp = client.get(reverse("raffle-dashboard", kwargs={"pk": raffle.pk}))
+        assert resp.status_code == status.HTTP_200_OK
+        return resp.json()
+
+    def test_metrics(self, organizer_user: Any, raffle: Raffle) -> None:
+        _purchase(raffle, [1, 2, 3], Purchase.Status.PAID)
+        _purchase(raffle, [4, 5])
+        _purchase(raffle, [6], Purchase.Status.CANCELED)
+        _purchase(raffle, [7], Purchase.Status.EXPIRED)
+
+        client = APIClient()
+        client.force_authenticate(user=organizer_user)
+        data = self._dashboard(client, raffle)
+
+        assert data["sold_count"] == 3
+        assert data["reserved_count"] == 2
+        assert data["free_count"] == 95
+        assert data["collected_amount"] == "75.00"
+        assert data["outstanding_amount"] == "50.00"
+        assert data["days_left"] == 4
+
+    def test_empty_raffle(self, organizer_user: Any, raffle: Raffle) -> None:
+        client = APIClient()
+        client.force_authenticate(user=organizer_user)
+        data = self._dashboard(client, raffle)
+
+        assert data["collected_amount"] == "0.00"
+        assert data["outstanding_amount"] == "0.00"
+        assert data["free_count"] == 100
+
+    def test_days_left_never_negative(
+        self, organizer_user: Any, raffle: Raffle
+    ) -> None:
+        raffle.sale_start_at = timezone.now() - timedelta(days=5)
+        raffle.sale_end_at = timezone.now() - timedelta(days=2)
+        raffle.save(update_fields=["sale_start_at", "sale_end_at"])
+
+        client = APIClient()
+        client.force_authenticate(user=organizer_user)
+        assert self._dashboard(client, raffle)["days_left"] == 0
+
+    def test_reads_counters_in_two_queries(
+        self,
+        organizer_user: Any,
+        raffle: Raffle,
+        django_assert_num_queries: Any,
+    ) -> None:
+        _purchase(raffle, [1, 2], Purchase.Status.PAID)
+        client = APIClient()
+        client.force_authenticate(user=organizer_user)
+
+        # The raffle lookup and one read of its counter slots.
+        with django_assert_num_queries(2):
+            assert self._dashboard(client, raffle)["sold_count"] == 2
+
+        _purchase(raffle, [10])
+        assert self._dashboard(client, raffle)["reserved_count"] == 1
+
+    def test_other_users_are_forbidden(self, user_factory: Any, raffle: Raffle) -> None:
+        client = APIClient()
+        client.force_authenticate(user=user_factory(email="other@example.com"))
+        resp = client.get(reverse("raffle-dashboard", kwargs={"pk": raffle.pk}))
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_requires_authentication(
+        self, api_client: APIClient, raffle: Raffle
+    ) -> None:
+        resp = api_client.get(reverse("raffle-dashboard", kwargs={"pk": raffle.pk}))
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Payment, PaymentWithReceipt, RaffleStats
+from apps.purchases.services import create_reservation
+from apps.purchases.tasks import reconcile_raffle_stats
+from apps.raffles.models import Raffle
+
+GUEST = {"guest_name": "Guest", "guest_phone": "1234567890"}
+
+
+def make_raffle(organizer: Any, name: str, *, days: int = 0) -> Raffle:
+    start = timezone.now() + timedelta(days=days)
+    return Raffle.objects.create(
+        name=name,
+        number_start=1,
+        number_end=10,
+        price_per_number=Decimal("20.00"),
+        sale_start_at=start,
+        sale_end_at=start + timedelta(days=7),
+        draw_scheduled_at=start + timedelta(days=8),
+        organizer=organizer,
+    )
+
+
+@pytest.fixture
+def client(organizer_user: Any) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=organizer_user)
+    return client
+
+
+@pytest.mark.django_db
+class TestRaffleHistory:
+    url = reverse("organizer-raffle-history")
+
+    def test_reports_totals_per_raffle(
+        self, client: APIClient, organizer_user: Any
+    ) -> None:
+        raffle = make_raffle(organizer_user, "Older", days=-1)
+        purchase = create_reservation(AnonymousUser(), raffle.id, [1, 2, 3], GUEST)
+        payment = Payment.objects.create(purchase=purchase, amount=Decimal("20.00"))
+        receipt = PaymentWithReceipt.objects.create(
+            payment=payment, selected_numbers=[1]
+        )
+        client.post(
+            reverse("verifications-verify", args=[receipt.pk]), {"action": "approve"}
+        )
+        make_raffle(organizer_user, "Newer", days=1)
+
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        newer, older = response.data["results"]
+        assert newer["name"] == "Newer"
+        assert newer["sold_count"] == 0
+        assert newer["free_count"] == 10
+        assert older["name"] == "Older"
+        assert older["sold_count"] == 1
+        assert older["reserved_count"] == 2
+        assert older["free_count"] == 7
+        assert older["collected_amount"] == "20.00"
+        assert older["outstanding_amount"] == "40.00"
+
+    def test_includes_archived_raffles_of_organizer_only(
+        self, client: APIClient, organizer_user: Any, user_factory: Any
+    ) -> None:
+        archived = make_raffle(organizer_user, "Archived")
+        archived.deleted_at = timezone.now()
+        archived.save(update_fields=["deleted_at"])
+        other = user_factory(email="other@example.com", user_type="organizer")
+        make_raffle(other, "Not mine")
+
+        names = [row["name"] for row in client.get(self.url).data["results"]]
+
+        assert names == ["Archived"]
+
+    def test_cost_does_not_grow_with_tickets(
+        self,
+        client: APIClient,
+        organizer_user: Any,
+        django_assert_num_queries: Any,
+    ) -> None:
+        raffle = make_raffle(organizer_user, "Busy")
+        create_reservation(AnonymousUser(), raffle.id, list(range(1, 11)), GUEST)
+
+        # Page count and the page itself, read from the counters.
+        with django_assert_num_queries(2):
+            client.get(self.url)
+
+    def test_scheduled_reconcile_corrects_history(
+        self, client: APIClient, organizer_user: Any
+    ) -> None:
+        raffle = make_raffle(organizer_user, "Drifted")
+        create_reservation(AnonymousUser(), raffle.id, [1], GUEST)
+        RaffleStats.objects.filter(raffle=raffle).update(reserved_count=3)
+
+        assert reconcile_raffle_stats() == 1
+
+        (row,) = client.get(self.url).data["results"]
+        assert row["reserved_count"] == 1
@@ -0,0 +1,139 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from PIL import Image
+from rest_framework import status
+
+from apps.purchases.models import Purchase
+from apps.purchases.serializers import PurchaseReadSerializer
+from apps.raffles.models import Raffle
+from apps.raffles.services import generate_image_variants
+
+pytestmark = pytest.mark.django_db
+
+
+def png_upload(size):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="PNG")
+    return SimpleUploadedFile("cover.png", buffer.getvalue(), content_type="image/png")
+
+
+def stored_image(name):
+    storage = Raffle._meta.get_field("image").storage
+    with storage.open(name) as file, Image.open(file) as image:
+        return image.format, image.size
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.RAFFLE_IMAGE_VARIANT_EDGES = [320, 640, 1280]
+
+
+def make_raffle(organizer, image=None):
+    return Raffle.objects.create(
+        name="Variants",
+        image=image,
+        number_start=1,
+        number_end=100,
+        price_per_number=Decimal("10.00"),
+        sale_start_at=timezone.now(),
+        sale_end_at=timezone.now() + timedelta(days=7),
+        draw_scheduled_at=timezone.now() + timedelta(days=8),
+        organizer=organizer,
+    )
+
+
+class TestGenerateImageVariants:
+    def test_writes_each_edge_in_webp_and_jpeg(self, organizer_user):
+        raffle = make_raffle(organizer_user, png_upload((2000, 1000)))
+
+        variants = generate_image_variants(raffle)
+
+        assert list(variants) == ["320", "640", "1280"]
+        assert stored_image(variants["320"]["webp"]) == ("WEBP", (320, 160))
+        assert stored_image(variants["640"]["jpeg"]) == ("JPEG", (640, 320))
+        assert stored_image(variants["1280"]["webp"]) == ("WEBP", (1280, 640))
+        raffle.refresh_from_db()
+        assert raffle.image_variants == variants
+
+    def test_small_image_is_not_upscaled(self, organizer_user):
+        raffle = make_raffle(organizer_user, png_upload((500, 200)))
+
+        variants = generate_image_variants(raffle)
+
+        assert list(variants) == ["320"]
+        assert stored_image(variants["320"]["jpeg"]) == ("JPEG", (320, 128))
+
+    def test_tiny_image_keeps_the_smallest_edge(self, organizer_user):
+        raffle = make_raffle(organizer_user, png_upload((40, 40)))
+
+        variants = generate_image_variants(raffle)
+
+        assert list(variants) == ["320"]
+        assert stored_image(variants["320"]["webp"]) == ("WEBP", (40, 40))
+
+    def test_undecodable_image_gets_no_variants(self, organizer_user):
+        broken = SimpleUploadedFile("x.png", b"not an image", content_type="image/png")
+        raffle = make_raffle(organizer_user, broken)
+
+        assert generate_image_variants(raffle) == {}
+        assert make_raffle(organizer_user).image_variants == {}
+
+
+class TestImageVariantUrls:
+    def test_create_returns_variant_urls(self, api_client, organizer_user):
+        api_client.force_authenticate(user=organizer_user)
+        now = timezone.now()
+        payload = {
+            "name": "Con imagen",
+            "image": png_upload((1000, 800)),
+            "number_start": 1,
+            "number_end": 100,
+            "price_per_number": "10.00",
+            "sale_start_at": (now + timedelta(days=1)).isoformat(),
+            "sale_end_at": (now + timedelta(days=30)).isoformat(),
+            "draw_scheduled_at": (now + timedelta(days=31)).isoformat(),
+        }
+
+        response = api_client.post(
+            reverse("organizer-raffle-list"), payload, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        variants = response.data["image_variants"]
+        assert list(variants) == ["320", "640"]
+        assert variants["640"]["webp"].startswith("http://testserver/")
+        assert variants["640"]["webp"].endswith("-640.webp")
+        assert variants["640"]["jpeg"].endswith("-640.jpg")
+
+    def test_public_list_includes_variants(self, api_client, organizer_user):
+        raffle = make_raffle(organizer_user, png_upload((700, 700)))
+        generate_image_variants(raffle)
+        plain = make_raffle(organizer_user)
+
+        response = api_client.get(reverse("raffle-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        by_id = {row["id"]: row for row in response.data["results"]}
+        assert list(by_id[raffle.pk]["image_variants"]) == ["320", "640"]
+        assert by_id[plain.pk]["image_variants"] == {}
+
+    def test_purchase_exposes_raffle_variants(self, organizer_user):
+        raffle = make_raffle(organizer_user, png_upload((700, 700)))
+        variants = generate_image_variants(raffle)
+        purchase = Purchase.objects.create(
+            raffle=raffle, guest_phone="1234567890", total_amount=Decimal("10.00")
+        )
+
+        data = PurchaseReadSerializer(purchase).data
+
+        assert data["raffle_image_variants"]["320"]["webp"].endswith(
+            variants["320"]["webp"]
+        )
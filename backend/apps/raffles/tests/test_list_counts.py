@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+
+
+def make_raffle(organizer: Any, name: str) -> Raffle:
+    raffle = Raffle.objects.create(
+        name=name,
+        number_start=1,
+        number_end=10,
+        price_per_number=Decimal("1.00"),
+        sale_start_at="2025-01-01T00:00:00Z",
+        sale_end_at="2025-12-31T00:00:00Z",
+        draw_scheduled_at="2026-01-01T00:00:00Z",
+        organizer=organizer,
+    )
+    purchase = Purchase.objects.create(
+        raffle=raffle, guest_phone="1234567890", total_amount=Decimal("3.00")
+    )
+    PurchaseDetail.objects.create(
+        purchase=purchase,
+        number=1,
+        unit_price=Decimal("1.00"),
+        status=Purchase.Status.PAID,
+    )
+    for number in (2, 3):
+        PurchaseDetail.objects.create(
+            purchase=purchase, number=number, unit_price=Decimal("1.00")
+        )
+    return raffle
+
+
+def count_queries(client: APIClient, url: str, params: dict[str, Any]) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url, params)
+    assert resp.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestRaffleListCounts:
+    def test_counts_omitted_by_default(
+        self, api_client: APIClient, organizer_user: Any
+    ) -> None:
+        make_raffle(organizer_user, "A")
+        card = api_client.get(reverse("raffle-list")).data["results"][0]
+        assert "sold_count" not in card
+        assert "free_count" not in card
+
+    def test_public_list_includes_counts(
+        self, api_client: APIClient, organizer_user: Any
+    ) -> None:
+        make_raffle(organizer_user, "A")
+        resp = api_client.get(reverse("raffle-list"), {"include_counts": "true"})
+        card = resp.data["results"][0]
+        assert card["sold_count"] == 1
+        assert card["reserved_count"] == 2
+        assert card["free_count"] == 7
+
+    def test_organizer_list_includes_counts(
+        self, api_client: APIClient, organizer_user: Any
+    ) -> None:
+        make_raffle(organizer_user, "A")
+        api_client.force_authenticate(user=organizer_user)
+        resp = api_client.get(reverse("organizer-raffle-list"), {"include_counts": "1"})
+        assert resp.data["results"][0]["free_count"] == 7
+
+    def test_query_count_is_independent_of_page_size(
+        self, api_client: APIClient, organizer_user: Any
+    ) -> None:
+        make_raffle(organizer_user, "A")
+        params = {"include_counts": "true"}
+        small = count_queries(api_client, reverse("raffle-list"), params)
+
+        for i in range(10):
+            make_raffle(organizer_user, f"B{i}")
+        large = count_queries(api_client, reverse("raffle-list"), params)
+
+        assert small == large
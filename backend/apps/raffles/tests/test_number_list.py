@@ -156,14 +156,12 @@ class TestRaffleAvailability:
             status=Purchase.Status.PENDING,
             total_amount=Decimal("1.00"),
         )
-        PurchaseDetail.objects.create(purchase=p1, number=2, unit_price=Decimal("1.00"))
-        p2 = Purchase.objects.create(
-            raffle=raffle,
-            customer=customer,
-            status=Purchase.Status.PAID,
-            total_amount=Decimal("1.00"),
+        detail = PurchaseDetail.objects.create(
+            purchase=p1, number=2, unit_price=Decimal("1.00")
         )
-        PurchaseDetail.objects.create(purchase=p2, number=2, unit_price=Decimal("1.00"))
+        detail.status = Purchase.Status.PAID
+        detail.save()
+        p1.update_status_from_details()
 
         url = reverse("raffle-availability", kwargs={"pk": raffle.pk})
         resp: Response = api_client.get(url)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.models import User
+from apps.purchases.models import Purchase, PurchaseDetail
+from apps.raffles.models import Raffle
+from apps.raffles.projections import (
+    OrganizerRaffleCardProjection,
+    RaffleCardProjection,
+)
+from apps.raffles.serializers import OrganizerRaffleSerializer, PublicRaffleSerializer
+from apps.raffles.services import generate_image_variants, get_raffle_number_counts
+
+GIF = (
+    b"\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x80\x00\x00\x05\x04\x04\x00\x00"
+    b"\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02\x44\x01\x00\x3b"
+)
+
+
+@pytest.fixture
+def raffles(organizer_user: Any, settings: Any, tmp_path: Any) -> list[Raffle]:
+    settings.MEDIA_ROOT = tmp_path
+    unnamed = User.objects.create_user(email="unnamed@example.com", password="pw")
+    selling = Raffle.objects.create(
+        name="Selling",
+        description="With image",
+        image=SimpleUploadedFile("r.gif", GIF, content_type="image/gif"),
+        number_start=1,
+        number_end=10,
+        price_per_number=Decimal("12.50"),
+        sale_start_at="2025-01-01T00:00:00Z",
+        sale_end_at="2030-12-31T00:00:00Z",
+        draw_scheduled_at="2031-01-01T00:00:00Z",
+        organizer=organizer_user,
+        created_by=organizer_user,
+    )
+    finished = Raffle.objects.create(
+        name="Finished",
+        number_start=5,
+        number_end=50,
+        price_per_number=Decimal("1.00"),
+        sale_start_at="2024-01-01T00:00:00Z",
+        sale_end_at="2024-02-01T00:00:00Z",
+        draw_scheduled_at="2024-03-01T00:00:00Z",
+        winner_number=7,
+        organizer=unnamed,
+    )
+    archived = Raffle.objects.create(
+        name="Archived",
+        number_start=1,
+        number_end=5,
+        price_per_number=Decimal("3.00"),
+        sale_start_at="2025-01-01T00:00:00Z",
+        sale_end_at="2030-12-31T00:00:00Z",
+        draw_scheduled_at="2031-01-01T00:00:00Z",
+        organizer=organizer_user,
+        deleted_at=timezone.now(),
+    )
+    purchase = Purchase.objects.create(
+        raffle=selling, guest_phone="1234567890", total_amount=Decimal("25.00")
+    )
+    PurchaseDetail.objects.create(purchase=purchase, number=2, unit_price=10)
+    generate_image_variants(selling)
+    return [selling, finished, archived]
+
+
+@pytest.mark.django_db
+class TestRaffleCardProjection:
+    @pytest.mark.parametrize(
+        ("projection_class", "serializer_class"),
+        [
+            (RaffleCardProjection, PublicRaffleSerializer),
+            (OrganizerRaffleCardProjection, OrganizerRaffleSerializer),
+        ],
+    )
+    @pytest.mark.parametrize("with_counts", [False, True])
+    def test_matches_serializer(
+        self,
+        raffles: list[Raffle],
+        projection_class: type[RaffleCardProjection],
+        serializer_class: type[PublicRaffleSerializer],
+        with_counts: bool,
+    ) -> None:
+        context: dict[str, Any] = {"request": APIRequestFactory().get("/")}
+        if with_counts:
+            context["number_counts"] = get_raffle_number_counts(r.id for r in raffles)
+        queryset = Raffle.objects.order_by("id")
+        expected = serializer_class(queryset, many=True, context=context).data
+
+        rows = list(projection_class(context).rows(queryset))
+
+        assert rows == [dict(row) for row in expected]
+        assert [row["state"] for row in rows] == ["selling", "completed", "archived"]
@@ -1,8 +1,12 @@
 from django.urls import path
 
 from .views import (
+    OrganizerRaffleHistoryView,
     OrganizerRaffleListView,
     RaffleAvailabilityView,
+    RaffleBulkAvailabilityView,
+    RaffleDashboardView,
+    RaffleDebtorsView,
     RaffleDetailView,
     RaffleListView,
     RaffleManifestView,
@@ -10,6 +14,11 @@ from .views import (
 
 urlpatterns = [
     path("", RaffleListView.as_view(), name="raffle-list"),
+    path(
+        "availability/",
+        RaffleBulkAvailabilityView.as_view(),
+        name="raffle-availability-bulk",
+    ),
     path("<int:pk>/", RaffleDetailView.as_view(), name="raffle-detail"),
     path(
         "<int:pk>/availability/",
@@ -17,9 +26,24 @@ urlpatterns = [
         name="raffle-availability",
     ),
     path("organizer/", OrganizerRaffleListView.as_view(), name="organizer-raffle-list"),
+    path(
+        "organizer/history/",
+        OrganizerRaffleHistoryView.as_view(),
+        name="organizer-raffle-history",
+    ),
     path(
         "<int:pk>/manifest/",
         RaffleManifestView.as_view(),
         name="raffle-manifest",
     ),
+    path(
+        "<int:pk>/dashboard/",
+        RaffleDashboardView.as_view(),
+        name="raffle-dashboard",
+    ),
+    path(
+        "<int:pk>/debtors/",
+        RaffleDebtorsView.as_view(),
+        name="raffle-debtors",
+    ),
 ]
@@ -2,35 +2,69 @@ from datetime import datetime
 from typing import cast
 
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, permissions, serializers, status
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
 from rest_framework.parsers import MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.common.params import parse_bool_param
+from apps.common.projections import Projection
+from apps.common.streaming import stream_csv, stream_ndjson
+from apps.purchases.models import ACTIVE_STATUSES, Purchase, PurchaseDetail
+from apps.purchases.projections import DebtorProjection, PurchaseManifestProjection
+
 from .models import Raffle
+from .projections import OrganizerRaffleCardProjection, RaffleCardProjection
 from .serializers import (
     OrganizerRaffleSerializer,
     OrganizerRaffleWriteSerializer,
     PublicRaffleSerializer,
+    RaffleAvailabilityBitmapSerializer,
+    RaffleAvailabilityRangesSerializer,
     RaffleAvailabilitySerializer,
+    RaffleAvailabilitySummaryBitmapSerializer,
+    RaffleAvailabilitySummaryListSerializer,
+    RaffleAvailabilitySummaryRangesSerializer,
+    RaffleAvailabilitySummarySerializer,
+    RaffleDashboardSerializer,
+    RaffleDebtorSerializer,
+    RaffleHistorySerializer,
+)
+from .services import (
+    RaffleAvailability,
+    RaffleDashboard,
+    get_availability_summaries,
+    get_raffle_availability,
+    get_raffle_dashboard,
+    get_raffle_number_counts,
 )
-from .services import RaffleAvailability, get_raffle_availability
 
 
-def _parse_bool_param(value: str | None) -> bool | None:
-    if value is None:
-        return None
-    value = value.strip().lower()
-    if value in {"1", "true", "yes", "on"}:
-        return True
-    if value in {"0", "false", "no", "off"}:
-        return False
-    return None
+def _parse_id_list(value: str | None, *, limit: int) -> list[int]:
+    if not value:
+        raise ValidationError({"ids": "Se requiere al menos un identificador."})
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part))
+    except ValueError:
+        raise ValidationError(
+            {"ids": "Los identificadores deben ser números enteros."}
+        ) from None
+    if len(ids) > limit:
+        raise ValidationError(
+            {"ids": f"Se permiten como máximo {limit} identificadores."}
+        )
+    return ids
 
 
 def _filter_queryset_by_state(
@@ -62,6 +96,29 @@ def _filter_queryset_by_state(
     return queryset
 
 
+class RaffleCardListMixin(generics.GenericAPIView):
+    """Lists raffles through a ``values()`` projection instead of the read
+    serializer. Adds sold/reserved/free counts when the client passes
+    ``include_counts``; one grouped query covers the whole page."""
+
+    request: Request
+    projection_class: type[RaffleCardProjection] = RaffleCardProjection
+
+    def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+        projection = self.projection_class(context=self.get_serializer_context())
+        values = projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(values)
+        records = list(values) if page is None else page
+        if parse_bool_param(request.query_params.get("include_counts")):
+            projection.context["number_counts"] = get_raffle_number_counts(
+                projection.pluck(records, "id")
+            )
+        rows = list(projection.build(records))
+        if page is None:
+            return Response(rows)
+        return self.get_paginated_response(rows)
+
+
 class RafflePagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = "page_size"
@@ -79,9 +136,12 @@ class RaffleDetailView(generics.RetrieveAPIView):
 @extend_schema(
     tags=["Raffles"],
     summary="List public raffles",
-    description="Returns a paginated list of raffles with optional state/on_sale filters.",
+    description=(
+        "Returns a paginated list of raffles with optional state/on_sale filters. "
+        "Pass `include_counts=true` to add sold/reserved/free counts."
+    ),
 )
-class RaffleListView(generics.ListAPIView):
+class RaffleListView(RaffleCardListMixin, generics.ListAPIView):
     request: Request
     serializer_class = PublicRaffleSerializer
     pagination_class = RafflePagination
@@ -99,7 +159,7 @@ class RaffleListView(generics.ListAPIView):
         state = request.query_params.get("state")
         queryset = _filter_queryset_by_state(queryset, state, now=now)
 
-        on_sale = _parse_bool_param(request.query_params.get("on_sale"))
+        on_sale = parse_bool_param(request.query_params.get("on_sale"))
         if on_sale is True:
             queryset = queryset.filter(
                 winner_number__isnull=True, sale_start_at__lte=now, sale_end_at__gte=now
@@ -112,20 +172,117 @@ class RaffleListView(generics.ListAPIView):
         return queryset
 
 
+AVAILABILITY_SERIALIZERS: dict[str, type[serializers.Serializer]] = {
+    "list": RaffleAvailabilitySerializer,
+    "bitmap": RaffleAvailabilityBitmapSerializer,
+    "ranges": RaffleAvailabilityRangesSerializer,
+}
+
+AVAILABILITY_SUMMARY_SERIALIZERS: dict[str, type[serializers.Serializer]] = {
+    "counts": RaffleAvailabilitySummarySerializer,
+    "list": RaffleAvailabilitySummaryListSerializer,
+    "bitmap": RaffleAvailabilitySummaryBitmapSerializer,
+    "ranges": RaffleAvailabilitySummaryRangesSerializer,
+}
+
+
+def _availability_serializer(
+    request: Request,
+    serializer_classes: dict[str, type[serializers.Serializer]],
+    default: str,
+) -> type[serializers.Serializer]:
+    encoding = request.query_params.get("encoding", default).lower()
+    try:
+        return serializer_classes[encoding]
+    except KeyError:
+        raise ValidationError(
+            {"encoding": f"Codificación no soportada: {encoding}."}
+        ) from None
+
+
 @extend_schema(
     tags=["Raffles"],
     summary="Retrieve raffle availability",
-    description="Shows ticket availability and sold counts for a specific raffle.",
+    description=(
+        "Shows ticket availability and sold counts for a specific raffle. "
+        "Use `encoding=bitmap` (base64 bitset over the raffle range) or "
+        "`encoding=ranges` (runs of consecutive taken numbers) for large raffles."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="encoding",
+            description="Representation of the taken numbers.",
+            required=False,
+            type=str,
+            enum=list(AVAILABILITY_SERIALIZERS),
+        )
+    ],
 )
 class RaffleAvailabilityView(generics.RetrieveAPIView):
+    request: Request
     serializer_class = RaffleAvailabilitySerializer
     permission_classes = (permissions.AllowAny,)
 
+    def get_serializer_class(self) -> type[serializers.Serializer]:
+        return _availability_serializer(
+            self.request, AVAILABILITY_SERIALIZERS, default="list"
+        )
+
     def get_object(self) -> RaffleAvailability:
         raffle = get_object_or_404(Raffle.objects.active(), pk=self.kwargs["pk"])
         return get_raffle_availability(raffle)
 
 
+@extend_schema(
+    tags=["Raffles"],
+    summary="Retrieve availability for several raffles",
+    description=(
+        "Returns sold/reserved/free counts for up to "
+        f"{RafflePagination.max_page_size} raffles in one request. Pass an "
+        "`encoding` to also include each raffle's taken numbers."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="ids",
+            description="Comma-separated raffle ids.",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="encoding",
+            description="Include taken numbers in this representation.",
+            required=False,
+            type=str,
+            enum=list(AVAILABILITY_SUMMARY_SERIALIZERS),
+        ),
+    ],
+    responses=RaffleAvailabilitySummarySerializer(many=True),
+)
+class RaffleBulkAvailabilityView(generics.GenericAPIView):
+    request: Request
+    serializer_class = RaffleAvailabilitySummarySerializer
+    permission_classes = (permissions.AllowAny,)
+    pagination_class = None
+
+    def get_serializer_class(self) -> type[serializers.Serializer]:
+        return _availability_serializer(
+            self.request, AVAILABILITY_SUMMARY_SERIALIZERS, default="counts"
+        )
+
+    def get(self, request: Request, *args: object, **kwargs: object) -> Response:
+        raffle_ids = _parse_id_list(
+            request.query_params.get("ids"), limit=RafflePagination.max_page_size
+        )
+        serializer_class = self.get_serializer_class()
+        raffles = Raffle.objects.active().filter(pk__in=raffle_ids).order_by("id")
+        summaries = get_availability_summaries(
+            raffles,
+            include_taken=serializer_class is not RaffleAvailabilitySummarySerializer,
+        )
+        serializer = self.get_serializer(summaries, many=True)
+        return Response(serializer.data)
+
+
 @extend_schema(
     tags=["Raffles"],
     summary="List or create organizer raffles",
@@ -133,9 +290,10 @@ class RaffleAvailabilityView(generics.RetrieveAPIView):
     request=OrganizerRaffleWriteSerializer,
     responses=OrganizerRaffleSerializer,
 )
-class OrganizerRaffleListView(generics.ListCreateAPIView):
+class OrganizerRaffleListView(RaffleCardListMixin, generics.ListCreateAPIView):
     request: Request
     serializer_class = OrganizerRaffleSerializer
+    projection_class = OrganizerRaffleCardProjection
     pagination_class = RafflePagination
     permission_classes = (permissions.IsAuthenticated,)
     parser_classes = (MultiPartParser,)
@@ -143,7 +301,7 @@ class OrganizerRaffleListView(generics.ListCreateAPIView):
     def get_queryset(self) -> QuerySet[Raffle]:
         request = cast(Request, self.request)
         now = timezone.now()
-        include_deleted = _parse_bool_param(request.query_params.get("include_deleted"))
+        include_deleted = parse_bool_param(request.query_params.get("include_deleted"))
 
         queryset = (
             Raffle.objects.select_related("organizer", "created_by", "updated_by")
@@ -185,32 +343,84 @@ class OrganizerRaffleListView(generics.ListCreateAPIView):
         )
 
 
+# Rows fetched per round trip when exporting a report.
+REPORT_EXPORT_CHUNK_SIZE = 2000
+
+REPORT_EXPORTS: dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _export_format(request: Request) -> str | None:
+    export = request.query_params.get("export")
+    if export is not None and export not in REPORT_EXPORTS:
+        raise ValidationError({"export": "Formato de exportación no soportado."})
+    return export
+
+
+def _export_response(
+    projection: Projection, queryset: QuerySet, export: str, filename: str
+) -> StreamingHttpResponse:
+    """Stream every row of ``projection`` over ``queryset`` as a download."""
+    rows = projection.rows(queryset, chunk_size=REPORT_EXPORT_CHUNK_SIZE)
+    if export == "csv":
+        body = stream_csv(rows, list(projection.columns))
+    else:
+        body = stream_ndjson(rows)
+    response = StreamingHttpResponse(body, content_type=REPORT_EXPORTS[export])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export}"'
+    return response
+
+
+def _organizer_raffle(view: generics.GenericAPIView, message: str) -> Raffle:
+    raffle = get_object_or_404(Raffle, pk=view.kwargs["pk"])
+    if raffle.organizer_id != view.request.user.pk:
+        view.permission_denied(view.request, message=message)
+    return raffle
+
+
+EXPORT_PARAMETER = OpenApiParameter(
+    "export",
+    str,
+    enum=list(REPORT_EXPORTS),
+    description="Stream the report as a CSV or NDJSON download.",
+)
+
+
 @extend_schema(
     tags=["Raffles"],
     summary="Retrieve raffle manifest",
-    description="Returns a detailed list of all taken numbers for a raffle. Only accessible by the organizer.",
+    description=(
+        "Returns a detailed list of all taken numbers for a raffle. Only accessible "
+        "by the organizer. Pass `export=csv` or `export=ndjson` to stream a "
+        "download instead."
+    ),
+    parameters=[EXPORT_PARAMETER],
 )
 class RaffleManifestView(generics.ListAPIView):
     permission_classes = (permissions.IsAuthenticated,)
     pagination_class = None  # Return all numbers at once
 
+    def list(
+        self, request: Request, *args: object, **kwargs: object
+    ) -> Response | StreamingHttpResponse:
+        export = _export_format(request)
+        queryset = self.get_queryset()
+        projection = PurchaseManifestProjection(self.get_serializer_context())
+        if export is None:
+            return Response(list(projection.rows(queryset)))
+        return _export_response(
+            projection, queryset, export, f"raffle-{self.kwargs['pk']}-manifest"
+        )
+
     def get_serializer_class(self) -> type[serializers.Serializer]:
         from apps.purchases.serializers import PurchaseManifestSerializer
 
         return PurchaseManifestSerializer
 
     def get_queryset(self) -> QuerySet:
-        from apps.purchases.models import Purchase, PurchaseDetail
-
-        raffle = get_object_or_404(Raffle, pk=self.kwargs["pk"])
-
-        # Check permission: Only the organizer can view the manifest
-        if raffle.organizer != self.request.user:
-            self.permission_denied(
-                self.request,
-                message="No tienes permiso para ver este manifiesto.",
-            )
-
+        raffle = _organizer_raffle(self, "No tienes permiso para ver este manifiesto.")
         return (
             PurchaseDetail.objects.filter(purchase__raffle=raffle)
             .select_related("purchase", "purchase__customer")
@@ -218,3 +428,105 @@ class RaffleManifestView(generics.ListAPIView):
             .exclude(purchase__status=Purchase.Status.EXPIRED)
             .order_by("number")
         )
+
+
+@extend_schema(
+    tags=["Raffles"],
+    summary="Retrieve raffle dashboard",
+    description=(
+        "Collected and outstanding amounts, sold/reserved/free counts and days "
+        "left in the sale period. Only accessible by the organizer."
+    ),
+)
+class RaffleDashboardView(generics.RetrieveAPIView):
+    serializer_class = RaffleDashboardSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_object(self) -> RaffleDashboard:
+        raffle = _organizer_raffle(self, "No tienes permiso para ver este tablero.")
+        return get_raffle_dashboard(raffle)
+
+
+class DebtorCursorPagination(CursorPagination):
+    """Keyset pages over the debtor key."""
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "debtor"
+
+
+@extend_schema(
+    tags=["Raffles"],
+    summary="Retrieve raffle debtors report",
+    description=(
+        "Customers and guests holding reserved numbers, with the numbers and the "
+        "amount they owe. Only accessible by the organizer. Returns every debtor "
+        "by default; pass `cursor` or `page_size` for cursor pages, or "
+        "`export=csv|ndjson` to stream a download."
+    ),
+    parameters=[EXPORT_PARAMETER],
+    responses=RaffleDebtorSerializer(many=True),
+)
+class RaffleDebtorsView(generics.ListAPIView):
+    serializer_class = RaffleDebtorSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = DebtorCursorPagination
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        # Clients that don't ask for pages get a plain array.
+        params = self.request.query_params
+        if "cursor" not in params and "page_size" not in params:
+            return None
+        return super().paginator
+
+    def list(
+        self, request: Request, *args: object, **kwargs: object
+    ) -> Response | StreamingHttpResponse:
+        export = _export_format(request)
+        queryset = self.get_queryset()
+        projection = DebtorProjection(self.get_serializer_context())
+        if export is not None:
+            return _export_response(
+                projection, queryset, export, f"raffle-{self.kwargs['pk']}-debtors"
+            )
+
+        values = projection.values(queryset, named=True)
+        page = self.paginate_queryset(values)
+        if page is None:
+            return Response(list(projection.build(values)))
+        return self.get_paginated_response(list(projection.build(page)))
+
+    def get_queryset(self) -> QuerySet[PurchaseDetail]:
+        raffle = _organizer_raffle(
+            self, "No tienes permiso para ver el reporte de deudores."
+        )
+        return PurchaseDetail.objects.filter(
+            purchase__raffle=raffle,
+            status=Purchase.Status.PENDING,
+            purchase__status__in=ACTIVE_STATUSES,
+        )
+
+
+@extend_schema(
+    tags=["Raffles"],
+    summary="Retrieve organizer raffle history",
+    description=(
+        "Historical report of the organizer's raffles, archived ones included: "
+        "dates, state, collected and outstanding amounts, and sold, unpaid "
+        "(reserved) and free number counts. Newest draw first."
+    ),
+)
+class OrganizerRaffleHistoryView(generics.ListAPIView):
+    request: Request
+    serializer_class = RaffleHistorySerializer
+    pagination_class = RafflePagination
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet[Raffle]:
+        return (
+            Raffle.objects.filter(organizer=self.request.user)
+            .with_ticket_totals()
+            .order_by("-draw_scheduled_at", "-id")
+        )
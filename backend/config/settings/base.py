@@ -197,6 +197,28 @@ CELERY_RESULT_BACKEND = env("REDIS_URL", default="redis://localhost:6379/0")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+CELERY_BEAT_SCHEDULE = {
+    "expire-reservations": {
+        "task": "apps.purchases.tasks.expire_reservations",
+        "schedule": env.int("RESERVATION_EXPIRY_INTERVAL", default=60),
+    },
+    "reconcile-raffle-stats": {
+        "task": "apps.purchases.tasks.reconcile_raffle_stats",
+        "schedule": env.int("RAFFLE_STATS_RECONCILE_INTERVAL", default=24 * 60 * 60),
+    },
+}
+
+# Purchases expired per transaction by the reservation sweeper.
+RESERVATION_EXPIRY_BATCH_SIZE = env.int("RESERVATION_EXPIRY_BATCH_SIZE", default=500)
+
+# Longest side, in pixels, of re-encoded receipt images and their thumbnails.
+RECEIPT_IMAGE_MAX_EDGE = env.int("RECEIPT_IMAGE_MAX_EDGE", default=1600)
+RECEIPT_THUMBNAIL_EDGE = env.int("RECEIPT_THUMBNAIL_EDGE", default=320)
+
+# Longest sides, in pixels, of the downscaled copies made of raffle images.
+RAFFLE_IMAGE_VARIANT_EDGES = env.list(
+    "RAFFLE_IMAGE_VARIANT_EDGES", cast=int, default=[320, 640, 1280]
+)
 
 # ============================================
 # Cache Configuration
@@ -208,5 +230,23 @@ CACHES = {
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         },
-    }
+    },
+    # Raffle availability snapshots. Reads fall back to the database if Redis
+    # is unavailable, without changing how the default cache reports errors.
+    "availability": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": env("REDIS_URL", default="redis://127.0.0.1:6379/1"),
+        "KEY_PREFIX": "availability",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
+
+# Seconds a raffle availability snapshot may be served from cache. Writes
+# move readers to a new snapshot on commit, so this only bounds staleness from
+# missed events.
+RAFFLE_AVAILABILITY_CACHE_TIMEOUT = env.int(
+    "RAFFLE_AVAILABILITY_CACHE_TIMEOUT", default=300
+)
@@ -3,6 +3,8 @@ import importlib
 from typing import Any
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 import pytest
 
@@ -35,6 +37,53 @@ except Exception:
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache(settings):
+    """Run every test against empty in-process caches instead of Redis."""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "availability": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "availability",
+        },
+    }
+    from django.core.cache import caches
+
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@pytest.fixture
+def query_budget(db):
+    """Assert a request's query count is bounded and independent of data volume.
+
+    ``scenario(volume)`` seeds ``volume`` rows of whatever the endpoint iterates
+    over and returns a zero-argument callable that performs the request. The
+    request is measured at every volume; the counts must match each other and
+    stay within ``limit``.
+    """
+
+    def check(scenario, limit, volumes=(1, 20)):
+        counts = {}
+        for volume in volumes:
+            request = scenario(volume)
+            with CaptureQueriesContext(connection) as ctx:
+                response = request()
+            assert response.status_code < 400, getattr(response, "data", response)
+            counts[volume] = len(ctx.captured_queries)
+
+        queries = "\n".join(query["sql"] for query in ctx.captured_queries)
+        assert len(set(counts.values())) == 1, (
+            f"Query count grows with data {counts}:\n{queries}"
+        )
+        assert counts[volumes[-1]] <= limit, (
+            f"{counts[volumes[-1]]} queries exceed the budget of {limit}:\n{queries}"
+        )
+        return counts[volumes[-1]]
+
+    return check
+
+
 @pytest.fixture
 def user_factory(db):
     User = get_user_model()